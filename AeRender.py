@@ -6,6 +6,7 @@ import time
 from configs import Msg
 
 from scripts import setup_handler
+from scripts._trace import enable_tracing
 
 from process import (
     parse_arguments,
@@ -22,9 +23,11 @@ from process import (
     cleanup_handler
 )
 from process.render_cleanup import force_clean_temps
+from process.render_stages import StageTimer
 
 def main():
     start_time = time.time()
+    stages = StageTimer()
 
     try:
         setup_handler(logging.getLogger(), None)
@@ -35,33 +38,48 @@ def main():
         cfg = parse_arguments()
         logger = logger_init(cfg, clear_existing=True)
 
+        if cfg.profile:
+            stages.start_profiling(getattr(logger, 'filepath', None))
+
+        if cfg.trace:
+            enable_tracing(cfg.trace)
+
         print('-')
 
         render_start_info(cfg, logger)
 
-        render_preflight(cfg, logger)
+        with stages('render_preflight'):
+            render_preflight(cfg, logger)
 
-        _, json_path = render_init(cfg, logger)
+        with stages('render_init'):
+            _, session = render_init(cfg, logger)
         print('-')
 
-        works_dir = execute_render(json_path, cfg.logs, cfg.preview, logger)
+        with stages('execute_render'):
+            works_dir = execute_render(session, cfg.logs, cfg.preview, logger)
         print('-')
 
-        results = verify_render_output(json_path, logger=logger, temp_dir=works_dir)
+        with stages('verify_render_output'):
+            results = verify_render_output(session, logger=logger, temp_dir=works_dir)
         print('-')
 
-        result_success, preview_data = render_result(json_path, results, cfg.logs, logger)
-        render_result_log(json_path, logger)
+        results['utilization'] = stages.utilization()
+
+        with stages('render_result'):
+            result_success, preview_data = render_result(session, results, cfg.logs, logger)
+            render_result_log(session, logger)
 
         if cfg.preview:
             render_preview(preview_data, result_success)
 
         print('-')
 
-        complete_info = cleanup_handler(cfg, json_path, logger)
+        with stages('cleanup_handler'):
+            complete_info = cleanup_handler(cfg, session, logger)
 
         elapsed_time = time.time() - start_time
         render_complete_info(complete_info, results, elapsed_time, logger)
+        stages.finish(cfg, results, logger)
 
         print('-')
 
@@ -14,6 +14,8 @@ DEFAULT_JSON_DIR = os.path.join(DEFAULT_DATA_DIR, 'json')
 
 DEFAULT_LOG_DIR = os.path.join(DEFAULT_DATA_DIR, 'logs')
 
+DEFAULT_HISTORY_DIR = os.path.join(DEFAULT_DATA_DIR, 'history')
+
 DEFAULT_SYSTEM_USAGE = 0.70
 
 DEFAULT_RESERVED_CORES = 1
@@ -28,6 +30,22 @@ DEFAULT_OM_TEMPLATE = 'YOUR_TEMPLATE'
 
 DEFAULT_VERBOSE_LEVEL = 'ERRORS_AND_PROGRESS'
 
+DEFAULT_AERENDER = 'aerender'
+
+AERENDER_PATH_ENV = 'AERENDER_PATH'
+
+PROFILE_DIR_ENV = 'AERENDER_PROFILE_DIR'
+
+DEFAULT_PROFILE_TOP = 25
+
+TRACE_PATH_ENV = 'AERENDER_TRACE'
+
+DEFAULT_UTILIZATION_TAIL_RATIO = 0.25
+
+DEFAULT_UTILIZATION_BUSY_RATIO = 0.60
+
+DEFAULT_UTILIZATION_OUTSIDE_RATIO = 0.50
+
 DEFAULT_FILE_EXTENSION = 'png'
 
 SUPPORTED_IMAGE_FORMATS = ['.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff']
@@ -53,4 +71,60 @@ DEFAULT_FRAME_PADDING = 4
 
 DEFAULT_FRAMES_PER_TASK = 15
 
+SCHEDULER_MODES = ['static', 'guided', 'progressive']
+
+DEFAULT_SCHEDULER = 'static'
+
+DEFAULT_GUIDED_MIN_FRAMES = 2
+
+DEFAULT_GUIDED_FACTOR = 2
+
+DEFAULT_PROGRESSIVE_STRIDE = 16
+
+DEFAULT_PROGRESSIVE_MIN_STRIDE = 8
+
+ENGINE_MODES = ['process', 'async', 'distributed']
+
+DEFAULT_ENGINE = 'process'
+
+STATE_BACKENDS = ['json', 'sqlite', 'pack']
+
+DEFAULT_STATE_BACKEND = 'json'
+
+DEFAULT_TASK_TIMEOUT = 300
+
+DEFAULT_STARTUP_GRACE = 120
+
+DEFAULT_TIMEOUT_FACTOR = 4
+
+DEFAULT_STALL_FACTOR = 8
+
+DEFAULT_MIN_STALL_WINDOW = 30
+
+DEFAULT_TIMEOUT_SAMPLES = 200
+
+DEFAULT_RETRY_ATTEMPTS = 2
+
+DEFAULT_COORDINATOR_BIND = '0.0.0.0:47800'
+
+DEFAULT_LEASE_SECS = 30
+
+DEFAULT_HEARTBEAT_SECS = 5
+
+DEFAULT_LEASE_REASSIGN = 3
+
+DEFAULT_NODE_IDLE_EXIT = 60
+
+DEFAULT_SPECULATIVE_FACTOR = 1.5
+
+DEFAULT_SPECULATIVE_MIN_SECS = 10
+
+DEFAULT_SPLIT_MIN_FRAMES = 2
+
+DEFAULT_SPLIT_MIN_SECS = 10
+
+DEFAULT_HISTORY_SMOOTHING = 0.5
+
+DEFAULT_HISTORY_MIN_COVERAGE = 0.5
+
 PID_LOG_FILENAME = 'aerender_process_pids.log'
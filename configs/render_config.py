@@ -23,6 +23,18 @@ class RenderConfig:
     preview: bool
     logs: bool
     save_json: bool = False
+    scheduler: str = 'static'
+    engine: str = 'process'
+    retries: int = 2
+    resume: str = None
+    incremental: bool = False
+    coordinator: str = '0.0.0.0:47800'
+    speculative: bool = False
+    split: bool = False
+    state_backend: str = 'json'
+    timings: str = None
+    profile: bool = False
+    trace: str = None
 
     _calculated_workers: int = None
     _total_frames: int = None
@@ -129,7 +141,19 @@ class RenderConfig:
             verbose=self.verbose,
             preview=self.preview,
             logs=self.logs,
-            save_json=self.save_json
+            save_json=self.save_json,
+            scheduler=self.scheduler,
+            engine=self.engine,
+            retries=self.retries,
+            resume=self.resume,
+            incremental=self.incremental,
+            coordinator=self.coordinator,
+            speculative=self.speculative,
+            split=self.split,
+            state_backend=self.state_backend,
+            timings=self.timings,
+            profile=self.profile,
+            trace=self.trace
         )
 
     def to_dict(self) -> dict:
@@ -148,6 +172,18 @@ class RenderConfig:
             'preview': self.preview,
             'logs': self.logs,
             'save_json': self.save_json,
+            'scheduler': self.scheduler,
+            'engine': self.engine,
+            'retries': self.retries,
+            'resume': self.resume,
+            'incremental': self.incremental,
+            'coordinator': self.coordinator,
+            'speculative': self.speculative,
+            'split': self.split,
+            'state_backend': self.state_backend,
+            'timings': self.timings,
+            'profile': self.profile,
+            'trace': self.trace,
             'calculated_workers': self._calculated_workers,
             'total_frames': self._total_frames
         }
@@ -1,31 +1,53 @@
 
 import os
 from argparse import ArgumentParser
+from configs import Msg
 from configs.render_config import RenderConfig
 from configs.defaults import (
     DEFAULT_OUTPUT_DIR, DEFAULT_RS_TEMPLATE, DEFAULT_OM_TEMPLATE, 
-    DEFAULT_VERBOSE_LEVEL, DEFAULT_FILE_EXTENSION
+    DEFAULT_VERBOSE_LEVEL, DEFAULT_FILE_EXTENSION, DEFAULT_SCHEDULER,
+    SCHEDULER_MODES, DEFAULT_ENGINE, ENGINE_MODES, DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_COORDINATOR_BIND, DEFAULT_STATE_BACKEND, STATE_BACKENDS
 )
 from scripts._ae_specifics import parse_multi_values, has_multiple_values
+from scripts._aerender_progress import is_progress_verbose
+
+def get_unsupported_reason(args, option: str) -> str:
+    if has_multiple_values(args.comp_name):
+        return 'multi-composition renders'
+    if args.engine != 'process':
+        return f'the {args.engine} engine'
+    if option == 'split' and not is_progress_verbose(args.verbose):
+        return 'verbose levels without PROGRESS'
+    return ''
+
+def disable_unsupported_options(args) -> None:
+    for flag, option in (('-spec', 'speculative'), ('-split', 'split')):
+        if not getattr(args, option):
+            continue
+        reason = get_unsupported_reason(args, option)
+        if reason:
+            Msg.Warning(f'{flag} is not supported for {reason} and has been disabled')
+            setattr(args, option, False)
 
 def parse_arguments() -> RenderConfig:
     parser = ArgumentParser(
         description='Python script for multicore After Effects rendering.'
     )
     parser.add_argument(
-        '-f', '--fpath', required=True, help='PROJECT FILE PATH'
+        '-f', '--fpath', help='PROJECT FILE PATH'
     )
     parser.add_argument(
-        '-c', '--comp_name', required=True, help='COMPOSITION NAME (single name, comma-separated or space-separated list)'
+        '-c', '--comp_name', help='COMPOSITION NAME (single name, comma-separated or space-separated list)'
     )
     parser.add_argument(
         '-o', '--output_dir', default=None, help=f'OUTPUT DIRECTORY (default: {DEFAULT_OUTPUT_DIR}/COMP_NAME)'
     )
     parser.add_argument(
-        '-s', '--start', required=True, nargs='+', help='START FRAME (single number or space-separated list, e.g., -s 0 or -s 0 1 2)'
+        '-s', '--start', nargs='+', help='START FRAME (single number or space-separated list, e.g., -s 0 or -s 0 1 2)'
     )
     parser.add_argument(
-        '-e', '--end', required=True, nargs='+', help='END FRAME (single number or space-separated list, e.g., -e 10 or -e 10 11 12)'
+        '-e', '--end', nargs='+', help='END FRAME (single number or space-separated list, e.g., -e 10 or -e 10 11 12)'
     )
     parser.add_argument(
         '-w', '--workers', type=int, default=0,
@@ -35,6 +57,32 @@ def parse_arguments() -> RenderConfig:
         '-t', '--per_task', type=int, default=0,
         help='Number of frames per task (0 for auto-detect)'
     )
+    parser.add_argument(
+        '-sch', '--scheduler', default=DEFAULT_SCHEDULER, choices=SCHEDULER_MODES,
+        help='Task scheduler (static: fixed-size chunks, guided: shrinking chunks, '
+             'progressive: sparse preview frames first, then fill the gaps)'
+    )
+    parser.add_argument(
+        '-eng', '--engine', default=DEFAULT_ENGINE, choices=ENGINE_MODES,
+        help='Execution engine (process: worker process pool, async: single event loop supervisor, '
+             'distributed: serve tasks to render nodes)'
+    )
+    parser.add_argument(
+        '-cd', '--coordinator', default=DEFAULT_COORDINATOR_BIND, metavar='HOST:PORT',
+        help='Coordinator bind address for the distributed engine'
+    )
+    parser.add_argument(
+        '-rt', '--retries', type=int, default=DEFAULT_RETRY_ATTEMPTS,
+        help='Re-render attempts for failed or missing frames (0 to disable)'
+    )
+    parser.add_argument(
+        '-spec', '--speculative', action='store_true', default=False,
+        help='Run a duplicate of straggling chunks on idle workers; the first copy to finish wins'
+    )
+    parser.add_argument(
+        '-split', '--split', action='store_true', default=False,
+        help='Split straggling chunks mid-flight and requeue their unstarted frames (needs PROGRESS verbosity)'
+    )
     parser.add_argument(
         '-rst', '--rs_template', default=DEFAULT_RS_TEMPLATE,
         help='Render Setting preset'
@@ -59,13 +107,54 @@ def parse_arguments() -> RenderConfig:
         '-l', '--logs', action='store_true', default=False,
         help='Generate log files (default: False)'
     )
+    parser.add_argument(
+        '-inc', '--incremental', action='store_true', default=False,
+        help='Keep existing valid outputs newer than the project file and render only the rest'
+    )
+    parser.add_argument(
+        '-r', '--resume', default=None, metavar='RECIPE',
+        help='Resume an interrupted render from its recipe JSON (renders only outstanding frames)'
+    )
     parser.add_argument(
         '-json', '--save_json', action='store_true', default=False,
         help='Save render configuration as JSON file (default: False)'
     )
+    parser.add_argument(
+        '-sb', '--state_backend', default=DEFAULT_STATE_BACKEND, choices=STATE_BACKENDS,
+        help='Render state store (json: rewrite the recipe JSON, sqlite: per-frame rows in a WAL database '
+             'next to the recipe, pack: indexed container with separately stored sections and per-comp '
+             'frame tables, read section by section; sqlite and pack are exported to JSON at the end)'
+    )
+    parser.add_argument(
+        '-tm', '--timings', default=None, metavar='JSON',
+        help='Write per-stage wall times, peak RSS and frames per second to a JSON file'
+    )
+    parser.add_argument(
+        '-prof', '--profile', action='store_true', default=False,
+        help='Record cProfile stats per stage for the main process and validation/move workers'
+    )
+    parser.add_argument(
+        '-tr', '--trace', default=None, metavar='JSON',
+        help='Write a trace-event timeline (tasks, frames, validation, moves, JSON writes) to a JSON file'
+    )
 
     args = parser.parse_args()
 
+    if args.resume:
+        from process.render_resume import load_resume_config
+        config = load_resume_config(args.resume)
+        config.timings = args.timings
+        config.profile = args.profile
+        config.trace = args.trace
+        return config
+
+    missing = [flag for flag, value in (('-f', args.fpath), ('-c', args.comp_name),
+                                        ('-s', args.start), ('-e', args.end)) if value is None]
+    if missing:
+        parser.error(f'the following arguments are required: {", ".join(missing)}')
+
+    disable_unsupported_options(args)
+
     if args.output_dir is None:
         base_dir = os.path.abspath(DEFAULT_OUTPUT_DIR)
     else:
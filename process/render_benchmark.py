@@ -0,0 +1,250 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tabulate import tabulate
+
+from configs import Msg
+from configs.defaults import PROJECT_ROOT, AERENDER_PATH_ENV
+from scripts._common import make_dir, trace_error
+from scripts._platform import IS_WINDOWS
+from process.render_history import get_history_path
+from process.render_stages import PIPELINE_STAGES
+
+DEFAULT_BENCH_FRAMES = [100, 1000, 10000]
+DEFAULT_BENCH_COMPS = [1, 5, 20]
+DEFAULT_BENCH_WORKERS = [2, 4]
+DEFAULT_BENCH_THRESHOLD = 0.10
+DEFAULT_BENCH_SIM = {
+    'AERENDER_SIM_COST': 'const:0',
+    'AERENDER_SIM_STARTUP': '0',
+    'AERENDER_SIM_JITTER': '0',
+    'AERENDER_SIM_SIZE': '32x32'
+}
+
+LOWER_IS_BETTER = ('wall_secs', 'peak_rss_mb') + tuple(f'stages.{name}' for name in PIPELINE_STAGES)
+HIGHER_IS_BETTER = ('fps',)
+
+def get_case_name(frames: int, comps: int, workers: int) -> str:
+    return f'f{frames}_c{comps}_w{workers}'
+
+def get_simulator_path() -> str:
+    launcher = 'aerender.bat' if IS_WINDOWS else 'aerender'
+    return os.path.join(PROJECT_ROOT, 'scripts', 'bin', launcher)
+
+def split_frames(frames: int, comps: int) -> List[int]:
+    base, extra = divmod(frames, comps)
+    return [base + (1 if i < extra else 0) for i in range(comps)]
+
+def build_case_command(project: str, output_dir: str, frames: int, comps: int,
+                       workers: int, timings: str, extra_args: List[str]) -> List[str]:
+    counts = [count for count in split_frames(frames, comps) if count > 0]
+    comp_names = [f'Bench{i + 1:02d}' for i in range(len(counts))]
+    return [sys.executable, os.path.join(PROJECT_ROOT, 'AeRender.py'),
+            '-f', project,
+            '-c', ','.join(comp_names),
+            '-s', *['0'] * len(counts),
+            '-e', *[str(count - 1) for count in counts],
+            '-w', str(workers),
+            '-o', output_dir,
+            '-tm', timings,
+            *extra_args]
+
+def run_case(work_dir: str, frames: int, comps: int, workers: int,
+             extra_args: List[str], env: Dict[str, str]) -> Dict[str, Any]:
+    case_dir = os.path.join(work_dir, get_case_name(frames, comps, workers))
+    shutil.rmtree(case_dir, ignore_errors=True)
+    make_dir(case_dir)
+
+    project = os.path.join(case_dir, 'bench.aep')
+    open(project, 'wb').close()
+    timings = os.path.join(case_dir, 'timings.json')
+
+    cmd = build_case_command(project, os.path.join(case_dir, 'results'), frames, comps,
+                             workers, timings, extra_args)
+    started = time.time()
+    with open(os.path.join(case_dir, 'console.log'), 'w', encoding='utf-8') as console:
+        exit_code = subprocess.run(cmd, cwd=PROJECT_ROOT, env=env, stdin=subprocess.DEVNULL,
+                                   stdout=console, stderr=subprocess.STDOUT).returncode
+    elapsed = time.time() - started
+
+    report = {}
+    if os.path.exists(timings):
+        with open(timings, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+
+    history_path = get_history_path(project)
+    if os.path.exists(history_path):
+        os.remove(history_path)
+    shutil.rmtree(os.path.join(case_dir, 'results'), ignore_errors=True)
+
+    return {
+        'exit_code': exit_code,
+        'wall_secs': report.get('wall_secs', round(elapsed, 3)),
+        'stages': report.get('stages', {}),
+        'fps': report.get('fps', 0.0),
+        'peak_rss_mb': report.get('peak_rss_mb', {}).get('parent')
+    }
+
+def merge_runs(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    ok_runs = [run for run in runs if run['exit_code'] == 0] or runs
+    stage_names = {name for run in ok_runs for name in run['stages']}
+    return {
+        'exit_code': max(run['exit_code'] for run in runs),
+        'runs': len(runs),
+        'wall_secs': round(statistics.median(run['wall_secs'] for run in ok_runs), 3),
+        'stages': {name: round(statistics.median(run['stages'].get(name, 0.0) for run in ok_runs), 3)
+                   for name in PIPELINE_STAGES if name in stage_names},
+        'fps': round(statistics.median(run['fps'] for run in ok_runs), 3),
+        'peak_rss_mb': max((run['peak_rss_mb'] for run in ok_runs if run['peak_rss_mb'] is not None),
+                           default=None)
+    }
+
+def run_suite(args) -> int:
+    work_dir = os.path.abspath(args.work_dir or os.path.join(tempfile.gettempdir(), 'aerender_bench'))
+    env = dict(os.environ, **DEFAULT_BENCH_SIM)
+    env.update(dict(item.split('=', 1) for item in args.sim))
+    env[AERENDER_PATH_ENV] = get_simulator_path()
+    env['PYTHON'] = sys.executable
+
+    suite = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'host': {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count()
+        },
+        'simulator': {key: value for key, value in env.items() if key.startswith('AERENDER_SIM_')},
+        'extra_args': args.extra,
+        'cases': {}
+    }
+
+    failed = 0
+    for frames in args.frames:
+        for comps in args.comps:
+            if comps > frames:
+                continue
+            for workers in args.workers:
+                name = get_case_name(frames, comps, workers)
+                Msg.Dim(f'Benchmark {name} ({args.repeat} run(s))')
+                runs = [run_case(work_dir, frames, comps, workers, args.extra, env)
+                        for _ in range(args.repeat)]
+                case = dict(merge_runs(runs), frames=frames, comps=comps, workers=workers)
+                suite['cases'][name] = case
+                failed += case['exit_code'] != 0
+                print(f'  wall {case["wall_secs"]:.2f}s, {case["fps"]:.1f} fps, '
+                      f'peak RSS {case["peak_rss_mb"]} MB, exit {case["exit_code"]}')
+
+    make_dir(os.path.dirname(os.path.abspath(args.output)))
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(suite, f, indent=2)
+    Msg.Green(f'Benchmark results saved to: {os.path.abspath(args.output)}')
+
+    return 1 if failed else 0
+
+def get_metric(case: Dict[str, Any], metric: str) -> Optional[float]:
+    value = case
+    for part in metric.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+def compare_suites(baseline: Dict[str, Any], current: Dict[str, Any],
+                   threshold: float, min_secs: float) -> List[List[Any]]:
+    rows = []
+    for name, base_case in baseline['cases'].items():
+        case = current['cases'].get(name)
+        if case is None:
+            continue
+
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            before, after = get_metric(base_case, metric), get_metric(case, metric)
+            if not before or after is None:
+                continue
+
+            change = (after - before) / before
+            if metric in HIGHER_IS_BETTER:
+                regressed = change < -threshold
+            else:
+                regressed = change > threshold
+                if metric != 'peak_rss_mb' and after - before < min_secs:
+                    regressed = False
+
+            rows.append([name, metric, before, after, f'{change:+.1%}',
+                         'REGRESSION' if regressed else ''])
+    return rows
+
+def run_compare(args) -> int:
+    try:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.current, 'r', encoding='utf-8') as f:
+            current = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        Msg.Error(f'Failed to load benchmark results: {trace_error(e)}')
+        return 2
+
+    rows = compare_suites(baseline, current, args.threshold, args.min_secs)
+    if not args.all:
+        rows = [row for row in rows if row[-1]]
+
+    if rows:
+        print(tabulate(rows, headers=['case', 'metric', 'baseline', 'current', 'change', ''],
+                       tablefmt='simple'))
+
+    regressions = sum(1 for row in rows if row[-1])
+    if regressions:
+        Msg.Red(f'{regressions} regression(s) over {args.threshold:.0%} threshold')
+        return 1
+
+    Msg.Green(f'No regressions over {args.threshold:.0%} threshold')
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='AeRender v2.0 단계별 엔드투엔드 벤치마크')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='시뮬레이터로 합성 작업을 렌더링하고 결과를 JSON으로 저장')
+    run_parser.add_argument('-o', '--output', default='bench_results.json', help='결과 JSON 경로')
+    run_parser.add_argument('--frames', type=int, nargs='+', default=DEFAULT_BENCH_FRAMES,
+                            help='전체 프레임 수 목록 (예: 100 1000 100000)')
+    run_parser.add_argument('--comps', type=int, nargs='+', default=DEFAULT_BENCH_COMPS,
+                            help='컴포지션 수 목록')
+    run_parser.add_argument('--workers', type=int, nargs='+', default=DEFAULT_BENCH_WORKERS,
+                            help='워커 수 목록')
+    run_parser.add_argument('-n', '--repeat', type=int, default=1, help='케이스별 반복 횟수 (중앙값 사용)')
+    run_parser.add_argument('--sim', action='append', default=[], metavar='NAME=VALUE',
+                            help='시뮬레이터 환경 변수 (예: AERENDER_SIM_COST=const:0.01)')
+    run_parser.add_argument('--work-dir', default=None, help='합성 프로젝트와 결과 작업 디렉토리')
+    run_parser.add_argument('extra', nargs=argparse.REMAINDER,
+                            help='AeRender.py에 그대로 전달할 추가 인자 (-- 뒤에 지정)')
+
+    compare_parser = commands.add_parser('compare', help='기준 결과 대비 성능 회귀 검사')
+    compare_parser.add_argument('baseline', help='기준 결과 JSON')
+    compare_parser.add_argument('current', help='비교할 결과 JSON')
+    compare_parser.add_argument('-t', '--threshold', type=float, default=DEFAULT_BENCH_THRESHOLD,
+                                help='회귀로 판단할 변화율 (기본값: 0.10)')
+    compare_parser.add_argument('--min-secs', type=float, default=0.05,
+                                help='이보다 작은 시간 증가는 무시 (초)')
+    compare_parser.add_argument('-a', '--all', action='store_true', help='회귀가 아닌 항목도 표시')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        args.extra = [arg for arg in args.extra if arg != '--']
+        return run_suite(args)
+    return run_compare(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,6 +13,9 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from configs.colorize import Msg
 from configs.defaults import DEFAULT_TEMP_DIR, DEFAULT_JSON_DIR, DEFAULT_LOG_DIR
 from scripts._common import abs_path, trace_error
+from scripts._state import JsonStateStore, RecipeSession, get_side_states
+
+from .render_pipeline import get_journal_path
 
 def log_cleanup(action: str, target: str, success: bool,
                 logger=None, log_to_file: Optional[str] = None):
@@ -134,6 +137,21 @@ def clean_json(json_path: Optional[PathLike] = None,
 
     if json_path:
         json_abs_path = abs_path(json_path)
+        journal_path = get_journal_path(json_abs_path)
+        if os.path.exists(journal_path):
+            try:
+                os.remove(journal_path)
+                log_cleanup('DELETE_JOURNAL', journal_path, True, logger)
+            except Exception:
+                log_cleanup('DELETE_JOURNAL', journal_path, False, logger)
+        for state in get_side_states(json_abs_path):
+            if not state.exists():
+                continue
+            try:
+                state.remove()
+                log_cleanup('DELETE_STATE', state.state_path, True, logger)
+            except Exception:
+                log_cleanup('DELETE_STATE', state.state_path, False, logger)
         if os.path.exists(json_abs_path):
             try:
                 os.remove(json_abs_path)
@@ -236,7 +254,7 @@ def cleanup_all(json_path: Optional[PathLike] = None,
                cleanup_json: bool = True,
                cleanup_logs: bool = True,
                cleanup_temps: bool = True,
-               logger=None) -> dict:
+               logger=None, session: Optional[RecipeSession] = None) -> dict:
     results = {
         'temps_cleaned': False,
         'json_deleted': 0,
@@ -255,12 +273,10 @@ def cleanup_all(json_path: Optional[PathLike] = None,
         results['json_deleted'] = clean_json(json_path, logger=logger)
         results['total_operations'] += 1
 
-    if cleanup_logs and json_path:
+    if cleanup_logs and (json_path or session):
         try:
-            from scripts._ae_specifics import load_json_data
-            recipe_data = load_json_data(json_path)
-            rendering_options = recipe_data.get('rendering_options', {})
-            log_path = rendering_options.get('log_path')
+            session = session or RecipeSession(json_path)
+            log_path = session.section('rendering_options', 'log_path')
 
             if log_path:
                 results['logs_deleted'] = clean_logs(log_path, logger=logger)
@@ -276,19 +292,18 @@ def cleanup_all(json_path: Optional[PathLike] = None,
 
     return results
 
-def cleanup_handler(cfg, json_path: str, logger):
+def cleanup_handler(cfg, session: RecipeSession, logger):
     complete_info_data = None
 
-    if not json_path:
+    if not session:
         return complete_info_data
 
+    json_path = session.json_path
     try:
         try:
-            from scripts._ae_specifics import load_json_data
             from .render_info import extract_json_data
 
-            json_data = load_json_data(json_path)
-            complete_info_data = extract_json_data(json_data)
+            complete_info_data = extract_json_data(session.recipe)
             complete_info_data['json_path'] = json_path
 
         except Exception as e:
@@ -299,6 +314,14 @@ def cleanup_handler(cfg, json_path: str, logger):
         cleanup_logs = False
         cleanup_temps = True
 
+        session.close()
+        if session.backend != JsonStateStore.backend and not cleanup_json:
+            session.export_json()
+            session.state.remove()
+            if logger:
+                logger.info(f'Render state exported to JSON: {json_path}',
+                           show_func_info=True)
+
         if logger:
             logger.info('Starting post-render cleanup process',
                        show_func_info=True)
@@ -311,7 +334,8 @@ def cleanup_handler(cfg, json_path: str, logger):
             cleanup_json=cleanup_json,
             cleanup_logs=cleanup_logs,
             cleanup_temps=cleanup_temps,
-            logger=logger
+            logger=logger,
+            session=session
         )
 
         if logger:
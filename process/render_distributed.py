@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import socket
+import argparse
+import threading
+import socketserver
+from collections import deque
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from configs import Msg
+from configs.defaults import (
+    DEFAULT_COORDINATOR_BIND, DEFAULT_LEASE_SECS, DEFAULT_HEARTBEAT_SECS,
+    DEFAULT_LEASE_REASSIGN, DEFAULT_NODE_IDLE_EXIT
+)
+from scripts._common import trace_error, make_dir
+from scripts._aerender_progress import stream_aerender
+from scripts._task_timeout import AdaptiveTimeout
+from scripts._sig_handler import is_shutdown_requested
+
+def parse_address(address: str) -> Tuple[str, int]:
+    host, _, port = str(address).rpartition(':')
+    return host or '0.0.0.0', int(port)
+
+def send_message(address: Tuple[str, int], message: Dict[str, Any],
+                 timeout: float = 10.0) -> Dict[str, Any]:
+    with socket.create_connection(address, timeout=timeout) as sock:
+        sock.sendall((json.dumps(message, ensure_ascii=False) + '\n').encode('utf-8'))
+        with sock.makefile('r', encoding='utf-8') as reader:
+            reply = reader.readline()
+
+    if not reply:
+        raise ConnectionError('Coordinator closed the connection without a reply')
+    return json.loads(reply)
+
+def build_failed_result(task_id: int, task: Dict[str, Any], reason: str,
+                        node: Optional[str] = None) -> Dict[str, Any]:
+    now = time.time()
+    return {
+        'task_id': task_id,
+        'exit_code': -1,
+        'stdout': '',
+        'stderr': reason,
+        'elapsed': 0.0,
+        'files_rendered': 0,
+        'success': False,
+        'command': ' '.join(task.get('aerender_command', [])),
+        'started_at': now,
+        'finished_at': now,
+        'node': node
+    }
+
+class TaskBoard:
+
+    def __init__(self, tasks: List[Dict[str, Any]], logger,
+                 lease_secs: float = DEFAULT_LEASE_SECS,
+                 heartbeat_secs: float = DEFAULT_HEARTBEAT_SECS,
+                 max_reassign: int = DEFAULT_LEASE_REASSIGN,
+                 on_frame: Optional[Callable[[Dict[str, Any], int, float], None]] = None,
+                 on_complete: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None):
+        self.tasks = tasks
+        self.logger = logger
+        self.lease_secs = lease_secs
+        self.heartbeat_secs = heartbeat_secs
+        self.max_reassign = max_reassign
+        self.on_frame = on_frame
+        self.on_complete = on_complete
+
+        self.pending = deque(range(len(tasks)))
+        self.results: Dict[int, Dict[str, Any]] = {}
+        self.leases: Dict[str, Dict[str, Any]] = {}
+        self.expired: Dict[str, int] = {}
+        self.reassigned = [0] * len(tasks)
+        self.nodes: Dict[str, float] = {}
+
+        self._lock = threading.Lock()
+        self.finished = threading.Event()
+        if not tasks:
+            self.finished.set()
+
+    def _touch_node(self, node: str, now: float) -> None:
+        if node not in self.nodes:
+            self.logger.info(f'Render node joined: {node}')
+        self.nodes[node] = now
+
+    def _settle(self, index: int, result: Dict[str, Any]) -> None:
+        self.results[index] = result
+        for lease_id in [lease_id for lease_id, lease in self.leases.items() if lease['index'] == index]:
+            self.expired[lease_id] = self.leases.pop(lease_id)['index']
+        if len(self.results) == len(self.tasks):
+            self.finished.set()
+
+    def dispatch(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        op = message.get('op')
+        if op == 'lease':
+            return self.lease(message['node'])
+        if op == 'heartbeat':
+            return self.heartbeat(message['node'], message.get('leases', []))
+        if op == 'frame':
+            return self.frame(message['lease'], message['frame'], message.get('elapsed', 0.0))
+        if op == 'complete':
+            return self.complete(message['lease'], message['result'])
+        return {'error': f'Unknown operation: {op}'}
+
+    def lease(self, node: str) -> Dict[str, Any]:
+        now = time.time()
+        reply = {'lease_secs': self.lease_secs, 'heartbeat_secs': self.heartbeat_secs}
+
+        with self._lock:
+            self._touch_node(node, now)
+
+            while self.pending and not self.finished.is_set():
+                index = self.pending.popleft()
+                if index in self.results:
+                    continue
+
+                lease_id = uuid.uuid4().hex
+                self.leases[lease_id] = {
+                    'index': index,
+                    'node': node,
+                    'leased_at': now,
+                    'expires': now + self.lease_secs
+                }
+                task = self.tasks[index]
+                self.logger.debug(f'Leased {task.get("task_detail", index + 1)} to {node} ({lease_id[:8]})')
+                reply.update(lease=lease_id, task_id=index + 1, task=task)
+                return reply
+
+        reply['task'] = None
+        return reply
+
+    def heartbeat(self, node: str, lease_ids: List[str]) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            self._touch_node(node, now)
+            revoked = []
+            for lease_id in lease_ids:
+                lease = self.leases.get(lease_id)
+                if lease is not None and lease['node'] == node:
+                    lease['expires'] = now + self.lease_secs
+                else:
+                    revoked.append(lease_id)
+        return {'ok': True, 'revoked': revoked}
+
+    def frame(self, lease_id: str, frame_num: int, elapsed: float) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            lease = self.leases.get(lease_id)
+            if lease is None:
+                return {'ok': False}
+            lease['expires'] = now + self.lease_secs
+            self.nodes[lease['node']] = now
+            task = self.tasks[lease['index']]
+
+        if self.on_frame:
+            self.on_frame(task, frame_num, elapsed)
+        return {'ok': True}
+
+    def complete(self, lease_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            lease = self.leases.pop(lease_id, None)
+            index = lease['index'] if lease is not None else self.expired.get(lease_id)
+            if index is None or index in self.results or (lease is None and not result.get('success')):
+                return {'ok': True, 'accepted': False}
+
+            result['task_id'] = index + 1
+            self._settle(index, result)
+            task = self.tasks[index]
+
+        if lease is None:
+            self.logger.info(f'Accepted late result for {task.get("task_detail", index + 1)} '
+                             f'from {result.get("node")}')
+        if self.on_complete:
+            self.on_complete(task, result)
+        return {'ok': True, 'accepted': True}
+
+    def reap(self) -> None:
+        now = time.time()
+        abandoned = []
+
+        with self._lock:
+            for lease_id, lease in list(self.leases.items()):
+                if lease['expires'] >= now:
+                    continue
+
+                index = self.leases.pop(lease_id)['index']
+                self.expired[lease_id] = index
+                if index in self.results:
+                    continue
+
+                task = self.tasks[index]
+                task_detail = task.get('task_detail', index + 1)
+                self.reassigned[index] += 1
+                if self.reassigned[index] > self.max_reassign:
+                    reason = (f'Lease expired {self.reassigned[index]} times '
+                              f'(last node: {lease["node"]})')
+                    result = build_failed_result(index + 1, task, reason, lease['node'])
+                    self._settle(index, result)
+                    abandoned.append((task, result))
+                    self.logger.error(f'{task_detail} abandoned: {reason}')
+                else:
+                    self.pending.appendleft(index)
+                    self.logger.warning(f'Lease expired on {lease["node"]}: {task_detail} requeued '
+                                        f'({self.reassigned[index]}/{self.max_reassign})')
+
+            for node, last_seen in list(self.nodes.items()):
+                if now - last_seen > self.lease_secs:
+                    del self.nodes[node]
+                    self.logger.warning(f'Render node lost: {node} '
+                                        f'(silent for {now - last_seen:.1f} seconds)')
+
+        if self.on_complete:
+            for task, result in abandoned:
+                self.on_complete(task, result)
+
+    def cancel(self, reason: str) -> None:
+        cancelled = []
+        with self._lock:
+            for index, task in enumerate(self.tasks):
+                if index not in self.results:
+                    result = build_failed_result(index + 1, task, reason)
+                    self._settle(index, result)
+                    cancelled.append((task, result))
+
+        if self.on_complete:
+            for task, result in cancelled:
+                self.on_complete(task, result)
+
+class CoordinatorHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            reply = self.server.board.dispatch(json.loads(line))
+        except Exception as e:
+            reply = {'error': trace_error(e)}
+        self.wfile.write((json.dumps(reply, ensure_ascii=False) + '\n').encode('utf-8'))
+
+class CoordinatorServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int], board: TaskBoard):
+        super().__init__(address, CoordinatorHandler)
+        self.board = board
+
+def run_distributed_tasks(tasks: List[Dict[str, Any]], workers: int, logger,
+                          timeouts: Optional[AdaptiveTimeout] = None,
+                          on_frame: Optional[Callable[[Dict[str, Any], int, float], None]] = None,
+                          on_complete: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None,
+                          bind: str = DEFAULT_COORDINATOR_BIND,
+                          lease_secs: float = DEFAULT_LEASE_SECS,
+                          heartbeat_secs: float = DEFAULT_HEARTBEAT_SECS) -> List[Dict[str, Any]]:
+    if not tasks:
+        return []
+
+    board = TaskBoard(tasks, logger, lease_secs, heartbeat_secs,
+                      on_frame=on_frame, on_complete=on_complete)
+    server = CoordinatorServer(parse_address(bind or DEFAULT_COORDINATOR_BIND), board)
+    host, port = server.server_address[:2]
+    server_thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.2},
+                                     daemon=True)
+    server_thread.start()
+    logger.info(f'Coordinator listening on {host}:{port}: {len(tasks)} tasks, '
+                f'lease {lease_secs}s, heartbeat {heartbeat_secs}s')
+
+    try:
+        while not board.finished.wait(min(1.0, lease_secs / 4)):
+            if is_shutdown_requested():
+                logger.warning(f'User shutdown requested, cancelling '
+                               f'{len(tasks) - len(board.results)} distributed tasks')
+                board.cancel('Cancelled by shutdown request')
+                break
+            board.reap()
+    finally:
+        server.shutdown()
+        server.server_close()
+        server_thread.join(timeout=2.0)
+
+    nodes = sorted({result.get('node') for result in board.results.values() if result.get('node')})
+    logger.info(f'Coordinator finished: {len(tasks)} tasks across {len(nodes)} nodes '
+                f'({", ".join(nodes) or "none"}), {sum(board.reassigned)} reassignments')
+    return [board.results[index] for index in range(len(tasks))]
+
+class RenderNodeAgent:
+
+    def __init__(self, address: Tuple[str, int], node: Optional[str] = None, slots: int = 1,
+                 aerender: Optional[str] = None, path_map: Optional[List[Tuple[str, str]]] = None,
+                 idle_exit: float = DEFAULT_NODE_IDLE_EXIT):
+        self.address = address
+        self.node = node or f'{socket.gethostname()}-{os.getpid()}'
+        self.slots = max(1, slots)
+        self.aerender = aerender
+        self.path_map = path_map or []
+        self.idle_exit = idle_exit
+        self.heartbeat_secs = DEFAULT_HEARTBEAT_SECS
+        self.timeouts = AdaptiveTimeout()
+
+        self.leases = set()
+        self.completed = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._reports = queue.Queue()
+        self._stop = threading.Event()
+        self._last_contact = time.time()
+
+    def _request(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            reply = send_message(self.address, message)
+        except (OSError, ValueError):
+            return None
+        self._last_contact = time.time()
+        return reply
+
+    def map_command(self, aerender_cmd: List[str]) -> List[str]:
+        mapped = []
+        for arg in aerender_cmd:
+            for source, target in self.path_map:
+                if arg.startswith(source):
+                    arg = target + arg[len(source):]
+                    break
+            mapped.append(arg)
+
+        if self.aerender:
+            mapped[0] = self.aerender
+        if '-output' in mapped:
+            make_dir(os.path.dirname(mapped[mapped.index('-output') + 1]))
+        return mapped
+
+    def _report_loop(self) -> None:
+        while not (self._stop.is_set() and self._reports.empty()):
+            try:
+                message = self._reports.get(timeout=0.2)
+            except queue.Empty:
+                continue
+
+            attempts = 5 if message['op'] == 'complete' else 1
+            for attempt in range(attempts):
+                if self._request(message) is not None:
+                    break
+                time.sleep(min(2.0, 0.5 * (attempt + 1)))
+            self._reports.task_done()
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop.wait(self.heartbeat_secs):
+            with self._lock:
+                lease_ids = list(self.leases)
+            reply = self._request({'op': 'heartbeat', 'node': self.node, 'leases': lease_ids})
+            if reply and reply.get('revoked'):
+                Msg.Dim(f'{self.node}: {len(reply["revoked"])} lease(s) reassigned by the coordinator')
+
+    def _run_lease(self, reply: Dict[str, Any]) -> None:
+        lease_id = reply['lease']
+        task = reply['task']
+        task_detail = task.get('task_detail', task.get('chunk_id', reply['task_id']))
+
+        with self._lock:
+            self.leases.add(lease_id)
+
+        def on_frame(frame_num, elapsed):
+            self._reports.put({'op': 'frame', 'lease': lease_id,
+                               'frame': frame_num, 'elapsed': elapsed})
+
+        start_time = time.time()
+        frame_times = None
+        try:
+            aerender_cmd = self.map_command(task['aerender_command'])
+            Msg.Dim(f'{self.node}: rendering {task_detail} '
+                    f'({task.get("start_frame")}-{task.get("end_frame")})')
+            output = stream_aerender(aerender_cmd, on_frame=on_frame, timeouts=self.timeouts)
+            exit_code = -1 if output['timed_out'] else output['returncode']
+            stderr = output['timeout_reason'] if output['timed_out'] else output['stderr']
+            stdout = output['stdout'][-4096:]
+            frame_times = output['frame_times']
+        except Exception as e:
+            exit_code, stdout, stderr = -1, '', trace_error(e)
+        finally:
+            with self._lock:
+                self.leases.discard(lease_id)
+
+        end_time = time.time()
+        result = {
+            'task_id': reply['task_id'],
+            'exit_code': exit_code,
+            'stdout': stdout,
+            'stderr': stderr,
+            'elapsed': end_time - start_time,
+            'files_rendered': task.get('expected_files', task.get('file_count', 0)) if exit_code == 0 else 0,
+            'success': exit_code == 0,
+            'command': ' '.join(task['aerender_command']),
+            'started_at': start_time,
+            'finished_at': end_time,
+            'frame_times': frame_times,
+            'node': self.node
+        }
+        self._reports.put({'op': 'complete', 'lease': lease_id, 'result': result})
+
+        with self._lock:
+            if result['success']:
+                self.completed += 1
+            else:
+                self.failed += 1
+                Msg.Warning(f'{self.node}: {task_detail} failed: {stderr.strip() or "Unknown error"}', divide=False)
+
+    def _slot_loop(self) -> None:
+        while not self._stop.is_set():
+            reply = self._request({'op': 'lease', 'node': self.node})
+
+            if reply is None or reply.get('error'):
+                if time.time() - self._last_contact > self.idle_exit:
+                    self._stop.set()
+                    break
+                self._stop.wait(1.0)
+                continue
+
+            self.heartbeat_secs = reply.get('heartbeat_secs', self.heartbeat_secs)
+            if reply.get('task') is None:
+                self._stop.wait(0.5)
+                continue
+
+            self._run_lease(reply)
+
+    def run(self) -> int:
+        host, port = self.address
+        Msg.Info(f'Render node {self.node}: {self.slots} slots, coordinator {host}:{port}')
+
+        reporter = threading.Thread(target=self._report_loop, daemon=True)
+        heartbeat = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        slots = [threading.Thread(target=self._slot_loop, daemon=True) for _ in range(self.slots)]
+
+        reporter.start()
+        heartbeat.start()
+        for slot in slots:
+            slot.start()
+
+        try:
+            for slot in slots:
+                while slot.is_alive():
+                    slot.join(timeout=0.5)
+        except KeyboardInterrupt:
+            Msg.Warning(f'{self.node}: interrupted, leases will expire on the coordinator', divide=False)
+        finally:
+            self._stop.set()
+            reporter.join(timeout=10.0)
+
+        Msg.Info(f'Render node {self.node} stopped: {self.completed} tasks completed, {self.failed} failed')
+        return 0 if self.failed == 0 else 1
+
+def parse_path_map(values: List[str]) -> List[Tuple[str, str]]:
+    path_map = []
+    for value in values or []:
+        source, sep, target = value.partition('=')
+        if not sep:
+            raise ValueError(f'Path map must be SOURCE=TARGET: {value}')
+        path_map.append((source, target))
+    return path_map
+
+def main():
+    parser = argparse.ArgumentParser(description='AeRender v2.0 분산 렌더링 노드 에이전트')
+    parser.add_argument('coordinator', help='코디네이터 주소 (HOST:PORT)')
+    parser.add_argument('-n', '--slots', type=int, default=1, help='동시 aerender 프로세스 수')
+    parser.add_argument('--node', default=None, help='노드 이름 (기본값: HOSTNAME-PID)')
+    parser.add_argument('--aerender', default=None, help='aerender 실행 파일 경로 (기본값: 레시피 명령)')
+    parser.add_argument('-m', '--map', action='append', default=[], metavar='SOURCE=TARGET',
+                        help='공유 경로 매핑 (코디네이터 경로=노드 경로, 반복 가능)')
+    parser.add_argument('--idle', type=float, default=DEFAULT_NODE_IDLE_EXIT,
+                        help='코디네이터 응답 없을 때 종료 대기 시간(초)')
+
+    args = parser.parse_args()
+
+    try:
+        agent = RenderNodeAgent(parse_address(args.coordinator), args.node, args.slots,
+                                args.aerender, parse_path_map(args.map), args.idle)
+        return agent.run()
+    except Exception as e:
+        Msg.Error(f'Render node failed: {trace_error(e)}')
+        return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,13 +1,13 @@
 import sys
 
-from scripts import load_json_data
 from configs import Msg
+from scripts._state import RecipeSession
 from process.render_process_single import execute_render as execute_single
 from process.render_process_multi import execute_render as execute_multi
 
-def execute_render(json_path, logs=False, preview=False, logger=None):
+def execute_render(session: RecipeSession, logs=False, preview=False, logger=None):
     try:
-        recipe_data = load_json_data(json_path)
+        recipe_data = session.recipe
         if not recipe_data:
             Msg.Error('Failed to load recipe data')
             if logger:
@@ -26,11 +26,11 @@ def execute_render(json_path, logs=False, preview=False, logger=None):
         if comp_count == 1:
             if logger:
                 logger.info(f'Selected single composition execution engine (1 composition)')
-            exit_code, temp_dir = execute_single(json_path, logs, preview)
+            exit_code, temp_dir = execute_single(session, logs, preview)
         else:
             if logger:
                 logger.info(f'Selected multi composition execution engine ({comp_count} compositions)')
-            exit_code, temp_dir = execute_multi(json_path, logs, preview)
+            exit_code, temp_dir = execute_multi(session, logs, preview)
 
         if exit_code != 0:
             Msg.Error('Rendering execution failed')
@@ -0,0 +1,84 @@
+import os
+import sys
+import json
+import hashlib
+from datetime import datetime
+from typing import Dict, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from configs.defaults import DEFAULT_HISTORY_DIR, DEFAULT_HISTORY_SMOOTHING
+from scripts._common import trace_error, make_dir, sanitize_string
+
+def get_history_path(project_file: str, history_dir: str = DEFAULT_HISTORY_DIR) -> str:
+    project_path = os.path.normcase(os.path.abspath(str(project_file)))
+    project_name = sanitize_string(os.path.splitext(os.path.basename(project_path))[0])
+    project_hash = hashlib.sha1(project_path.encode('utf-8')).hexdigest()[:8]
+    return os.path.join(history_dir, f'{project_name}_{project_hash}.json')
+
+def load_render_history(project_file: str) -> Dict[str, Any]:
+    history_path = get_history_path(project_file)
+    if not os.path.exists(history_path):
+        return {}
+    try:
+        with open(history_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def load_frame_costs(project_file: str, comp_name: str) -> Dict[int, float]:
+    comp_history = load_render_history(project_file).get('compositions', {}).get(comp_name, {})
+    return {int(frame_num): cost for frame_num, cost in comp_history.items()}
+
+def collect_frame_costs(comp_data: Dict[str, Any]) -> Dict[str, float]:
+    chunk_starts = {task['start_frame'] for task in comp_data.get('workflow', {}).get('chunk_tasks', [])
+                    if task.get('end_frame', task['start_frame']) > task['start_frame']}
+
+    costs = {}
+    for frame_num, frame in comp_data.get('frames', {}).items():
+        render_time = frame.get('render_time')
+        if render_time is None or render_time <= 0 or int(frame_num) in chunk_starts:
+            continue
+        costs[str(frame_num)] = render_time
+    return costs
+
+def record_render_history(recipe: Dict[str, Any], logger=None,
+                          smoothing: float = DEFAULT_HISTORY_SMOOTHING) -> int:
+    project_file = recipe['project_settings']['project_file']
+    history = load_render_history(project_file)
+    compositions = history.setdefault('compositions', {})
+
+    recorded = 0
+    for comp_name, comp_data in recipe['result_outputs'].items():
+        costs = collect_frame_costs(comp_data)
+        if not costs:
+            continue
+
+        comp_history = compositions.setdefault(comp_name, {})
+        for frame_num, cost in costs.items():
+            previous = comp_history.get(frame_num)
+            merged = cost if previous is None else previous + smoothing * (cost - previous)
+            comp_history[frame_num] = round(merged, 3)
+        recorded += len(costs)
+
+    if not recorded:
+        return 0
+
+    history['project_file'] = str(project_file)
+    history['updated_timestamp'] = datetime.now().isoformat()
+
+    history_path = get_history_path(project_file)
+    try:
+        make_dir(os.path.dirname(history_path))
+        temp_path = f'{history_path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(history, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, history_path)
+    except OSError as e:
+        if logger:
+            logger.warning(f'Render history update failed: {trace_error(e)}')
+        return 0
+
+    if logger:
+        logger.info(f'Render history updated: {recorded} frame costs ({history_path})')
+    return recorded
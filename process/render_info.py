@@ -6,6 +6,7 @@ from configs import defaults, Msg
 from configs.defaults import DEFAULT_FRAMES_PER_TASK, DEFAULT_SYSTEM_USAGE, DEFAULT_OUTPUT_DIR, DEFAULT_LOG_DIR, DEFAULT_JSON_DIR
 from scripts import get_short_path, load_json_data, get_usable_workers, get_usable_cpu, get_usable_mem, format_elapsed_time
 from process.render_logger import get_logger
+from process.render_utilization import format_utilization_summary, log_utilization_report
 
 def get_file_exists(file_path: str) -> tuple:
     if file_path and os.path.exists(file_path):
@@ -93,6 +94,33 @@ def format_args_info(args) -> list:
     if per_task > 0:
         lines.append(f'Frames Per Task: {per_task}')
 
+    scheduler = getattr(args, 'scheduler', '')
+    if scheduler:
+        lines.append(f'Scheduler: {scheduler}')
+
+    engine = getattr(args, 'engine', '')
+    if engine:
+        lines.append(f'Execution Engine: {engine}')
+    if engine == 'distributed':
+        lines.append(f'Coordinator: {getattr(args, "coordinator", "")}')
+
+    if getattr(args, 'speculative', False):
+        lines.append('Speculative: duplicate straggling chunks on idle workers')
+
+    if getattr(args, 'split', False):
+        lines.append('Split: requeue unstarted frames of straggling chunks')
+
+    if getattr(args, 'incremental', False):
+        lines.append('Incremental: skip existing valid outputs')
+
+    resume = getattr(args, 'resume', None)
+    if resume:
+        lines.append(f'Resume Recipe: {resume}')
+
+    retries = getattr(args, 'retries', None)
+    if retries is not None:
+        lines.append(f'Retry Attempts: {retries}')
+
     omt = getattr(args, 'om_template', '')
     if omt:
         lines.append(f'Output Module: {omt}')
@@ -315,6 +343,12 @@ def render_complete_info(info_data: Optional[Dict[str, Any]],
 
     Msg.Result(render_msg, divide=False)
 
+    utilization = results.get('utilization') if results else None
+    if utilization and utilization['slot_count']:
+        Msg.Dim(f'Utilization: {format_utilization_summary(utilization)}')
+        for hint in utilization['hints']:
+            Msg.Dim(f'  {hint}')
+
     if save_json :
         print(f'-')
         path_str = get_short_path(json_path, base_dir='process')
@@ -337,3 +371,4 @@ def render_complete_info(info_data: Optional[Dict[str, Any]],
 
     log_complete_info(logger, formatted_time, info, success_count,
                       total_expected, log_path, status)
+    log_utilization_report(utilization, get_logger())
@@ -3,20 +3,36 @@ import os
 import sys
 import json
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from configs.colorize import Msg
 from configs.defaults import (
     DEFAULT_SYSTEM_USAGE, DEFAULT_OUTPUT_DIR, DEFAULT_JSON_DIR,
-    DEFAULT_FILE_EXTENSION, DEFAULT_TEMP_DIR,
-    TEMP_PROJECT_PREFIX, DEFAULT_FRAMES_PER_TASK
+    DEFAULT_TEMP_DIR, TEMP_PROJECT_PREFIX, DEFAULT_SCHEDULER,
+    DEFAULT_GUIDED_MIN_FRAMES, DEFAULT_ENGINE, DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_COORDINATOR_BIND, DEFAULT_STATE_BACKEND
 )
 from configs.render_config import RenderConfig
 
 from scripts._common import trace_error, make_dir, sanitize_string
-from scripts._ae_specifics import get_output_paths, get_temp_name, is_multi_comp
+from scripts._ae_specifics import get_temp_name, is_multi_comp
 from scripts._get_usable_workers import get_usable_workers
+from scripts._platform import get_aerender_executable
+from scripts._get_invalid_images import is_invalid_image_enhanced
+from scripts._trace import trace_span
+from scripts._state import JsonStateStore, RecipeSession, get_side_states
+from scripts._frame_map import FrameMap, assign_chunk, encode_recipe, format_path
+
+from process.render_scheduler import (
+    plan_chunk_ranges, plan_frame_ranges, plan_cost_ranges, plan_progressive_passes,
+    estimate_frame_costs, range_cost
+)
+from process.render_history import load_frame_costs
+
+def get_frames_per_task(total_frames: int, configured_workers: int) -> int:
+    return max(1, total_frames // (configured_workers * 2))
 
 def generate_worker_config(config: RenderConfig, logger=None):
     if logger:
@@ -35,22 +51,35 @@ def generate_worker_config(config: RenderConfig, logger=None):
         else:
             total_frames = config.end - config.start + 1
 
-        frames_per_task = max(1, total_frames // (configured_workers * 2))
+        frames_per_task = get_frames_per_task(total_frames, configured_workers)
 
-    if isinstance(config.start, list):
-        estimated_tasks = 0
-        for start, end in zip(config.start, config.end):
-            comp_frames = end - start + 1
-            comp_tasks = max(1, comp_frames // frames_per_task)
-            estimated_tasks += comp_tasks
-    else:
-        total_frames = config.end - config.start + 1
-        estimated_tasks = max(1, total_frames // frames_per_task)
+    scheduler = getattr(config, 'scheduler', DEFAULT_SCHEDULER)
+    plan_config = {
+        'scheduler': scheduler,
+        'configured_workers': configured_workers,
+        'frames_per_task': frames_per_task,
+        'min_frames_per_task': DEFAULT_GUIDED_MIN_FRAMES
+    }
+
+    starts = config.start if isinstance(config.start, list) else [config.start]
+    ends = config.end if isinstance(config.end, list) else [config.end]
+
+    estimated_tasks = 0
+    for start, end in zip(starts, ends):
+        estimated_tasks += len(plan_chunk_ranges(start, end, plan_config))
+    estimated_tasks = max(1, estimated_tasks)
 
     worker_config = {
         'optimal_workers': optimal_workers,
         'configured_workers': configured_workers,
         'frames_per_task': frames_per_task,
+        'min_frames_per_task': DEFAULT_GUIDED_MIN_FRAMES,
+        'scheduler': scheduler,
+        'engine': getattr(config, 'engine', DEFAULT_ENGINE),
+        'retry_attempts': getattr(config, 'retries', DEFAULT_RETRY_ATTEMPTS),
+        'coordinator': getattr(config, 'coordinator', DEFAULT_COORDINATOR_BIND),
+        'speculative': getattr(config, 'speculative', False),
+        'split': getattr(config, 'split', False),
         'estimated_tasks': estimated_tasks,
         'system_usage_ratio': DEFAULT_SYSTEM_USAGE,
         'render_settings': {
@@ -62,11 +91,112 @@ def generate_worker_config(config: RenderConfig, logger=None):
 
     if logger:
         logger.info(f'Worker config generated: {configured_workers} workers, '
-                   f'{frames_per_task} frames/task, {estimated_tasks} tasks',
+                   f'{frames_per_task} frames/task, {estimated_tasks} tasks, '
+                   f'scheduler: {scheduler}',
                    show_func_info=True)
 
     return worker_config
 
+def get_result_template(comp_output_dir: str, comp_name: str, ext: str) -> tuple:
+    return (os.path.join(comp_output_dir, f"{sanitize_string(comp_name)}."),
+            f".{ext}")
+
+def get_result_path(comp_output_dir: str, comp_name: str,
+                    frame_num: int, ext: str) -> str:
+    return format_path(get_result_template(comp_output_dir, comp_name, ext), frame_num)
+
+def is_reusable_result(path: str, project_mtime: float,
+                       min_file_size: int = 1024) -> bool:
+    try:
+        if not os.path.exists(path) or os.path.getmtime(path) <= project_mtime:
+            return False
+        is_invalid, _ = is_invalid_image_enhanced(path, min_file_size)
+        return not is_invalid
+    except Exception:
+        return False
+
+def find_reusable_frames(comp_name: str, start: int, end: int,
+                         comp_output_dir: str, ext: str, project_file: str,
+                         workers: int = 1) -> list:
+    project_mtime = os.path.getmtime(project_file)
+    frame_nums = list(range(start, end + 1))
+    paths = [get_result_path(comp_output_dir, comp_name, frame_num, ext)
+             for frame_num in frame_nums]
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        reusable = list(executor.map(lambda path: is_reusable_result(path, project_mtime), paths))
+
+    return [frame_num for frame_num, keep in zip(frame_nums, reusable) if keep]
+
+def build_chunk_task(comp_name: str, chunk_start: int, chunk_end: int,
+                     project_settings: dict) -> tuple:
+    tmps_dir = project_settings['temp_directory']
+    ext = project_settings['file_extension']
+
+    chunk_dir_name = get_temp_name(comp_name, chunk_start, chunk_end)
+    chunk_dir_path = os.path.join(tmps_dir, chunk_dir_name)
+    result_comp_name = sanitize_string(comp_name)
+
+    tmp_template = (os.path.join(chunk_dir_path, f"{result_comp_name}."),
+                    f".{ext}")
+
+    output_pattern = os.path.join(chunk_dir_path,
+                                f"{result_comp_name}.[####]."
+                                f"{ext}")
+
+    aerender_command = [
+        get_aerender_executable(),
+        "-project", project_settings['temp_project'],
+        "-comp", comp_name,
+        "-RStemplate", project_settings['render_settings_template'],
+        "-OMtemplate", project_settings['output_module_template'],
+        "-output", output_pattern,
+        "-s", str(chunk_start),
+        "-e", str(chunk_end),
+        "-v", project_settings['verbose_level']
+    ]
+
+    chunk_task = {
+        'chunk_id': f'{comp_name}_{chunk_start:04d}_'
+                   f'{chunk_end:04d}',
+        'temp_directory': chunk_dir_path,
+        'start_frame': chunk_start,
+        'end_frame': chunk_end,
+        'file_count': chunk_end - chunk_start + 1,
+        'aerender_command': aerender_command
+    }
+
+    return tmp_template, chunk_task
+
+def build_range_tasks(recipe: dict, comp_name: str, frame_ranges: list,
+                      label: str) -> list:
+    comp_data = recipe['result_outputs'][comp_name]
+    frames = comp_data.get('frames', {})
+    project_settings = recipe['project_settings']
+
+    tasks = []
+    for chunk_start, chunk_end in frame_ranges:
+        tmp_template, chunk_task = build_chunk_task(
+            comp_name, chunk_start, chunk_end, project_settings)
+
+        for frame_num in range(chunk_start, chunk_end + 1):
+            frame = frames.get(str(frame_num))
+            if frame is None:
+                continue
+            stale = frame.get('tmp', '')
+            if stale and os.path.exists(stale):
+                os.remove(stale)
+            frame.update(rendered=False, verified=False)
+        assign_chunk(frames, chunk_start, chunk_end, tmp_template)
+
+        make_dir(chunk_task['temp_directory'])
+        chunk_task['comp_name'] = comp_name
+        chunk_task['task_detail'] = f'{comp_name}/{label}_{chunk_start:04d}_{chunk_end:04d}'
+        chunk_task['expected_files'] = chunk_task['file_count']
+        tasks.append(chunk_task)
+
+    return tasks
+
 def create_render_recipe_json(config: RenderConfig, worker_config: dict,
                               logger=None, output_dir: str = None):
     start_time = datetime.now()
@@ -107,6 +237,23 @@ def create_render_recipe_json(config: RenderConfig, worker_config: dict,
     if len(output_dirs) == 1 and num_comps > 1:
         output_dirs = output_dirs * num_comps
 
+    reusable_frames = {}
+    if getattr(config, 'incremental', False):
+        for comp_name, start, end, comp_output_dir in zip(comp_names, starts, ends, output_dirs):
+            reusable_frames[comp_name] = find_reusable_frames(
+                comp_name, start, end, comp_output_dir, config.ext,
+                config.fpath, worker_config['configured_workers'])
+
+        if config.per_task <= 0:
+            outstanding_total = sum(end - start + 1 - len(reusable_frames[comp_name])
+                                    for comp_name, start, end in zip(comp_names, starts, ends))
+            worker_config['frames_per_task'] = get_frames_per_task(
+                outstanding_total, worker_config['configured_workers'])
+            if logger:
+                logger.info(f'Incremental: {outstanding_total} outstanding frames, '
+                           f'{worker_config["frames_per_task"]} frames/task',
+                           show_func_info=True)
+
     recipe_data = {
         'recipe_info': {
             'created_timestamp': datetime.now().isoformat(),
@@ -134,7 +281,9 @@ def create_render_recipe_json(config: RenderConfig, worker_config: dict,
             'per_task': worker_config['frames_per_task'],
             'enable_preview': getattr(config, 'preview', False),
             'enable_logging': getattr(config, 'logs', False),
-            'save_json': getattr(config, 'save_json', False)
+            'save_json': getattr(config, 'save_json', False),
+            'incremental': getattr(config, 'incremental', False),
+            'state_backend': getattr(config, 'state_backend', DEFAULT_STATE_BACKEND)
         }
     }
 
@@ -152,65 +301,58 @@ def create_render_recipe_json(config: RenderConfig, worker_config: dict,
         end = ends[i]
         comp_output_dir = output_dirs[i]
 
-        expected_files = get_output_paths(comp_name, comp_output_dir,
-                                        start, end, config.ext)
-
-        frames_per_task = worker_config.get('frames_per_task',
-                                          DEFAULT_FRAMES_PER_TASK)
-
-        frame_map = {}
+        frame_map = FrameMap(start, end - start + 1,
+                             get_result_template(comp_output_dir, comp_name, config.ext))
         chunk_tasks = []
-
-        for chunk_start in range(start, end + 1, frames_per_task):
-            chunk_end = min(chunk_start + frames_per_task - 1, end)
-
-            chunk_dir_name = get_temp_name(comp_name, chunk_start,
-                                          chunk_end)
-            chunk_dir_path = os.path.join(tmps_dir, chunk_dir_name)
-            result_comp_name = sanitize_string(comp_name)
-
-            for frame_num in range(chunk_start, chunk_end + 1):
-                temp_relative_frame = frame_num - chunk_start
-                temp_file = os.path.join(chunk_dir_path,
-                                        f"{result_comp_name}."
-                                        f"{temp_relative_frame:04d}."
-                                        f"{config.ext}")
-                result_file = os.path.join(comp_output_dir,
-                                         f"{result_comp_name}."
-                                         f"{frame_num:04d}."
-                                         f"{config.ext}")
-
-                frame_map[frame_num] = {
-                    'tmp': temp_file,
-                    'result': result_file,
-                    'rendered': False,
-                    'moved': False,
-                    'verified': False
-                }
-
-            output_pattern = os.path.join(chunk_dir_path,
-                                        f"{result_comp_name}.[####]."
-                                        f"{config.ext}")
-
-            aerender_command = [
-                "aerender",
-                "-project", temp_project_path,
-                "-comp", comp_name,
-                "-RStemplate", config.rs_template,
-                "-OMtemplate", config.om_template,
-                "-output", output_pattern,
-                "-s", str(chunk_start),
-                "-e", str(chunk_end),
-                "-v", config.verbose
-            ]
-
-            chunk_tasks.append({
-                'chunk_id': f'{comp_name}_{chunk_start:04d}_'
-                           f'{chunk_end:04d}',
-                'temp_directory': chunk_dir_path,
-                'file_count': chunk_end - chunk_start + 1,
-                'aerender_command': aerender_command
-            })
+        reusable = reusable_frames.get(comp_name, [])
+
+        if getattr(config, 'incremental', False):
+            for frame_num in reusable:
+                frame_map[frame_num].update(rendered=True, moved=True,
+                                            verified=True, reused=True)
+            if logger:
+                logger.info(f'Incremental: {comp_name} keeps {len(reusable)}/'
+                           f'{end - start + 1} existing frames',
+                           show_func_info=True)
+
+        reused = set(reusable)
+        outstanding = [frame_num for frame_num in range(start, end + 1)
+                       if frame_num not in reused]
+
+        frame_costs = {}
+        if worker_config['scheduler'] == 'progressive':
+            frame_passes = plan_progressive_passes(outstanding, worker_config)
+            if logger:
+                logger.info(f'Progressive: {comp_name} renders '
+                           f'{sum(len(frame_ranges) for frame_ranges in frame_passes[:-1])} preview frames '
+                           f'in {len(frame_passes) - 1} passes before '
+                           f'{len(frame_passes[-1])} fill chunks',
+                           show_func_info=True)
+        else:
+            frame_costs = estimate_frame_costs(
+                outstanding, load_frame_costs(config.fpath, comp_name))
+            if frame_costs:
+                frame_passes = [plan_cost_ranges(outstanding, frame_costs,
+                                                 worker_config)]
+                if logger:
+                    logger.info(f'Render history: {comp_name} planned by expected '
+                               f'cost, longest first ({len(frame_passes[0])} chunks)',
+                               show_func_info=True)
+            else:
+                frame_passes = [plan_frame_ranges(outstanding, worker_config)]
+
+        for pass_index, frame_ranges in enumerate(frame_passes):
+            for chunk_start, chunk_end in frame_ranges:
+                tmp_template, chunk_task = build_chunk_task(
+                    comp_name, chunk_start, chunk_end,
+                    recipe_data['project_settings'])
+                if frame_costs:
+                    chunk_task['expected_cost'] = round(
+                        range_cost((chunk_start, chunk_end), frame_costs), 3)
+                if worker_config['scheduler'] == 'progressive':
+                    chunk_task['preview_pass'] = pass_index
+                frame_map.assign_chunk(chunk_start, chunk_end, tmp_template)
+                chunk_tasks.append(chunk_task)
 
         recipe_data['result_outputs'][comp_name] = {
             'frames': frame_map,
@@ -222,10 +364,18 @@ def create_render_recipe_json(config: RenderConfig, worker_config: dict,
             },
             'output_dir': comp_output_dir,
             'total': end - start + 1,
-            'completed': 0,
+            'completed': len(reusable),
             'elapsed_time': '00:00:00'
         }
 
+    if getattr(config, 'incremental', False) or any(
+            'expected_cost' in task
+            for comp_data in recipe_data['result_outputs'].values()
+            for task in comp_data['workflow']['chunk_tasks']):
+        worker_config['estimated_tasks'] = sum(
+            len(comp_data['workflow']['chunk_tasks'])
+            for comp_data in recipe_data['result_outputs'].values())
+
     project_name = sanitize_string(project_name, str)
 
     if len(comp_names) > 1:
@@ -263,8 +413,19 @@ def create_render_recipe_json(config: RenderConfig, worker_config: dict,
             logger.info(f'Result directories: {output_dirs}',
                        show_func_info=True)
 
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(recipe_data, f, indent=2, ensure_ascii=False)
+        with trace_span('json.dump', 'json', file=os.path.basename(json_path)), \
+             open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(recipe_data, f, indent=2, ensure_ascii=False, default=encode_recipe)
+
+        for state in get_side_states(json_path):
+            state.remove()
+        session = RecipeSession(json_path, recipe_data,
+                                recipe_data['rendering_options'].get('state_backend'))
+        if session.backend != JsonStateStore.backend:
+            session.save()
+            if logger:
+                logger.info(f'Render state store created ({session.backend}): '
+                           f'{session.state.state_path}', show_func_info=True)
 
         end_time = datetime.now()
         elapsed_time = (end_time - start_time).total_seconds()
@@ -275,7 +436,7 @@ def create_render_recipe_json(config: RenderConfig, worker_config: dict,
                        f'(Generated in {elapsed_time:.3f}s)',
                        show_func_info=True)
 
-        return os.path.abspath(json_path)
+        return session
 
     except Exception as e:
         error_msg = f'Failed to save render recipe: {trace_error(e)}'
@@ -291,6 +452,14 @@ def render_init(config: RenderConfig, logger=None):
                    show_func_info=True)
 
     try:
+        if config.resume:
+            from .render_resume import resume_render_recipe
+            session = resume_render_recipe(config.resume, logger)
+            if logger:
+                logger.info(f'Recipe JSON resumed: {session.json_path}',
+                           show_func_info=True)
+            return session.section('worker_configuration'), session
+
         if logger:
             logger.info('Generating worker configuration',
                        show_func_info=True)
@@ -299,12 +468,12 @@ def render_init(config: RenderConfig, logger=None):
         if logger:
             logger.info('Creating render recipe JSON',
                        show_func_info=True)
-        json_path = create_render_recipe_json(config, worker_config, logger)
-        if logger:
-            logger.info(f'Recipe JSON created: {json_path}',
+        session = create_render_recipe_json(config, worker_config, logger)
+        if logger and session:
+            logger.info(f'Recipe JSON created: {session.json_path}',
                        show_func_info=True)
 
-        return worker_config, json_path
+        return worker_config, session
 
     except Exception as e:
         error_msg = (f'Render task recipe generation failed: '
@@ -321,10 +490,11 @@ def main():
     try:
         config = parse_arguments()
 
-        worker_config, json_path = render_init(config)
+        worker_config, session = render_init(config)
 
-        if json_path:
-            print(f"RECIPE: {json_path}")
+        if session:
+            session.close()
+            print(f"RECIPE: {session.json_path}")
             print(f"WORKERS: {worker_config['configured_workers']}")
             print(f"FRAMES/TASK: {worker_config['frames_per_task']}")
             print(f"ESTIMATED TASKS: {worker_config['estimated_tasks']}")
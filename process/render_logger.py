@@ -4,6 +4,7 @@ from typing import Dict, Any
 
 from configs.loggercfg import DummyLogger
 from scripts._logger import set_logger
+from scripts._state import RecipeSession
 
 _current_logger = None
 
@@ -105,10 +106,9 @@ def calc_total_tasks(recipe: Dict[str, Any]) -> int:
             total_tasks += len(comp_data['workflow']['chunk_tasks'])
     return total_tasks
 
-def render_result_log(json_path: str, logger) -> None:
+def render_result_log(session: RecipeSession, logger) -> None:
     try:
-        from scripts._ae_specifics import load_json_data
-        recipe = load_json_data(json_path)
+        recipe = session.recipe
         
         project_file = os.path.basename(
             recipe['project_settings']['project_file']
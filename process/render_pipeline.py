@@ -0,0 +1,180 @@
+import os
+import sys
+import json
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts import trace_error, make_dir
+from scripts._get_invalid_images import is_invalid_image_enhanced
+from scripts._trace import trace_span
+from scripts._profiling import get_thread_pool_options, dump_thread_profiles
+
+def get_journal_path(json_path: str) -> str:
+    return f'{os.path.splitext(json_path)[0]}.journal'
+
+def get_task_frames(tasks: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    task_frames: Dict[str, set] = {}
+    for task in tasks:
+        comp_name = task.get('comp_name')
+        start_frame, end_frame = task.get('start_frame'), task.get('end_frame')
+        if comp_name is None or start_frame is None or end_frame is None:
+            continue
+        task_frames.setdefault(comp_name, set()).update(map(str, range(start_frame, end_frame + 1)))
+    return {comp_name: sorted(frame_ids, key=int) for comp_name, frame_ids in task_frames.items()}
+
+def read_journal(journal_path: str) -> Dict[str, List[str]]:
+    moved = {}
+    if not journal_path or not os.path.exists(journal_path):
+        return moved
+
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            moved.setdefault(entry['comp'], []).extend(entry['moved'])
+    return moved
+
+class ChunkPipeline:
+
+    def __init__(self, recipe: Dict[str, Any], workers: int, logger=None,
+                 min_file_size: int = 1024, journal_path: Optional[str] = None):
+        self.recipe = recipe
+        self.logger = logger
+        self.min_file_size = min_file_size
+        self.journal_path = journal_path
+
+        self.verified_count = 0
+        self.moved_count = 0
+        self.invalid: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self._futures = []
+        self._profilers = []
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers),
+                                            thread_name_prefix='chunk-pipeline',
+                                            **get_thread_pool_options(self._profilers))
+
+    def _resolve_comp(self, task: Dict[str, Any]) -> Optional[str]:
+        comp_name = task.get('comp_name')
+        if comp_name:
+            return comp_name
+
+        chunk_id = task.get('chunk_id', '')
+        if chunk_id.count('_') >= 2:
+            comp_name = chunk_id.rsplit('_', 2)[0]
+            if comp_name in self.recipe['result_outputs']:
+                return comp_name
+
+        if len(self.recipe['result_outputs']) == 1:
+            return next(iter(self.recipe['result_outputs']))
+        return None
+
+    def submit(self, task: Dict[str, Any], success: bool) -> None:
+        if not success:
+            return
+
+        comp_name = self._resolve_comp(task)
+        start_frame = task.get('start_frame')
+        end_frame = task.get('end_frame')
+        if comp_name is None or start_frame is None or end_frame is None:
+            return
+
+        frames = self.recipe['result_outputs'][comp_name].get('frames', {})
+        chunk_frames = [(frame_id, frames[frame_id])
+                        for frame_id in map(str, range(start_frame, end_frame + 1))
+                        if frame_id in frames]
+
+        with self._lock:
+            self._futures.append(
+                self._executor.submit(self._process_chunk, comp_name, task.get('chunk_id', ''), chunk_frames))
+
+    def _write_journal(self, comp_name: str, frame_ids: List[str]) -> None:
+        if not self.journal_path or not frame_ids:
+            return
+        try:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'comp': comp_name, 'moved': frame_ids}, ensure_ascii=False) + '\n')
+                f.flush()
+        except OSError as e:
+            if self.logger:
+                self.logger.warning(f'Pipeline journal write failed: {trace_error(e)}')
+
+    def _process_chunk(self, comp_name: str, chunk_id: str, chunk_frames: List) -> None:
+        with trace_span(f'validate+move {chunk_id}', 'pipeline', frames=len(chunk_frames)):
+            self._validate_and_move(comp_name, chunk_id, chunk_frames)
+
+    def _validate_and_move(self, comp_name: str, chunk_id: str, chunk_frames: List) -> None:
+        verified, moved, invalid = 0, [], []
+
+        for frame_id, frame in chunk_frames:
+            tmp = frame.get('tmp', '')
+            result = frame.get('result', '')
+            if not tmp or not result or frame.get('moved', False) or not os.path.exists(tmp):
+                continue
+
+            frame['rendered'] = True
+
+            try:
+                is_invalid, reasons = is_invalid_image_enhanced(tmp, self.min_file_size)
+            except Exception as e:
+                is_invalid, reasons = True, [f'validation error: {trace_error(e)}']
+
+            if is_invalid:
+                invalid.append(tmp)
+                if self.logger:
+                    self.logger.warning(f'{comp_name}: invalid frame {frame_id} → {", ".join(reasons)}')
+                continue
+
+            frame['verified'] = True
+            verified += 1
+
+            try:
+                make_dir(os.path.dirname(result))
+                shutil.move(tmp, result)
+                frame['moved'] = True
+                moved.append(frame_id)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f'{comp_name}: frame {frame_id} move failed: {trace_error(e)}')
+
+        with self._lock:
+            self.verified_count += verified
+            self.moved_count += len(moved)
+            self._write_journal(comp_name, moved)
+            if invalid:
+                self.invalid.setdefault(comp_name, []).extend(invalid)
+
+        if self.logger:
+            self.logger.debug(f'Pipeline chunk done: {chunk_id} '
+                              f'(verified: {verified}, moved: {len(moved)}, invalid: {len(invalid)})')
+
+    def drain(self) -> Dict[str, int]:
+        with self._lock:
+            futures = list(self._futures)
+
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f'Pipeline chunk failed: {trace_error(e)}')
+
+        self._executor.shutdown(wait=True)
+        dump_thread_profiles(self._profilers, 'pipeline')
+
+        stats = {
+            'chunks': len(futures),
+            'verified': self.verified_count,
+            'moved': self.moved_count,
+            'invalid': sum(len(files) for files in self.invalid.values())
+        }
+        if self.logger:
+            self.logger.info(f'Pipeline validation drained: {stats["chunks"]} chunks, '
+                             f'{stats["verified"]} verified, {stats["moved"]} moved, '
+                             f'{stats["invalid"]} invalid')
+        return stats
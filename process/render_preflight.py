@@ -1,7 +1,6 @@
 
 import os
 import sys
-import shutil
 import time
 from datetime import datetime
 
@@ -14,15 +13,10 @@ from configs.render_config import RenderConfig
 from scripts._common import get_rel_path, trace_error, remove_exist
 from scripts._ae_specifics import get_output_paths, remove_confirm
 from scripts._process_kill import process_kill
+from scripts._platform import find_aerender
 
 def verify_aerender(logger=None):
-    aerender_paths = ['aerender', 'aerender.exe']
-
-    found_path = None
-    for path in aerender_paths:
-        if shutil.which(path) or os.path.exists(path):
-            found_path = path
-            break
+    found_path = find_aerender()
 
     if not found_path:
         err_msg = (f'"aerender.exe" not found in system. '
@@ -218,10 +212,21 @@ def render_preflight(config: RenderConfig, logger=None):
 
         existing_results = verify_results(config, logger)
 
-        if existing_results['has_existing']:
-            confirm_execution(config, logger)
+        if config.resume:
+            if logger:
+                logger.info(f'Resume mode: keeping {existing_results["count"]} existing results and temp files')
+            tmps_status = {'exists': os.path.exists(DEFAULT_TEMP_DIR), 'path': DEFAULT_TEMP_DIR,
+                           'needs_cleanup': False}
+        elif config.incremental:
+            if logger:
+                logger.info(f'Incremental mode: {existing_results["count"]} existing results '
+                            f'kept if valid and newer than the project file')
+            tmps_status = verify_temps(config, logger)
+        else:
+            if existing_results['has_existing']:
+                confirm_execution(config, logger)
 
-        tmps_status = verify_temps(config, logger)
+            tmps_status = verify_temps(config, logger)
 
         end_time = time.time()
         elapsed = round(end_time - start_time, 3)
@@ -2,16 +2,13 @@
 
 import os
 import sys
-import json
-import time
 import shutil
 import argparse
-import subprocess
 import threading
-import glob
+from functools import partial
 from datetime import datetime
 from concurrent.futures import ProcessPoolExecutor
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, Callable
 from alive_progress import alive_bar
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -20,37 +17,50 @@ from configs import Msg, DEFAULT_TEMP_DIR, DEFAULT_OUTPUT_DIR
 from scripts import (
     get_rel_path, setup_handler, is_shutdown_requested, process_kill,
     make_dir, trace_error, get_usable_workers,
-    activate_system_monitor, sanitize_names, format_elapsed_time
+    activate_system_monitor, format_elapsed_time
 )
 from scripts._sig_handler import reset_shutdown_event
-from scripts._ae_specifics import load_json_data
+from scripts._state import RecipeSession, get_frame_updates
+
+from scripts._aerender_progress import stream_aerender, is_progress_verbose
+from scripts._task_timeout import TimeoutManager
+from scripts._trace import trace_task
+from configs.defaults import DEFAULT_ENGINE, DEFAULT_COORDINATOR_BIND
 
 from .render_logger import render_info_log, render_result_log
+from .render_supervisor import run_supervised_tasks
+from .render_distributed import run_distributed_tasks
+from .render_pipeline import ChunkPipeline, get_journal_path, get_task_frames
+from .render_history import record_render_history
+from .render_tracker import TaskTracker, drain_completed
+from .render_progress import MultiRenderProgress, apply_frame_times, consume_frame_events
 
-def _process_completed_future(future, task_info: Dict[str, Any], completed: int, total: int, results: List, logger, total_files_rendered: int, total_errors: int) -> tuple:
-    try:
-        if hasattr(future, '_cached_result'):
-            result = future._cached_result
-        else:
-            result = future.result(timeout=0.1)
-        results.append(result)
+def _record_task_result(result, task_info: Dict[str, Any], completed: int, total: int, results: List, logger) -> tuple:
+    trace_task(task_info, result)
+    results.append(result)
 
-        if isinstance(result, dict):
-            files_rendered = result.get('files_rendered', 0)
-            execution_time = result.get('execution_time', 0.0)
-            error_occurred = not result.get('success', False)
+    if isinstance(result, dict):
+        files_rendered = result.get('files_rendered', 0)
+        execution_time = result.get('execution_time', 0.0)
+        error_occurred = not result.get('success', False)
 
-            elapsed_str = format_elapsed_time(execution_time)
+        elapsed_str = format_elapsed_time(execution_time)
 
-            task_detail = task_info.get('task_detail', task_info.get('comp_name', f'Task {completed}'))
-            status = "success" if not error_occurred else "failed"
-            logger.info(f"Task {completed}/{total} {status} "
-                      f"({task_detail}: files: {files_rendered}, elapsed: {elapsed_str})")
+        task_detail = task_info.get('task_detail', task_info.get('comp_name', f'Task {completed}'))
+        status = "success" if not error_occurred else "failed"
+        logger.info(f"Task {completed}/{total} {status} "
+                  f"({task_detail}: files: {files_rendered}, elapsed: {elapsed_str})")
 
-            return files_rendered, error_occurred
-        else:
-            logger.info(f"Task {completed}/{total} completed")
-            return 0, False
+        return files_rendered, error_occurred
+    else:
+        logger.info(f"Task {completed}/{total} completed")
+        return 0, False
+
+def _process_completed_future(future, task_info: Dict[str, Any], completed: int, total: int, results: List, logger, total_files_rendered: int, total_errors: int) -> tuple:
+    try:
+        result = future.result(timeout=0.1)
+
+        return _record_task_result(result, task_info, completed, total, results, logger)
 
     except Exception as e:
         task_detail = task_info.get('task_detail', task_info.get('comp_name', f'Task {completed}'))
@@ -65,42 +75,58 @@ def _process_completed_future(future, task_info: Dict[str, Any], completed: int,
         logger.error(f"Task {completed} failed ({task_detail}): {trace_error(e)}")
         return 0, True
 
-def execute_aerender_command(aerender_cmd: List[str], task_id: int, expected_files: int = 0) -> Dict[str, Any]:
+def execute_aerender_command(aerender_cmd: List[str], task_id: int, expected_files: int = 0,
+                             progress_queue=None, progress_key=None, timeouts=None) -> Dict[str, Any]:
+    def on_frame(frame_num, elapsed):
+        progress_queue.put((progress_key, frame_num, elapsed))
+
     try:
         start_time = datetime.now()
 
-        result = subprocess.run(aerender_cmd, capture_output=True, text=True, timeout=300)
+        result = stream_aerender(aerender_cmd,
+                                 on_frame=on_frame if progress_queue is not None else None,
+                                 timeouts=timeouts)
 
         end_time = datetime.now()
         execution_time = (end_time - start_time).total_seconds()
 
-        files_rendered = expected_files if result.returncode == 0 else 0
+        if result['timed_out']:
+            return {
+                'success': False,
+                'task_id': task_id,
+                'error_msg': result['timeout_reason'],
+                'files_rendered': 0,
+                'execution_time': execution_time,
+                'started_at': start_time.timestamp(),
+                'finished_at': end_time.timestamp(),
+                'frame_times': result['frame_times']
+            }
+
+        files_rendered = expected_files if result['returncode'] == 0 else 0
 
-        if result.returncode == 0:
+        if result['returncode'] == 0:
             return {
                 'success': True,
                 'task_id': task_id,
                 'error_msg': None,
                 'files_rendered': files_rendered,
-                'execution_time': execution_time
+                'execution_time': execution_time,
+                'started_at': start_time.timestamp(),
+                'finished_at': end_time.timestamp(),
+                'frame_times': result['frame_times']
             }
         else:
             return {
                 'success': False,
                 'task_id': task_id,
-                'error_msg': result.stderr.strip() if result.stderr else 'Unknown error',
+                'error_msg': result['stderr'].strip() if result['stderr'] else 'Unknown error',
                 'files_rendered': files_rendered,
-                'execution_time': execution_time
+                'execution_time': execution_time,
+                'started_at': start_time.timestamp(),
+                'finished_at': end_time.timestamp(),
+                'frame_times': result['frame_times']
             }
 
-    except subprocess.TimeoutExpired:
-        return {
-            'success': False,
-            'task_id': task_id,
-            'error_msg': 'Timeout after 300 seconds',
-            'files_rendered': 0,
-            'execution_time': 300.0
-        }
     except Exception as e:
         try:
             end_time = datetime.now()
@@ -152,76 +178,93 @@ def setup_workspace(recipe: Dict[str, Any], logger) -> bool:
         logger.error(f"Workspace setup failed: {trace_error(e)}")
         return False
 
-def monitor_progress_files(temp_workspace: str, comp_name: str, file_ext: str,
-                          bar, monitor_stop_event, total_frames: int, progress_index: str, total_index: str,
-                          result_dirs: List, logger=None, completion_flag=None):
-
-    last_count = 0
-    title_changed = False
-
-    try:
-        sanitized_comp = sanitize_names(comp_name, strict=True)
-
-        while not monitor_stop_event.is_set() and not is_shutdown_requested():
-            patterns = [
-                os.path.join(temp_workspace, f'tmp_{sanitized_comp}*', f'*.{file_ext}'),
-                os.path.join(temp_workspace, f'tmp_{sanitized_comp}*', f'{sanitized_comp}.*'),
-            ]
-
-            all_files = []
-            for pattern in patterns:
-                files = glob.glob(pattern)
-                all_files.extend(files)
-
-            all_files_set = set(all_files)
-            current_count = len(all_files_set)
-
-            if current_count > last_count:
-                if not title_changed and current_count > 0:
-                    bar.title = f'Render In Progress… [{progress_index}/{total_index}]'.upper()
-                    title_changed = True
-
-                for _ in range(current_count - last_count):
-                    bar()
-                last_count = current_count
-
-            if last_count >= total_frames:
-                if completion_flag:
-                    completion_flag.set()
-
-                bar.title = f'Render Completed…   [{progress_index}/{total_index}]'.upper()
-                comp_idx = int(progress_index) - 1
-                result_dir = get_rel_path(result_dirs[comp_idx], depth=-2)
-                result_msg = (
-                        f'Render For "{comp_name}" Completed. '
-                        f'(Result: {result_dir}, '
-                        f'{total_frames} Files)'
-                    )
-                bar_text = Msg.Dim(result_msg, verbose=True)
-                bar.text = bar_text
-
-                monitor_stop_event.set()
-                break
-
-            time.sleep(0.1)
+def run_supervised_render_tasks(tasks: List[Dict[str, Any]], workers: int, logger,
+                                progress: Optional[MultiRenderProgress] = None,
+                                pipeline: Optional[ChunkPipeline] = None,
+                                runner: Callable = run_supervised_tasks) -> List[Dict[str, Any]]:
+    results = []
+    total_files_rendered = 0
+    total_errors = 0
+
+    def on_complete(task, result):
+        if progress is not None:
+            progress.complete_task(task, result['success'])
+        if pipeline is not None:
+            pipeline.submit(task, result['success'])
+
+    supervised = runner(
+        tasks, workers, logger,
+        on_frame=(lambda task, frame_num, elapsed: progress.on_frame(task['comp_name'], frame_num, elapsed)) if progress else None,
+        on_complete=on_complete if progress or pipeline else None
+    )
+
+    for i, (supervised_result, task_info) in enumerate(zip(supervised, tasks), 1):
+        result = {
+            'success': supervised_result['success'],
+            'task_id': supervised_result['task_id'],
+            'error_msg': (None if supervised_result['success']
+                          else supervised_result['stderr'].strip() or 'Unknown error'),
+            'files_rendered': supervised_result['files_rendered'],
+            'execution_time': supervised_result['elapsed'],
+            'started_at': supervised_result['started_at'],
+            'finished_at': supervised_result['finished_at'],
+            'frame_times': supervised_result.get('frame_times')
+        }
+        files_rendered, error_occurred = _record_task_result(
+            result, task_info, i, len(tasks), results, logger
+        )
+        total_files_rendered += files_rendered
+        if error_occurred:
+            total_errors += 1
+
+    success_count = len(results) - total_errors
+    logger.info(f'All tasks completed: {len(results)} tasks, '
+              f'{total_files_rendered} files rendered, '
+              f'{success_count} success, {total_errors} errors')
 
-    except Exception:
-        pass
+    return results
 
 def run_render_tasks(tasks: List[Dict[str, Any]], workers: int, logger, render_stop_event,
-                    bar=None, progress_index=None, total_index=None) -> List[Dict[str, Any]]:
+                    engine: str = DEFAULT_ENGINE,
+                    progress: Optional[MultiRenderProgress] = None,
+                    pipeline: Optional[ChunkPipeline] = None,
+                    coordinator: Optional[str] = None) -> List[Dict[str, Any]]:
     results = []
 
     if not tasks:
         logger.warning('No tasks to execute')
         return results
 
+    if engine == 'async':
+        return run_supervised_render_tasks(tasks, workers, logger, progress, pipeline)
+
+    if engine == 'distributed':
+        return run_supervised_render_tasks(tasks, workers, logger, progress, pipeline,
+                                           runner=partial(run_distributed_tasks, bind=coordinator))
+
     logger.info(f'Starting multiprocessing: {len(tasks)} tasks, {workers} workers')
     logger.debug(f'Task details: {[task.get("task_detail", task.get("comp_name", "unknown")) for task in tasks]}')
 
+    manager = None
+    progress_queue = None
+    consumer = None
+    consumer_stop = threading.Event()
+
+    stream_frames = progress is not None and progress.stream_frames
+
     try:
+        manager = TimeoutManager()
+        manager.start()
+        timeouts = manager.AdaptiveTimeout()
+        if stream_frames:
+            progress_queue = manager.Queue()
+            consumer = threading.Thread(target=consume_frame_events,
+                                        args=(progress_queue, consumer_stop, progress.on_event),
+                                        daemon=True)
+            consumer.start()
+
         with ProcessPoolExecutor(max_workers=workers) as executor:
-            futures = []
+            futures = {}
 
             for i, task in enumerate(tasks):
                 if is_shutdown_requested():
@@ -230,8 +273,9 @@ def run_render_tasks(tasks: List[Dict[str, Any]], workers: int, logger, render_s
 
                 aerender_cmd = task['aerender_command']
                 expected_files = task.get('expected_files', 0)
-                future = executor.submit(execute_aerender_command, aerender_cmd, i + 1, expected_files)
-                futures.append((future, task))
+                future = executor.submit(execute_aerender_command, aerender_cmd, i + 1, expected_files,
+                                         progress_queue, task.get('comp_name'), timeouts)
+                futures[future] = i
 
             if not futures:
                 logger.warning('No tasks were submitted for processing')
@@ -239,59 +283,28 @@ def run_render_tasks(tasks: List[Dict[str, Any]], workers: int, logger, render_s
 
             logger.info(f'Submitted {len(futures)} tasks for processing')
 
-            total_files_rendered = 0
-            total_errors = 0
-
-            for i, (future, task_info) in enumerate(futures):
-                if is_shutdown_requested():
-                    logger.warning(f'User shutdown requested, forcing task completion {i+1}/{len(futures)}')
-                    for j, (remaining_future, remaining_task) in enumerate(futures[i:], i):
-                        try:
-                            result = remaining_future.result(timeout=120)
-                            remaining_future._cached_result = result
-                            files_rendered, error_occurred = _process_completed_future(
-                                remaining_future, remaining_task, j + 1, len(futures), results, logger, total_files_rendered, total_errors
-                            )
-                            total_files_rendered += files_rendered
-                            if error_occurred:
-                                total_errors += 1
-                        except Exception as e:
-                            total_errors += 1
-                            task_detail = remaining_task.get('task_detail', remaining_task.get('comp_name', f'Task {j+1}'))
-                            err_result = {
-                                'success': False,
-                                'task_id': j + 1,
-                                'error_msg': f'Forced completion: {trace_error(e)}',
-                                'files_rendered': 0,
-                                'execution_time': 0.0
-                            }
-                            results.append(err_result)
-                            logger.error(f'Task {j+1} forced completion failed ({task_detail}): {trace_error(e)}')
-                    break
-
-                try:
-                    result = future.result(timeout=600)
-                    future._cached_result = result
-                    files_rendered, error_occurred = _process_completed_future(
-                        future, task_info, i + 1, len(futures), results, logger, total_files_rendered, total_errors
-                    )
-                    total_files_rendered += files_rendered
-                    if error_occurred:
-                        total_errors += 1
-
-                except Exception as e:
-                    total_errors += 1
-                    task_detail = task_info.get('task_detail', task_info.get('comp_name', f'Task {i+1}'))
-                    err_result = {
-                        'success': False,
-                        'task_id': i + 1,
-                        'error_msg': trace_error(e),
-                        'files_rendered': 0,
-                        'execution_time': 0.0
-                    }
-                    results.append(err_result)
-                    logger.error(f'Task {i+1} failed ({task_detail}): {trace_error(e)}')
-
+            tracker = TaskTracker(tasks)
+
+            def on_result(index, future):
+                task_info = tasks[index]
+                completed = []
+                _, error_occurred = _process_completed_future(
+                    future, task_info, index + 1, len(futures), completed, logger, 0, 0
+                )
+                tracker.mark_done(index, completed[0], not error_occurred)
+                if not stream_frames and not error_occurred:
+                    timeouts.record_task(completed[0].get('execution_time', 0.0),
+                                         task_info.get('expected_files', 0))
+                if progress is not None:
+                    progress.complete_task(task_info, not error_occurred)
+                if pipeline is not None:
+                    pipeline.submit(task_info, not error_occurred)
+
+            drain_completed(futures, tracker, on_result, logger)
+            results = tracker.ordered_results()
+
+            total_files_rendered = sum(r.get('files_rendered', 0) for r in results)
+            total_errors = sum(1 for r in results if not r.get('success', False))
             success_count = len(results) - total_errors
             logger.info(f'All tasks completed: {len(results)} tasks, '
                       f'{total_files_rendered} files rendered, '
@@ -299,40 +312,60 @@ def run_render_tasks(tasks: List[Dict[str, Any]], workers: int, logger, render_s
 
     except Exception as e:
         logger.error(f'Multiprocessing execution failed: {trace_error(e)}')
+    finally:
+        consumer_stop.set()
+        if consumer is not None:
+            consumer.join(timeout=2.0)
+        if manager is not None:
+            manager.shutdown()
 
     return results
 
 def extract_temp_files(recipe: Dict[str, Any]) -> str:
     return recipe['project_settings']['temp_directory']
 
-def update_status(recipe: Dict[str, Any], json_path: str, logger) -> bool:
+def update_status(recipe: Dict[str, Any], session: RecipeSession, logger,
+                  tasks: List[Dict[str, Any]]) -> bool:
     try:
-        for comp_name, comp_data in recipe['result_outputs'].items():
-            if 'frames' in comp_data:
-                for frame_num, frame_info in comp_data['frames'].items():
-                    tmp_path = frame_info.get('tmp', '')
-                    if tmp_path and os.path.exists(tmp_path):
-                        frame_info['rendered'] = True
-
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(recipe, f, ensure_ascii=False, indent=2)
-
-        logger.info(f"JSON status updated: {json_path}")
+        for comp_name, frame_ids in get_task_frames(tasks).items():
+            comp_data = recipe['result_outputs'][comp_name]
+            frames = comp_data.get('frames', {})
+            outstanding = 0
+            for frame_id in frame_ids:
+                frame_info = frames.get(frame_id)
+                if frame_info is None:
+                    continue
+                tmp_path = frame_info.get('tmp', '')
+                if not frame_info.get('rendered', False) and tmp_path and os.path.exists(tmp_path):
+                    frame_info['rendered'] = True
+                if not frame_info.get('rendered', False):
+                    outstanding += 1
+            comp_data['completed'] = comp_data.get('total', len(frames)) - outstanding
+
+            session.update_frames(comp_name, get_frame_updates(frames, frame_ids))
+            comp_fields = {key: comp_data[key] for key in ('elapsed_time', 'completed') if key in comp_data}
+            if comp_fields:
+                session.update_recipe(comps={comp_name: comp_fields})
+            session.update_tasks(comp_name)
+
+        session.flush()
+
+        logger.info(f"Render state updated ({session.backend}): {session.json_path}")
         return True
 
     except Exception as e:
         logger.error(f"JSON status update failed: {trace_error(e)}")
         return False
 
-def execute_render(json_path: str, enable_logs: bool = False, preview: bool = False) -> Tuple[int, str]:
+def execute_render(session: RecipeSession, enable_logs: bool = False, preview: bool = False) -> Tuple[int, str]:
     try:
-        recipe = load_json_data(json_path)
+        recipe = session.recipe
 
         from .render_logger import get_logger
         logger = get_logger()
 
         render_info_log(recipe, enable_logs, preview, logger)
-        logger.info('Execution mode: Multi composition sequential execution')
+        logger.info('Execution mode: Multi composition global execution')
 
         temp_dir = recipe['project_settings']['temp_directory']
         setup_handler(logger, temp_dir)
@@ -342,38 +375,27 @@ def execute_render(json_path: str, enable_logs: bool = False, preview: bool = Fa
             return 1, ""
 
         workers = recipe['worker_configuration']['configured_workers']
+        engine = recipe['worker_configuration'].get('engine', DEFAULT_ENGINE)
+        coordinator = recipe['worker_configuration'].get('coordinator', DEFAULT_COORDINATOR_BIND)
+        logger.info(f'Execution engine: {engine}')
+        if recipe['worker_configuration'].get('speculative', False):
+            logger.warning('Speculative execution is not supported for multi composition renders, ignored')
+        if recipe['worker_configuration'].get('split', False):
+            logger.warning('Mid-flight splitting is not supported for multi composition renders, ignored')
         comp_names = list(recipe['result_outputs'].keys())
-        total_comps = len(comp_names)
-        all_results = []
+        result_dirs = recipe['project_settings']['result_dir']
+        all_tasks = []
+        comp_totals = {}
+        result_labels = {}
 
-        for comp_index, comp_name in enumerate(comp_names, 1):
-            reset_shutdown_event()
+        reset_shutdown_event()
 
+        for comp_index, comp_name in enumerate(comp_names, 1):
             comp_data = recipe['result_outputs'][comp_name]
             comp_tasks = []
 
             if 'workflow' in comp_data and 'chunk_tasks' in comp_data['workflow']:
                 for task_idx, task in enumerate(comp_data['workflow']['chunk_tasks']):
-                    aerender_cmd = task['aerender_command']
-                    start_frame = 'N/A'
-                    end_frame = 'N/A'
-
-                    try:
-                        s_idx = aerender_cmd.index('-s')
-                        if s_idx + 1 < len(aerender_cmd):
-                            start_frame = aerender_cmd[s_idx + 1]
-
-                        e_idx = aerender_cmd.index('-e')
-                        if e_idx + 1 < len(aerender_cmd):
-                            end_frame = aerender_cmd[e_idx + 1]
-                    except (ValueError, IndexError):
-                        chunk_id = task.get('chunk_id', '')
-                        if '_' in chunk_id and chunk_id.count('_') >= 3:
-                            parts = chunk_id.split('_')
-                            if len(parts) >= 4:
-                                start_frame = str(int(parts[-2]))
-                                end_frame = str(int(parts[-1]))
-
                     file_count = task.get('file_count', 0)
 
                     task_num = f'RenderTask_{task_idx+1:02d}'
@@ -382,107 +404,104 @@ def execute_render(json_path: str, enable_logs: bool = False, preview: bool = Fa
                         'comp_name': comp_name,
                         'aerender_command': task['aerender_command'],
                         'temp_project': recipe['project_settings']['temp_project'],
-                        'task_detail': task_num,
+                        'task_detail': f'{comp_name}/{task_num}',
                         'task_id': task_num,
-                        'expected_files': file_count
+                        'chunk_id': task.get('chunk_id'),
+                        'start_frame': task.get('start_frame'),
+                        'end_frame': task.get('end_frame'),
+                        'expected_files': file_count,
+                        'expected_cost': task.get('expected_cost'),
+                        'preview_pass': task.get('preview_pass')
                     })
 
             if not comp_tasks:
                 logger.warning(f"No tasks found for composition: {comp_name}")
                 continue
 
-            total_frames = 0
-            if 'frames' in comp_data:
-                total_frames = len(comp_data['frames'])
-            else:
-                for task in comp_data['workflow']['chunk_tasks']:
-                    total_frames += task.get('file_count', 0)
-
-            comp_start_time = datetime.now()
-            comp_end_time = comp_start_time
-
-            try:
-                with alive_bar(
-                    total_frames, spinner=None, title='PLEASE WAIT…', title_length=27,
-                    length=20, dual_line=True, stats=True, elapsed=True, manual=False,
-                    enrich_print=False, force_tty=True, refresh_secs=0.1,
-                    receipt_text=True, monitor_end=True
-                ) as bar:
-                    progress_index = f'{comp_index:02d}'
-                    total_index = f'{total_comps:02d}'
-
-                    bar.title = f'INITIALIZING… PLEASE WAIT… '
-                    bar_text = Msg.Dim(f'[{progress_index}/{total_index}] '
-                                       f'INITIALIZING RENDER EXECUTION. PLEASE WAIT… ', verbose=True)
-                    bar.text = bar_text
-
-                    monitor_stop_event = threading.Event()
-                    completion_flag = threading.Event()
-                    render_stop_event = None
-
-                    activate_system_monitor(bar, monitor_stop_event, completion_flag)
-
-                    temp_workspace = recipe['project_settings']['temp_directory']
-                    file_ext = recipe['project_settings']['file_extension']
-                    result_dirs = recipe['project_settings']['result_dir']
-
-                    progress_thread = threading.Thread(
-                        target=monitor_progress_files,
-                        args=(temp_workspace, comp_name, file_ext, bar, monitor_stop_event, total_frames, progress_index, total_index, result_dirs, logger, completion_flag),
-                        daemon=True
-                    )
-                    progress_thread.start()
-
-                    comp_start_time = datetime.now()
-
-                    comp_results = run_render_tasks(comp_tasks, workers, logger, render_stop_event, bar, progress_index, total_index)
-                    all_results.extend(comp_results)
-
-                    comp_end_time = datetime.now()
-
-                    time.sleep(0.5)
-
-            except KeyboardInterrupt:
-                logger.warning(f"Composition {comp_name} interrupted by user")
-                time.sleep(0.2)
-                raise
-            except Exception as e:
-                logger.error(f"Composition {comp_name} failed: {trace_error(e)}")
-                time.sleep(0.2)
-                raise
-
-            comp_elapsed = comp_end_time - comp_start_time
-            comp_elapsed_str = format_elapsed_time(comp_elapsed.total_seconds())
-
-            if 'frames' in comp_data:
-                for frame_num, frame_info in comp_data['frames'].items():
-                    tmp_path = frame_info.get('tmp', '')
-                    if tmp_path and os.path.exists(tmp_path):
-                        frame_info['rendered'] = True
+            comp_totals[comp_name] = sum(task.get('file_count', 0)
+                                         for task in comp_data['workflow']['chunk_tasks'])
 
-            frames = comp_data.get('frames', {})
-            completed_count = sum(1 for frame in frames.values()
-                                 if frame.get('rendered', False))
+            result_labels[comp_name] = get_rel_path(result_dirs[comp_index - 1], depth=-2)
+            all_tasks.extend(comp_tasks)
+
+        if all_tasks and all(task['expected_cost'] is not None for task in all_tasks):
+            all_tasks.sort(key=lambda task: task['expected_cost'], reverse=True)
+            logger.info('Global task queue ordered by expected cost (render history)')
+        elif all_tasks and all(task['preview_pass'] is not None for task in all_tasks):
+            all_tasks.sort(key=lambda task: task['preview_pass'])
+            logger.info('Global task queue ordered by preview pass (progressive)')
+
+        total_frames = sum(comp_totals.values())
+        total_index = f'{len(comp_totals):02d}'
+        logger.info(f'Global task queue: {len(all_tasks)} tasks across '
+                    f'{len(comp_totals)} compositions ({total_frames} frames)')
+
+        all_results = []
+        progress = None
+        pipeline = ChunkPipeline(recipe, workers, logger,
+                                 journal_path=get_journal_path(session.json_path))
+
+        try:
+            with alive_bar(
+                total_frames, spinner=None, title='PLEASE WAIT…', title_length=27,
+                length=20, dual_line=True, stats=True, elapsed=True, manual=False,
+                enrich_print=False, force_tty=True, refresh_secs=0.1,
+                receipt_text=True, monitor_end=True
+            ) as bar:
+                bar.title = f'INITIALIZING… PLEASE WAIT… '
+                bar_text = Msg.Dim(f'[00/{total_index}] '
+                                   f'INITIALIZING RENDER EXECUTION. PLEASE WAIT… ', verbose=True)
+                bar.text = bar_text
+
+                monitor_stop_event = threading.Event()
+                completion_flag = threading.Event()
+                render_stop_event = None
+
+                activate_system_monitor(bar, monitor_stop_event, completion_flag)
+
+                stream_frames = is_progress_verbose(recipe['project_settings'].get('verbose_level', ''))
+                progress = MultiRenderProgress(comp_totals, bar, result_labels,
+                                               completion_flag, logger, stream_frames)
+
+                all_results = run_render_tasks(all_tasks, workers, logger, render_stop_event, engine, progress, pipeline, coordinator)
+
+                monitor_stop_event.set()
+
+        except KeyboardInterrupt:
+            logger.warning("Multi composition render interrupted by user")
+            raise
+        except Exception as e:
+            logger.error(f"Multi composition render failed: {trace_error(e)}")
+            raise
+
+        pipeline.drain()
+
+        for task_info, result in zip(all_tasks, all_results):
+            if isinstance(result, dict):
+                result['comp_name'] = task_info['comp_name']
+
+        for comp_name in comp_totals:
+            comp_data = recipe['result_outputs'][comp_name]
+            comp_results = [r for r in all_results if r.get('comp_name') == comp_name]
+
+            spans = [(r['started_at'], r['finished_at']) for r in comp_results
+                     if 'started_at' in r and 'finished_at' in r]
+            comp_elapsed = (max(end for _, end in spans) - min(start for start, _ in spans)) if spans else 0.0
+            comp_elapsed_str = format_elapsed_time(comp_elapsed)
 
-            recipe['result_outputs'][comp_name]['elapsed_time'] = comp_elapsed_str
-            recipe['result_outputs'][comp_name]['completed'] = completed_count
+            if progress is not None and progress.stream_frames:
+                timed = apply_frame_times(comp_data, progress.frame_times[comp_name])
+                logger.info(f'Frame timings recorded: {comp_name} ({timed}/{comp_totals[comp_name]} frames)')
 
-            try:
-                with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(recipe, f, indent=2, ensure_ascii=False)
-                logger.info(f"Composition completed: {comp_name} ({len(comp_results)} tasks, "
-                           f"completed={completed_count}%, elapsed: {comp_elapsed_str})")
-                logger.debug(f"JSON updated: {comp_name} completion status")
-            except Exception as e:
-                logger.warning(f"Failed to update completion status: {e}")
+            comp_data['elapsed_time'] = comp_elapsed_str
 
-            if comp_index < total_comps:
-                print('-')
-                time.sleep(1.0)
+            logger.info(f"Composition completed: {comp_name} ({len(comp_results)} tasks, "
+                       f"elapsed: {comp_elapsed_str})")
 
         if not is_shutdown_requested():
             msg = f'Rendering completed: {len(all_results)} tasks'
-            update_status(recipe, json_path, logger)
+            record_render_history(recipe, logger)
+            update_status(recipe, session, logger, all_tasks)
             logger.info(msg)
         else:
             err_msg = 'Rendering interrupted by user.'
@@ -508,7 +527,9 @@ def main():
 
     args = parser.parse_args()
 
-    exit_code, temp_dir = execute_render(args.json_path, args.logs)
+    session = RecipeSession(args.json_path)
+    exit_code, temp_dir = execute_render(session, args.logs)
+    session.close()
     return exit_code
 
 if __name__ == '__main__':
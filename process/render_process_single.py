@@ -2,16 +2,14 @@
 
 import os
 import sys
-import json
 import time
 import shutil
 import argparse
-import subprocess
 import threading
-import glob
+from functools import partial
 from datetime import datetime
 from concurrent.futures import ProcessPoolExecutor
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, Callable
 from alive_progress import alive_bar
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -20,12 +18,27 @@ from configs import Msg, DEFAULT_TEMP_DIR, DEFAULT_OUTPUT_DIR
 from scripts import (
     get_rel_path, get_short_path, setup_handler, is_shutdown_requested, process_kill,
     make_dir, trace_error, get_usable_workers,
-    activate_system_monitor, sanitize_names, format_elapsed_time
+    activate_system_monitor, format_elapsed_time
 )
 from scripts._sig_handler import reset_shutdown_event
-from scripts._ae_specifics import load_json_data
+from scripts._state import RecipeSession, get_frame_updates
+
+from scripts._aerender_progress import stream_aerender, is_progress_verbose, get_command_frame_range
+from scripts._task_timeout import TimeoutManager
+from scripts._trace import trace_task
+from configs.defaults import DEFAULT_ENGINE, DEFAULT_COORDINATOR_BIND
 
 from .render_logger import render_info_log, render_result_log
+from .render_supervisor import run_supervised_tasks
+from .render_distributed import run_distributed_tasks
+from .render_pipeline import ChunkPipeline, get_journal_path, get_task_frames
+from .render_history import record_render_history
+from .render_tracker import TaskTracker, drain_completed
+from .render_speculation import (
+    StragglerMonitor, build_speculative_task, adopt_speculative_output, discard_speculative_output
+)
+from .render_split import ChunkSplitter
+from .render_progress import RenderProgress, apply_frame_times, consume_frame_events
 
 def setup_workspace(recipe: Dict[str, Any], logger) -> bool:
     try:
@@ -62,101 +75,73 @@ def setup_workspace(recipe: Dict[str, Any], logger) -> bool:
         logger.error(f"Workspace setup failed: {trace_error(e)}")
         return False
 
-def monitor_progress_files(temp_workspace: str, comp_name: str, file_ext: str,
-                         bar, monitor_stop_event: threading.Event, total_frames: int,
-                         progress_index: str, total_index: str, result_dirs, logger,
-                         completion_flag: threading.Event):
-
-    last_count = 0
-    title_changed = False
-
-    try:
-        sanitized_comp = sanitize_names(comp_name, strict=True)
-
-        while not monitor_stop_event.is_set() and not is_shutdown_requested():
-            patterns = [
-                os.path.join(temp_workspace, f'tmp_{sanitized_comp}*', f'*.{file_ext}'),
-                os.path.join(temp_workspace, f'tmp_{sanitized_comp}*', f'{sanitized_comp}.*'),
-            ]
-
-            all_files = []
-            for pattern in patterns:
-                files = glob.glob(pattern)
-                all_files.extend(files)
-
-            all_files_set = set(all_files)
-            current_count = len(all_files_set)
-
-            if current_count > last_count:
-                if not title_changed and current_count > 0:
-                    bar.title = f'Render In Progress… [{progress_index}/{total_index}]'.upper()
-                    title_changed = True
-
-                for _ in range(current_count - last_count):
-                    bar()
-                last_count = current_count
-
-            if last_count >= total_frames:
-                if completion_flag:
-                    completion_flag.set()
-
-                bar.title = f'Render Completed…   [{progress_index}/{total_index}]'.upper()
-                comp_idx = int(progress_index) - 1
-                result_dir = get_short_path(result_dirs[comp_idx], base_dir=DEFAULT_OUTPUT_DIR)
-                result_msg = (
-                        f'Render For "{comp_name}" Completed. '
-                        f'(Result: {result_dir}, '
-                        f'{total_frames} Files)'
-                    )
-                bar_text = Msg.Dim(result_msg, verbose=True)
-                bar.text = bar_text
-
-                monitor_stop_event.set()
-                break
-
-            time.sleep(0.1)
-
-    except Exception:
-        pass
-
-def execute_aerender_command(aerender_cmd: List[str], task_id: int, expected_files: int = 0) -> Dict[str, Any]:
+def execute_aerender_command(aerender_cmd: List[str], task_id: int, expected_files: int = 0,
+                             progress_queue=None, progress_key=None, cancel_event=None,
+                             split_event=None, timeouts=None) -> Dict[str, Any]:
     start_time = time.time()
 
+    def on_frame(frame_num, elapsed):
+        progress_queue.put((progress_key, frame_num, elapsed))
+
     try:
-        result = subprocess.run(
+        result = stream_aerender(
             aerender_cmd,
-            capture_output=True,
-            text=True,
-            timeout=300,
-            encoding='utf-8',
-            errors='replace'
+            on_frame=on_frame if progress_queue is not None else None,
+            timeouts=timeouts,
+            cancel_event=cancel_event,
+            split_event=split_event
         )
 
         end_time = time.time()
         elapsed = end_time - start_time
 
+        if result['timed_out'] or result['cancelled']:
+            return {
+                'task_id': task_id,
+                'exit_code': -1,
+                'stdout': result['stdout'],
+                'stderr': result['timeout_reason'] if result['timed_out'] else 'Cancelled: other copy finished first',
+                'elapsed': elapsed,
+                'files_rendered': 0,
+                'success': False,
+                'command': ' '.join(aerender_cmd),
+                'started_at': start_time,
+                'finished_at': end_time,
+                'frame_times': result['frame_times']
+            }
+
+        if result['split']:
+            start_frame, _ = get_command_frame_range(aerender_cmd)
+            return {
+                'task_id': task_id,
+                'exit_code': 0,
+                'stdout': result['stdout'],
+                'stderr': '',
+                'elapsed': elapsed,
+                'files_rendered': result['last_frame'] - start_frame + 1,
+                'success': True,
+                'split': True,
+                'last_frame': result['last_frame'],
+                'command': ' '.join(aerender_cmd),
+                'started_at': start_time,
+                'finished_at': end_time,
+                'frame_times': result['frame_times']
+            }
+
         return {
             'task_id': task_id,
-            'exit_code': result.returncode,
-            'stdout': result.stdout,
-            'stderr': result.stderr,
+            'exit_code': result['returncode'],
+            'stdout': result['stdout'],
+            'stderr': result['stderr'],
             'elapsed': elapsed,
-            'files_rendered': expected_files if result.returncode == 0 else 0,
-            'success': result.returncode == 0,
-            'command': ' '.join(aerender_cmd)
+            'files_rendered': expected_files if result['returncode'] == 0 else 0,
+            'success': result['returncode'] == 0,
+            'command': ' '.join(aerender_cmd),
+            'started_at': start_time,
+            'finished_at': end_time,
+            'frame_times': result['frame_times']
         }
 
-    except subprocess.TimeoutExpired:
-        return {
-            'task_id': task_id,
-            'exit_code': -1,
-            'stdout': '',
-            'stderr': 'Command timed out after 300 seconds',
-            'elapsed': 300,
-            'files_rendered': 0,
-            'success': False,
-            'command': ' '.join(aerender_cmd)
-        }
     except Exception as e:
         return {
             'task_id': task_id,
@@ -169,30 +154,131 @@ def execute_aerender_command(aerender_cmd: List[str], task_id: int, expected_fil
             'command': ' '.join(aerender_cmd)
         }
 
+def _summarize_task_result(result: Dict[str, Any], task_info: Dict[str, Any],
+                           index: int, total: int, logger) -> Dict[str, Any]:
+    files_rendered = result.get('files_rendered', 0)
+    task_detail = task_info.get('task_detail', f'Task {index}')
+    trace_task(task_info, result)
+
+    if result.get('success', False):
+        elapsed_str = format_elapsed_time(result.get('elapsed', 0))
+        logger.info(f'Task {index}/{total} success ({task_detail}: files: {files_rendered}, elapsed: {elapsed_str})')
+    else:
+        logger.error(f'Task {index}/{total} failed ({task_detail}): {result.get("stderr", "Unknown error")}')
+
+    return {
+        'task_id': result.get('task_id', index),
+        'task_detail': task_detail,
+        'files_rendered': files_rendered,
+        'elapsed': result.get('elapsed', 0),
+        'success': result.get('success', False),
+        'exit_code': result.get('exit_code', -1)
+    }
+
+def run_supervised_render_tasks(tasks: List[Dict[str, Any]], workers: int, logger,
+                                progress: Optional[RenderProgress] = None,
+                                pipeline: Optional[ChunkPipeline] = None,
+                                runner: Callable = run_supervised_tasks) -> List[Dict[str, Any]]:
+    def on_complete(task, result):
+        if progress is not None:
+            progress.complete_task(task, result['success'])
+        if pipeline is not None:
+            pipeline.submit(task, result['success'])
+
+    supervised = runner(
+        tasks, workers, logger,
+        on_frame=(lambda task, frame_num, elapsed: progress.on_frame(frame_num, elapsed)) if progress else None,
+        on_complete=on_complete if progress or pipeline else None
+    )
+
+    results = []
+    for i, (result, task_info) in enumerate(zip(supervised, tasks), 1):
+        results.append(_summarize_task_result(result, task_info, i, len(tasks), logger))
+
+    total_files_rendered = sum(r['files_rendered'] for r in results)
+    total_errors = sum(1 for r in results if not r['success'])
+    logger.info(f'All tasks completed: {len(tasks)} tasks, {total_files_rendered} files rendered, {len(results)-total_errors} success, {total_errors} errors')
+
+    return results
+
 def run_render_tasks_parallel(tasks: List[Dict[str, Any]], workers: int, logger, render_stop_event,
-                    bar=None, progress_index=None, total_index=None) -> List[Dict[str, Any]]:
+                    bar=None, progress_index=None, total_index=None,
+                    engine: str = DEFAULT_ENGINE,
+                    progress: Optional[RenderProgress] = None,
+                    pipeline: Optional[ChunkPipeline] = None,
+                    coordinator: Optional[str] = None,
+                    speculative: bool = False,
+                    splitter: Optional[ChunkSplitter] = None) -> List[Dict[str, Any]]:
     results = []
 
     if not tasks:
         logger.warning('No tasks to execute')
         return results
 
+    if engine != 'process' and speculative:
+        logger.warning(f'Speculative execution is not supported by the {engine} engine, ignored')
+    if engine != 'process' and splitter is not None:
+        logger.warning(f'Mid-flight splitting is not supported by the {engine} engine, ignored')
+
+    if engine == 'async':
+        return run_supervised_render_tasks(tasks, workers, logger, progress, pipeline)
+
+    if engine == 'distributed':
+        return run_supervised_render_tasks(tasks, workers, logger, progress, pipeline,
+                                           runner=partial(run_distributed_tasks, bind=coordinator))
+
     logger.info(f'Starting multiprocessing: {len(tasks)} tasks, {workers} workers')
     logger.debug(f'Task details: {[task.get("task_detail", task.get("comp_name", "unknown")) for task in tasks]}')
 
+    manager = None
+    progress_queue = None
+    consumer = None
+    consumer_stop = threading.Event()
+
+    stream_frames = progress is not None and progress.stream_frames
+    if not stream_frames and splitter is not None:
+        logger.warning('Mid-flight splitting needs PROGRESS in the aerender verbose level, ignored')
+        splitter = None
+
+    def on_event(progress_key, frame_num, elapsed):
+        if splitter is not None:
+            splitter.on_event(progress_key, frame_num, elapsed)
+        progress.on_event(progress_key, frame_num, elapsed)
+
     try:
+        manager = TimeoutManager()
+        manager.start()
+        timeouts = manager.AdaptiveTimeout()
+        if stream_frames:
+            progress_queue = manager.Queue()
+            consumer = threading.Thread(target=consume_frame_events,
+                                        args=(progress_queue, consumer_stop, on_event),
+                                        daemon=True)
+            consumer.start()
+
         with ProcessPoolExecutor(max_workers=workers) as executor:
-            futures = []
+            futures = {}
+            cancel_events = {}
+            split_events = {}
+
+            def submit(index, task, aerender_cmd=None):
+                cancel_event = manager.Event() if speculative else None
+                split_event = manager.Event() if splitter is not None else None
+                future = executor.submit(execute_aerender_command, aerender_cmd or task['aerender_command'],
+                                         index + 1, task.get('expected_files', 0),
+                                         progress_queue, index, cancel_event, split_event, timeouts)
+                if aerender_cmd is None:
+                    cancel_events[index] = cancel_event
+                    split_events[index] = split_event
+                return future, cancel_event
 
             for i, task in enumerate(tasks):
                 if is_shutdown_requested():
                     logger.warning(f'User shutdown requested during task submission at {i+1}/{len(tasks)}')
                     break
 
-                aerender_cmd = task['aerender_command']
-                expected_files = task.get('expected_files', 0)
-                future = executor.submit(execute_aerender_command, aerender_cmd, i + 1, expected_files)
-                futures.append((future, task))
+                future, _ = submit(i, task)
+                futures[future] = i
 
             if not futures:
                 logger.warning('No tasks were submitted for processing')
@@ -200,56 +286,144 @@ def run_render_tasks_parallel(tasks: List[Dict[str, Any]], workers: int, logger,
 
             logger.info(f'Submitted {len(futures)} tasks for processing')
 
-            total_files_rendered = 0
-            total_errors = 0
-
-            for i, (future, task_info) in enumerate(futures):
-                if is_shutdown_requested():
-                    logger.warning(f'User shutdown requested, forcing task completion {i+1}/{len(futures)}')
-                    for j, (remaining_future, remaining_task) in enumerate(futures[i:], i):
-                        try:
-                            result = remaining_future.result(timeout=120)
-                            remaining_future._cached_result = result
-                        except Exception as timeout_e:
-                            logger.error(f'Forced completion failed for task {j+1}: {timeout_e}')
-                    break
-
+            tracker = TaskTracker(tasks)
+            tasks = tracker.tasks
+            monitor = StragglerMonitor() if speculative else None
+            speculations = {}
+            splits = {}
+            split_done = []
+            held = {}
+            queued = {}
+
+            def finalize(index, result, task_info=None):
+                task_info = task_info or tasks[index]
+                task_result = _summarize_task_result(result, task_info, index + 1, len(tasks), logger)
+                tracker.mark_done(index, task_result, task_result['success'])
+                if not stream_frames and task_result['success']:
+                    timeouts.record_task(result.get('elapsed', 0), task_info.get('file_count', 0))
+                if monitor is not None:
+                    monitor.record(result, task_info.get('file_count', 0))
+                if progress is not None:
+                    progress.complete_task(task_info, task_result['success'])
+                if pipeline is not None:
+                    pipeline.submit(task_info, task_result['success'])
+
+            def adopt(index, result):
+                adopted = adopt_speculative_output(tasks[index], speculations[index]['task'])
+                logger.info(f'{tasks[index].get("task_detail", index + 1)}: speculative copy won '
+                            f'({adopted} files adopted)')
+                finalize(index, dict(result, task_id=index + 1))
+
+            def split_task(index, result):
+                task = tasks[index]
+                last_frame = result['last_frame']
+                done_task = dict(task, end_frame=last_frame,
+                                 file_count=last_frame - task['start_frame'] + 1)
+                finalize(index, result, done_task)
+
+                split_tasks = splitter.split(task, last_frame, splits[index])
+                split_done.append(index)
+                for new_task in split_tasks:
+                    new_index = tracker.add(new_task)
+                    future, _ = submit(new_index, new_task)
+                    queued[future] = new_index
+
+                logger.info(f'{task.get("task_detail", index + 1)} split after frame {last_frame}: '
+                            f'{done_task["file_count"]} frames kept, frames {last_frame + 1}-{task["end_frame"]} '
+                            f'requeued as {len(split_tasks)} tasks')
+
+            def on_result(index, future):
                 try:
-                    if hasattr(future, '_cached_result'):
-                        result = future._cached_result
-                    else:
-                        result = future.result(timeout=600)
-
-                    files_rendered = result.get('files_rendered', 0)
-                    total_files_rendered += files_rendered
-
-                    if result.get('success', False):
-                        elapsed_str = format_elapsed_time(result.get('elapsed', 0))
-                        task_detail = task_info.get('task_detail', f'Task {i+1}')
-
-                        logger.info(f'Task {i+1}/{len(futures)} success ({task_detail}: files: {files_rendered}, elapsed: {elapsed_str})')
-                    else:
-                        total_errors += 1
-                        task_detail = task_info.get('task_detail', f'Task {i+1}')
-                        logger.error(f'Task {i+1}/{len(futures)} failed ({task_detail}): {result.get("stderr", "Unknown error")}')
-
-                    task_result = {
-                        'task_id': result.get('task_id', i + 1),
-                        'task_detail': task_info.get('task_detail', f'Task {i+1}'),
-                        'files_rendered': files_rendered,
-                        'elapsed': result.get('elapsed', 0),
-                        'success': result.get('success', False),
-                        'exit_code': result.get('exit_code', -1)
-                    }
-                    results.append(task_result)
-
+                    result = future.result(timeout=0)
                 except Exception as e:
-                    total_errors += 1
-                    error_msg = trace_error(e)
-                    task_detail = task_info.get('task_detail', f'Task {i+1}')
-                    logger.error(f'Task {i+1}/{len(futures)} failed ({task_detail}): {error_msg}')
-
-            logger.info(f'All tasks completed: {len(tasks)} tasks, {total_files_rendered} files rendered, {len(results)-total_errors} success, {total_errors} errors')
+                    result = {'task_id': index + 1, 'exit_code': -1, 'stderr': trace_error(e),
+                              'elapsed': 0, 'files_rendered': 0, 'success': False}
+
+                spec = speculations.get(index)
+                is_copy = spec is not None and future is spec['future']
+
+                if tracker.is_settled(index):
+                    if is_copy:
+                        discard_speculative_output(spec['task'])
+                    return
+
+                if result.get('split') and not is_copy:
+                    split_task(index, result)
+                elif spec is None:
+                    finalize(index, result)
+                elif is_copy:
+                    spec['done'] = True
+                    if result['success']:
+                        spec['result'] = result
+                        if index in held:
+                            held.pop(index)
+                            adopt(index, result)
+                        else:
+                            cancel_events[index].set()
+                    else:
+                        discard_speculative_output(spec['task'])
+                        if index in held:
+                            finalize(index, held.pop(index))
+                elif spec.get('result') is not None:
+                    adopt(index, spec['result'])
+                elif result['success'] or spec.get('done'):
+                    spec['cancel'].set()
+                    finalize(index, result)
+                else:
+                    held[index] = result
+
+            def on_poll(pending):
+                submitted = dict(queued)
+                queued.clear()
+
+                idle = workers - len(pending) - len(submitted)
+                if idle <= 0 or (monitor is None and splitter is None):
+                    return submitted
+
+                now = time.time()
+                running = {index: tasks[index] for future, index in futures.items()
+                           if future in pending and index not in speculations and index not in splits}
+
+                if splitter is not None and not any(not tracker.is_settled(index) for index in splits):
+                    candidate = splitter.pick(running, tracker.started, now)
+                    if candidate is not None:
+                        index, last_frame, projected = candidate
+                        splits[index] = idle + 1
+                        split_events[index].set()
+                        logger.info(f'Splitting {tasks[index].get("task_detail", index + 1)} at frame {last_frame}: '
+                                    f'~{format_elapsed_time(projected)} left, {idle} idle workers')
+                        return submitted
+
+                while monitor is not None and idle > 0:
+                    straggler = monitor.pick({index: task.get('file_count', 0) for index, task in running.items()},
+                                             tracker.started, now)
+                    if straggler is None:
+                        break
+
+                    index, elapsed, expected = straggler
+                    running.pop(index)
+                    spec_task = build_speculative_task(tasks[index])
+                    future, cancel_event = submit(index, spec_task, spec_task['aerender_command'])
+                    speculations[index] = {'future': future, 'task': spec_task, 'cancel': cancel_event}
+                    submitted[future] = index
+                    idle -= 1
+
+                    logger.info(f'Straggler {tasks[index].get("task_detail", index + 1)}: '
+                                f'{format_elapsed_time(elapsed)} elapsed, expected ~{format_elapsed_time(expected)}, '
+                                f'starting speculative copy')
+
+                return submitted
+
+            drain_completed(futures, tracker, on_result, logger, on_poll=on_poll)
+            for index, result in list(held.items()):
+                finalize(index, result)
+            results = tracker.ordered_results()
+
+            total_files_rendered = sum(r['files_rendered'] for r in results)
+            total_errors = sum(1 for r in results if not r['success'])
+            extras = ''.join(f', {count} {label}' for count, label in
+                             ((len(speculations), 'speculative copies'), (len(split_done), 'splits')) if count)
+            logger.info(f'All tasks completed: {len(results)} tasks, {total_files_rendered} files rendered, {len(results)-total_errors} success, {total_errors} errors{extras}')
 
     except KeyboardInterrupt:
         logger.warning('Rendering interrupted by user (Ctrl+C)')
@@ -257,31 +431,45 @@ def run_render_tasks_parallel(tasks: List[Dict[str, Any]], workers: int, logger,
     except Exception as e:
         logger.error(f'Critical error in multiprocessing execution: {trace_error(e)}')
         raise
+    finally:
+        consumer_stop.set()
+        if consumer is not None:
+            consumer.join(timeout=2.0)
+        if manager is not None:
+            manager.shutdown()
 
     return results
 
-def update_status(recipe: Dict[str, Any], json_path: str, logger) -> bool:
+def update_status(recipe: Dict[str, Any], session: RecipeSession, logger,
+                  tasks: List[Dict[str, Any]]) -> bool:
     try:
-        for comp_name, comp_data in recipe['result_outputs'].items():
-            if 'frames' in comp_data:
-                for frame_num, frame_info in comp_data['frames'].items():
-                    tmp_path = frame_info.get('tmp', '')
-                    if tmp_path and os.path.exists(tmp_path):
-                        frame_info['rendered'] = True
-
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(recipe, f, ensure_ascii=False, indent=2)
-
-        logger.info(f"JSON status updated: {json_path}")
+        for comp_name, frame_ids in get_task_frames(tasks).items():
+            comp_data = recipe['result_outputs'][comp_name]
+            frames = comp_data.get('frames', {})
+            for frame_id in frame_ids:
+                frame_info = frames.get(frame_id)
+                tmp_path = frame_info.get('tmp', '') if frame_info is not None else ''
+                if tmp_path and os.path.exists(tmp_path):
+                    frame_info['rendered'] = True
+
+            session.update_frames(comp_name, get_frame_updates(frames, frame_ids))
+            comp_fields = {key: comp_data[key] for key in ('elapsed_time', 'completed') if key in comp_data}
+            if comp_fields:
+                session.update_recipe(comps={comp_name: comp_fields})
+            session.update_tasks(comp_name)
+
+        session.flush()
+
+        logger.info(f"Render state updated ({session.backend}): {session.json_path}")
         return True
 
     except Exception as e:
         logger.error(f"JSON status update failed: {trace_error(e)}")
         return False
 
-def execute_render(json_path: str, enable_logs: bool = False, preview: bool = False) -> Tuple[int, str]:
+def execute_render(session: RecipeSession, enable_logs: bool = False, preview: bool = False) -> Tuple[int, str]:
     try:
-        recipe = load_json_data(json_path)
+        recipe = session.recipe
 
         from .render_logger import get_logger
         logger = get_logger()
@@ -297,9 +485,17 @@ def execute_render(json_path: str, enable_logs: bool = False, preview: bool = Fa
             return 1, ""
 
         workers = recipe['worker_configuration']['configured_workers']
+        engine = recipe['worker_configuration'].get('engine', DEFAULT_ENGINE)
+        coordinator = recipe['worker_configuration'].get('coordinator', DEFAULT_COORDINATOR_BIND)
+        speculative = recipe['worker_configuration'].get('speculative', False)
+        split = recipe['worker_configuration'].get('split', False)
+        logger.info(f'Execution engine: {engine}')
         comp_names = list(recipe['result_outputs'].keys())
         total_comps = len(comp_names)
         all_results = []
+        all_tasks = []
+        pipeline = ChunkPipeline(recipe, workers, logger,
+                                 journal_path=get_journal_path(session.json_path))
 
         for comp_index, comp_name in enumerate(comp_names, 1):
             reset_shutdown_event()
@@ -332,6 +528,7 @@ def execute_render(json_path: str, enable_logs: bool = False, preview: bool = Fa
                                 except ValueError:
                                     pass
 
+                    task['comp_name'] = comp_name
                     task['task_detail'] = f'RenderTask_{task_idx+1:02d}'
                     task['expected_files'] = task.get('file_count', 0)
                     comp_tasks.append(task)
@@ -339,8 +536,9 @@ def execute_render(json_path: str, enable_logs: bool = False, preview: bool = Fa
             if not comp_tasks:
                 logger.warning(f'No tasks found for composition: {comp_name}')
                 continue
+            all_tasks.extend(comp_tasks)
 
-            total_frames = len(comp_data.get('frames', {}))
+            total_frames = sum(task.get('file_count', 0) for task in comp_tasks)
 
             with alive_bar(
                 total_frames, spinner=None, title='PLEASE WAIT…', title_length=27,
@@ -362,24 +560,22 @@ def execute_render(json_path: str, enable_logs: bool = False, preview: bool = Fa
 
                 activate_system_monitor(bar, monitor_stop_event, completion_flag)
 
-                temp_workspace = recipe['project_settings']['temp_directory']
-                file_ext = recipe['project_settings']['file_extension']
                 result_dirs = recipe['project_settings']['result_dir']
-
-                progress_thread = threading.Thread(
-                    target=monitor_progress_files,
-                    args=(temp_workspace, comp_name, file_ext, bar, monitor_stop_event, total_frames, progress_index, total_index, result_dirs, logger, completion_flag),
-                    daemon=True
-                )
-                progress_thread.start()
-
-                time.sleep(0.5)
+                result_label = get_short_path(result_dirs[comp_index - 1], base_dir=DEFAULT_OUTPUT_DIR)
+                stream_frames = is_progress_verbose(recipe['project_settings'].get('verbose_level', ''))
+                progress = RenderProgress(comp_name, total_frames, bar, progress_index, total_index,
+                                          result_label, completion_flag, logger, stream_frames)
+                splitter = ChunkSplitter(recipe) if split else None
 
                 comp_start_time = datetime.now()
 
-                comp_results = run_render_tasks_parallel(comp_tasks, workers, logger, render_stop_event, bar, progress_index, total_index)
+                comp_results = run_render_tasks_parallel(comp_tasks, workers, logger, render_stop_event, bar, progress_index, total_index, engine, progress, pipeline, coordinator, speculative, splitter)
                 all_results.extend(comp_results)
 
+                if progress.stream_frames:
+                    timed = apply_frame_times(comp_data, progress.frame_times)
+                    logger.info(f'Frame timings recorded: {comp_name} ({timed}/{total_frames} frames)')
+
                 comp_end_time = datetime.now()
 
                 completion_flag.set()
@@ -398,9 +594,12 @@ def execute_render(json_path: str, enable_logs: bool = False, preview: bool = Fa
                 print('-')
                 time.sleep(1.0)
 
+        pipeline.drain()
+
         if not is_shutdown_requested():
             msg = f'Rendering completed: {len(all_results)} tasks'
-            update_status(recipe, json_path, logger)
+            record_render_history(recipe, logger)
+            update_status(recipe, session, logger, all_tasks)
             logger.info(msg)
         else:
             err_msg = 'Rendering interrupted by user.'
@@ -434,8 +633,9 @@ def main():
             Msg.Error(f'JSON file not found: {args.json_path}')
             return 1
 
+        session = RecipeSession(args.json_path)
         try:
-            recipe = load_json_data(args.json_path)
+            recipe = session.recipe
             if recipe:
                 from .render_logger import logger_init
 
@@ -454,7 +654,8 @@ def main():
         except Exception as e:
             Msg.Warning(f'Logger initialization failed: {e}')
 
-        exit_code, temp_dir = execute_render(args.json_path, args.logs)
+        exit_code, temp_dir = execute_render(session, args.logs)
+        session.close()
 
         if exit_code == 0:
             Msg.Info('Rendering execution completed successfully')
@@ -0,0 +1,194 @@
+import threading
+from typing import Dict, Any, List
+
+from configs import Msg
+from scripts._aerender_progress import get_command_frame_range
+
+class RenderProgress:
+
+    def __init__(self, comp_name: str, total_frames: int, bar,
+                 progress_index: str, total_index: str, result_label: str,
+                 completion_flag: threading.Event = None, logger=None,
+                 stream_frames: bool = True):
+        self.comp_name = comp_name
+        self.total_frames = total_frames
+        self.bar = bar
+        self.progress_index = progress_index
+        self.total_index = total_index
+        self.result_label = result_label
+        self.completion_flag = completion_flag
+        self.logger = logger
+        self.stream_frames = stream_frames
+
+        self.frame_times: Dict[int, float] = {}
+        self._completed = set()
+        self._lock = threading.Lock()
+        self._title_changed = False
+
+    @property
+    def completed_count(self) -> int:
+        return len(self._completed)
+
+    def _advance(self, frame_num: int) -> None:
+        if frame_num in self._completed:
+            return
+        self._completed.add(frame_num)
+
+        if not self._title_changed:
+            self.bar.title = f'Render In Progress… [{self.progress_index}/{self.total_index}]'.upper()
+            self._title_changed = True
+
+        self.bar()
+
+        if len(self._completed) >= self.total_frames:
+            self._finish()
+
+    def _finish(self) -> None:
+        if self.completion_flag:
+            self.completion_flag.set()
+
+        self.bar.title = f'Render Completed…   [{self.progress_index}/{self.total_index}]'.upper()
+        result_msg = (
+                f'Render For "{self.comp_name}" Completed. '
+                f'(Result: {self.result_label}, '
+                f'{self.total_frames} Files)'
+            )
+        self.bar.text = Msg.Dim(result_msg, verbose=True)
+
+    def on_frame(self, frame_num: int, elapsed: float) -> None:
+        with self._lock:
+            self.frame_times[frame_num] = round(elapsed, 3)
+            self._advance(frame_num)
+
+    def complete_task(self, task: Dict[str, Any], success: bool) -> None:
+        if not success:
+            return
+
+        start_frame = task.get('start_frame')
+        end_frame = task.get('end_frame')
+        if start_frame is None or end_frame is None:
+            start_frame, end_frame = get_command_frame_range(task.get('aerender_command', []))
+        if start_frame is None or end_frame is None:
+            return
+
+        with self._lock:
+            for frame_num in range(start_frame, end_frame + 1):
+                self._advance(frame_num)
+
+    def on_event(self, progress_key, frame_num: int, elapsed: float) -> None:
+        self.on_frame(frame_num, elapsed)
+
+class MultiRenderProgress:
+
+    def __init__(self, comp_totals: Dict[str, int], bar,
+                 result_labels: Dict[str, str],
+                 completion_flag: threading.Event = None, logger=None,
+                 stream_frames: bool = True):
+        self.comp_totals = comp_totals
+        self.total_frames = sum(comp_totals.values())
+        self.bar = bar
+        self.result_labels = result_labels
+        self.completion_flag = completion_flag
+        self.logger = logger
+        self.stream_frames = stream_frames
+
+        self.frame_times: Dict[str, Dict[int, float]] = {name: {} for name in comp_totals}
+        self.finished_comps: List[str] = []
+        self._completed = {name: set() for name in comp_totals}
+        self._lock = threading.Lock()
+        self._title_changed = False
+
+    @property
+    def completed_count(self) -> int:
+        return sum(len(frames) for frames in self._completed.values())
+
+    def _title(self, state: str) -> str:
+        return (f'{state} [{len(self.finished_comps):02d}/'
+                f'{len(self.comp_totals):02d}]').upper()
+
+    def _advance(self, comp_name: str, frame_num: int) -> None:
+        completed = self._completed.get(comp_name)
+        if completed is None or frame_num in completed:
+            return
+        completed.add(frame_num)
+
+        if not self._title_changed:
+            self.bar.title = self._title('Render In Progress…')
+            self._title_changed = True
+
+        self.bar()
+
+        if len(completed) >= self.comp_totals[comp_name]:
+            self._finish_comp(comp_name)
+
+    def _finish_comp(self, comp_name: str) -> None:
+        self.finished_comps.append(comp_name)
+        total = self.comp_totals[comp_name]
+
+        result_msg = (
+                f'Render For "{comp_name}" Completed. '
+                f'(Result: {self.result_labels.get(comp_name, "")}, '
+                f'{total} Files)'
+            )
+        Msg.Dim(result_msg)
+        if self.logger:
+            self.logger.info(f'Composition frames completed: {comp_name} ({total} frames)')
+
+        if len(self.finished_comps) >= len(self.comp_totals):
+            if self.completion_flag:
+                self.completion_flag.set()
+            self.bar.title = self._title('Render Completed…  ')
+            self.bar.text = Msg.Dim(f'Render For {len(self.comp_totals)} Compositions Completed. '
+                                    f'({self.total_frames} Files)', verbose=True)
+        else:
+            self.bar.title = self._title('Render In Progress…')
+
+    def on_frame(self, comp_name: str, frame_num: int, elapsed: float) -> None:
+        with self._lock:
+            if comp_name in self.frame_times:
+                self.frame_times[comp_name][frame_num] = round(elapsed, 3)
+            self._advance(comp_name, frame_num)
+
+    def on_event(self, progress_key, frame_num: int, elapsed: float) -> None:
+        self.on_frame(progress_key, frame_num, elapsed)
+
+    def complete_task(self, task: Dict[str, Any], success: bool) -> None:
+        if not success:
+            return
+
+        comp_name = task.get('comp_name')
+        start_frame = task.get('start_frame')
+        end_frame = task.get('end_frame')
+        if start_frame is None or end_frame is None:
+            start_frame, end_frame = get_command_frame_range(task.get('aerender_command', []))
+        if comp_name is None or start_frame is None or end_frame is None:
+            return
+
+        with self._lock:
+            for frame_num in range(start_frame, end_frame + 1):
+                self._advance(comp_name, frame_num)
+
+def consume_frame_events(event_queue, stop_event: threading.Event, handler) -> None:
+    while not stop_event.is_set():
+        try:
+            progress_key, frame_num, elapsed = event_queue.get(timeout=0.1)
+        except Exception:
+            continue
+        handler(progress_key, frame_num, elapsed)
+
+    while True:
+        try:
+            progress_key, frame_num, elapsed = event_queue.get_nowait()
+        except Exception:
+            break
+        handler(progress_key, frame_num, elapsed)
+
+def apply_frame_times(comp_data: Dict[str, Any], frame_times: Dict[int, float]) -> int:
+    frames = comp_data.get('frames', {})
+    count = 0
+    for frame_num, elapsed in frame_times.items():
+        frame = frames.get(str(frame_num), frames.get(frame_num))
+        if frame is not None:
+            frame['render_time'] = elapsed
+            count += 1
+    return count
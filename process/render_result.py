@@ -1,12 +1,11 @@
 
 import os
-import json
 import shutil
 from typing import Dict, Any, List
 
 from configs import Msg
 from scripts._show_result import show_result
-from scripts._ae_specifics import load_json_data
+from scripts._state import RecipeSession
 from .render_preflight import verify_processes
 
 def cleanup_log_file(logger, keep_log: bool = True) -> bool:
@@ -103,24 +102,27 @@ def get_render_data(names: List[str], imgs: List[List[str]]) -> dict:
     else:
         return {}
 
-def update_json(outputs: dict, stats: List[dict], names: List[str]) -> None:
+def update_json(outputs: dict, stats: List[dict], names: List[str]) -> Dict[str, dict]:
+    updates = {}
     for i, name in enumerate(names):
         if name in outputs and i < len(stats):
             outputs[name]['completed'] = stats[i]['verified']
+            updates[name] = {'completed': stats[i]['verified']}
+    return updates
 
-def save_json(path: str, recipe: dict) -> None:
+def save_json(session: RecipeSession, comps: Dict[str, dict], sections: Dict[str, Any]) -> None:
     try:
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(recipe, f, indent=2, ensure_ascii=False)
+        session.update_recipe(comps=comps, sections=sections)
+        session.flush()
     except Exception as e:
         Msg.Warning(f'Failed to update JSON file: {e}')
 
-def render_result(json_path: str, results: Dict[str, Any],
+def render_result(session: RecipeSession, results: Dict[str, Any],
                   logs: bool = False, logger=None) -> tuple[bool, dict]:
     try:
-        recipe = load_json_data(json_path)
+        recipe = session.recipe
         if not recipe:
-            Msg.Error(f'Failed to load JSON recipe: {json_path}')
+            Msg.Error(f'Failed to load JSON recipe: {session.json_path}')
             return False, {}
 
         settings = recipe.get('project_settings', {})
@@ -154,8 +156,11 @@ def render_result(json_path: str, results: Dict[str, Any],
             }
             info_list.append(info)
 
-        update_json(outputs, stats_list, names)
-        save_json(json_path, recipe)
+        comp_updates = update_json(outputs, stats_list, names)
+        sections = {}
+        if results.get('utilization'):
+            sections['utilization'] = results['utilization']
+        save_json(session, comp_updates, sections)
 
         multi = len(names) > 1
         show_result(
@@ -205,7 +210,7 @@ def main():
         print('Usage: python render_result.py <json_path>')
         sys.exit(1)
 
-    json_path = sys.argv[1]
+    session = RecipeSession(sys.argv[1])
     test_results = {
         'overall_success': True,
         'composition_results': {
@@ -221,7 +226,8 @@ def main():
         }
     }
 
-    success, preview_data = render_result(json_path, test_results)
+    success, preview_data = render_result(session, test_results)
+    session.close()
     print(f'Result display success: {success}')
     print(f'Preview data: {preview_data}')
 
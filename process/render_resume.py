@@ -0,0 +1,127 @@
+import os
+import sys
+import shutil
+from datetime import datetime
+from typing import Dict, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from configs import Msg
+from configs.defaults import (
+    DEFAULT_SCHEDULER, DEFAULT_ENGINE, DEFAULT_RETRY_ATTEMPTS, DEFAULT_COORDINATOR_BIND,
+    DEFAULT_STATE_BACKEND
+)
+from configs.render_config import RenderConfig
+from scripts import trace_error, make_dir
+from scripts._ae_specifics import load_json_data
+from scripts._get_invalid_images import is_invalid_image_enhanced
+from scripts._state import RecipeSession
+
+from .render_pipeline import get_journal_path, read_journal
+from .render_retry import get_missing_frames, build_frame_tasks
+
+def load_resume_config(json_path: str) -> RenderConfig:
+    recipe = load_json_data(json_path)
+    if not recipe:
+        raise FileNotFoundError(f'Resume recipe not found: {json_path}')
+
+    settings = recipe['project_settings']
+    options = recipe['rendering_options']
+    worker_config = recipe['worker_configuration']
+
+    return RenderConfig(
+        fpath=settings['project_file'],
+        comp_name=options['compositions'],
+        output_dir=settings['result_dir'],
+        start=options['start_frames'],
+        end=options['end_frames'],
+        workers=options['workers'],
+        per_task=options['per_task'],
+        rs_template=settings['render_settings_template'],
+        om_template=settings['output_module_template'],
+        ext=settings['file_extension'],
+        verbose=settings['verbose_level'],
+        preview=options.get('enable_preview', False),
+        logs=options.get('enable_logging', False),
+        save_json=options.get('save_json', False),
+        incremental=options.get('incremental', False),
+        scheduler=worker_config.get('scheduler', DEFAULT_SCHEDULER),
+        engine=worker_config.get('engine', DEFAULT_ENGINE),
+        retries=worker_config.get('retry_attempts', DEFAULT_RETRY_ATTEMPTS),
+        coordinator=worker_config.get('coordinator', DEFAULT_COORDINATOR_BIND),
+        speculative=worker_config.get('speculative', False),
+        split=worker_config.get('split', False),
+        state_backend=options.get('state_backend', DEFAULT_STATE_BACKEND),
+        resume=os.path.abspath(json_path)
+    )
+
+def is_valid_frame(path: str, min_file_size: int = 1024) -> bool:
+    if not path or not os.path.exists(path):
+        return False
+    try:
+        is_invalid, _ = is_invalid_image_enhanced(path, min_file_size)
+        return not is_invalid
+    except Exception:
+        return False
+
+def restore_frame(frame: Dict[str, Any], trusted: bool) -> bool:
+    result = frame.get('result', '')
+    tmp = frame.get('tmp', '')
+
+    if result and os.path.exists(result) and (trusted or is_valid_frame(result)):
+        frame.update(rendered=True, verified=True, moved=True)
+        return True
+
+    if is_valid_frame(tmp):
+        make_dir(os.path.dirname(result))
+        shutil.move(tmp, result)
+        frame.update(rendered=True, verified=True, moved=True)
+        return True
+
+    frame.update(moved=False)
+    return False
+
+def resume_render_recipe(json_path: str, logger=None) -> RecipeSession:
+    session = RecipeSession(json_path)
+    recipe = session.recipe
+    journal = read_journal(get_journal_path(json_path))
+
+    total_frames = 0
+    total_restored = 0
+    total_tasks = 0
+
+    for comp_name, comp_data in recipe['result_outputs'].items():
+        frames = comp_data.get('frames', {})
+        journaled = set(journal.get(comp_name, []))
+
+        restored = 0
+        for frame_id, frame in frames.items():
+            trusted = frame.get('moved', False) or frame_id in journaled
+            try:
+                if restore_frame(frame, trusted):
+                    restored += 1
+            except Exception as e:
+                if logger:
+                    logger.warning(f'{comp_name}: frame {frame_id} restore failed: {trace_error(e)}')
+
+        outstanding = get_missing_frames(comp_data)
+        tasks = build_frame_tasks(recipe, comp_name, outstanding, label='Resume')
+        comp_data['workflow']['chunk_tasks'] = tasks
+        comp_data['completed'] = len(frames) - len(outstanding)
+
+        total_frames += len(frames)
+        total_restored += restored
+        total_tasks += len(tasks)
+
+        if logger:
+            logger.info(f'{comp_name}: Resume restored {restored}/{len(frames)} frames, '
+                        f'{len(outstanding)} outstanding ({len(tasks)} tasks)')
+
+    recipe['recipe_info']['resumed_timestamp'] = datetime.now().isoformat()
+
+    session.save(recipe['rendering_options'].get('state_backend', DEFAULT_STATE_BACKEND))
+
+    Msg.Dim(f'Resuming Render: {total_restored}/{total_frames} Frames Already Completed, '
+            f'{total_frames - total_restored} Outstanding ({total_tasks} Tasks)')
+
+    return session
@@ -0,0 +1,91 @@
+import os
+import sys
+from typing import Dict, Any, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from configs import Msg
+from configs.defaults import DEFAULT_ENGINE, DEFAULT_RETRY_ATTEMPTS, DEFAULT_COORDINATOR_BIND
+from scripts import trace_error, is_shutdown_requested
+from scripts._state import RecipeSession, get_frame_updates
+
+from .render_init import build_range_tasks
+from .render_scheduler import plan_frame_ranges
+from .render_pipeline import ChunkPipeline, get_journal_path
+from .render_process_single import run_render_tasks_parallel
+
+def get_missing_frames(comp_data: Dict[str, Any]) -> List[int]:
+    frames = comp_data.get('frames', {})
+    return sorted(int(frame_id) for frame_id, frame in frames.items()
+                  if not frame.get('moved', False))
+
+def build_frame_tasks(recipe: Dict[str, Any], comp_name: str,
+                      missing: List[int], label: str = 'Retry') -> List[Dict[str, Any]]:
+    worker_config = recipe['worker_configuration']
+    return build_range_tasks(recipe, comp_name, plan_frame_ranges(missing, worker_config), label)
+
+def retry_missing_frames(session: RecipeSession, logger=None) -> Dict[str, Dict[str, Any]]:
+    recipe = session.recipe
+    worker_config = recipe['worker_configuration']
+    attempts = worker_config.get('retry_attempts', DEFAULT_RETRY_ATTEMPTS)
+    workers = worker_config['configured_workers']
+    engine = worker_config.get('engine', DEFAULT_ENGINE)
+    coordinator = worker_config.get('coordinator', DEFAULT_COORDINATOR_BIND)
+
+    initial = {comp_name: get_missing_frames(comp_data)
+               for comp_name, comp_data in recipe['result_outputs'].items()}
+    initial = {comp_name: missing for comp_name, missing in initial.items() if missing}
+    if not initial or attempts <= 0:
+        return {}
+
+    for attempt in range(1, attempts + 1):
+        if is_shutdown_requested():
+            break
+
+        tasks = []
+        for comp_name, comp_data in recipe['result_outputs'].items():
+            missing = get_missing_frames(comp_data)
+            if missing:
+                tasks.extend(build_frame_tasks(recipe, comp_name, missing))
+
+        if not tasks:
+            break
+
+        frame_count = sum(task['file_count'] for task in tasks)
+        retry_msg = (f'Re-rendering {frame_count} failed or missing frames '
+                     f'[{attempt}/{attempts}] ({len(tasks)} tasks)')
+        Msg.Dim(retry_msg, flush=True)
+        if logger:
+            logger.info(retry_msg)
+
+        pipeline = ChunkPipeline(recipe, workers, logger,
+                                 journal_path=get_journal_path(session.json_path))
+        try:
+            run_render_tasks_parallel(tasks, workers, logger, None,
+                                      engine=engine, pipeline=pipeline,
+                                      coordinator=coordinator)
+        except Exception as e:
+            if logger:
+                logger.error(f'Retry attempt {attempt} failed: {trace_error(e)}')
+        finally:
+            pipeline.drain()
+
+    for comp_name, missing in initial.items():
+        frames = recipe['result_outputs'][comp_name].get('frames', {})
+        session.update_frames(comp_name, get_frame_updates(frames, map(str, missing)))
+    session.flush()
+
+    retried = {}
+    for comp_name, before in initial.items():
+        comp_data = recipe['result_outputs'][comp_name]
+        frames = comp_data.get('frames', {})
+        remaining = get_missing_frames(comp_data)
+        recovered = [frames[str(frame_num)]['result'] for frame_num in before
+                     if frames[str(frame_num)].get('moved', False)]
+        retried[comp_name] = {'recovered': recovered, 'remaining': remaining}
+
+        if logger:
+            logger.info(f'{comp_name}: Retry recovered {len(recovered)}/{len(before)} frames, '
+                        f'{len(remaining)} still missing')
+
+    return retried
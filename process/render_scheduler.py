@@ -0,0 +1,136 @@
+import math
+import statistics
+from typing import Dict, Any, List, Tuple
+
+from configs.defaults import (
+    DEFAULT_SCHEDULER, DEFAULT_FRAMES_PER_TASK, DEFAULT_GUIDED_MIN_FRAMES,
+    DEFAULT_GUIDED_FACTOR, DEFAULT_HISTORY_MIN_COVERAGE,
+    DEFAULT_PROGRESSIVE_STRIDE, DEFAULT_PROGRESSIVE_MIN_STRIDE
+)
+
+def plan_static_ranges(start: int, end: int,
+                       frames_per_task: int) -> List[Tuple[int, int]]:
+    frames_per_task = max(1, frames_per_task)
+    ranges = []
+    for chunk_start in range(start, end + 1, frames_per_task):
+        chunk_end = min(chunk_start + frames_per_task - 1, end)
+        ranges.append((chunk_start, chunk_end))
+    return ranges
+
+def plan_guided_ranges(start: int, end: int, workers: int,
+                       max_frames: int = DEFAULT_FRAMES_PER_TASK,
+                       min_frames: int = DEFAULT_GUIDED_MIN_FRAMES,
+                       factor: int = DEFAULT_GUIDED_FACTOR) -> List[Tuple[int, int]]:
+    workers = max(1, workers)
+    max_frames = max(1, max_frames)
+    min_frames = max(1, min(min_frames, max_frames))
+
+    ranges = []
+    chunk_start = start
+    while chunk_start <= end:
+        remaining = end - chunk_start + 1
+        size = math.ceil(remaining / (workers * factor))
+        size = max(min_frames, min(size, max_frames))
+        chunk_end = min(chunk_start + size - 1, end)
+        ranges.append((chunk_start, chunk_end))
+        chunk_start = chunk_end + 1
+
+    return ranges
+
+def plan_chunk_ranges(start: int, end: int,
+                      worker_config: Dict[str, Any]) -> List[Tuple[int, int]]:
+    scheduler = worker_config.get('scheduler', DEFAULT_SCHEDULER)
+    frames_per_task = worker_config.get('frames_per_task',
+                                        DEFAULT_FRAMES_PER_TASK)
+
+    if scheduler == 'guided':
+        return plan_guided_ranges(
+            start, end,
+            workers=worker_config.get('configured_workers', 1),
+            max_frames=frames_per_task,
+            min_frames=worker_config.get('min_frames_per_task',
+                                         DEFAULT_GUIDED_MIN_FRAMES)
+        )
+
+    if scheduler == 'progressive':
+        return plan_frame_ranges(list(range(start, end + 1)), worker_config)
+
+    return plan_static_ranges(start, end, frames_per_task)
+
+def group_frame_ranges(frame_nums: List[int]) -> List[Tuple[int, int]]:
+    ranges = []
+    for frame_num in sorted(set(frame_nums)):
+        if ranges and frame_num == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], frame_num)
+        else:
+            ranges.append((frame_num, frame_num))
+    return ranges
+
+def plan_progressive_passes(frame_nums: List[int], worker_config: Dict[str, Any],
+                            stride: int = DEFAULT_PROGRESSIVE_STRIDE,
+                            min_stride: int = DEFAULT_PROGRESSIVE_MIN_STRIDE) -> List[List[Tuple[int, int]]]:
+    frame_nums = sorted(set(frame_nums))
+    fill_config = dict(worker_config, scheduler='static')
+
+    passes = []
+    sampled = set()
+    while stride >= max(2, min_stride):
+        samples = []
+        if len(frame_nums) > stride:
+            samples = [frame_num for frame_num in frame_nums[::stride] if frame_num not in sampled]
+        passes.append([(frame_num, frame_num) for frame_num in samples])
+        sampled.update(samples)
+        stride //= 2
+
+    remaining = [frame_num for frame_num in frame_nums if frame_num not in sampled]
+    passes.append(plan_frame_ranges(remaining, fill_config))
+    return passes
+
+def plan_frame_ranges(frame_nums: List[int],
+                      worker_config: Dict[str, Any]) -> List[Tuple[int, int]]:
+    if worker_config.get('scheduler') == 'progressive':
+        return [frame_range
+                for frame_ranges in plan_progressive_passes(frame_nums, worker_config)
+                for frame_range in frame_ranges]
+
+    ranges = []
+    for gap_start, gap_end in group_frame_ranges(frame_nums):
+        ranges.extend(plan_chunk_ranges(gap_start, gap_end, worker_config))
+    return ranges
+
+def estimate_frame_costs(frame_nums: List[int], costs: Dict[int, float],
+                         min_coverage: float = DEFAULT_HISTORY_MIN_COVERAGE) -> Dict[int, float]:
+    known = [costs[frame_num] for frame_num in frame_nums if frame_num in costs]
+    if not frame_nums or len(known) < len(frame_nums) * min_coverage:
+        return {}
+
+    fallback = statistics.median(known)
+    return {frame_num: costs.get(frame_num, fallback) for frame_num in frame_nums}
+
+def range_cost(frame_range: Tuple[int, int], costs: Dict[int, float]) -> float:
+    return sum(costs.get(frame_num, 0.0) for frame_num in range(frame_range[0], frame_range[1] + 1))
+
+def plan_cost_ranges(frame_nums: List[int], frame_costs: Dict[int, float],
+                     worker_config: Dict[str, Any]) -> List[Tuple[int, int]]:
+    ranges = plan_frame_ranges(frame_nums, worker_config)
+    if not frame_costs:
+        return ranges
+
+    target = sum(frame_costs.get(frame_num, 0.0) for frame_num in frame_nums) / max(1, len(ranges))
+    min_frames = max(1, worker_config.get('min_frames_per_task', DEFAULT_GUIDED_MIN_FRAMES))
+
+    cost_ranges = []
+    for gap_start, gap_end in group_frame_ranges(frame_nums):
+        chunk_start = gap_start
+        chunk_cost = 0.0
+        for frame_num in range(gap_start, gap_end + 1):
+            frame_cost = frame_costs.get(frame_num, 0.0)
+            chunk_frames = frame_num - chunk_start
+            if chunk_frames >= min_frames and chunk_cost + frame_cost > target:
+                cost_ranges.append((chunk_start, frame_num - 1))
+                chunk_start, chunk_cost = frame_num, 0.0
+            chunk_cost += frame_cost
+        cost_ranges.append((chunk_start, gap_end))
+
+    return sorted(cost_ranges, key=lambda frame_range: range_cost(frame_range, frame_costs),
+                  reverse=True)
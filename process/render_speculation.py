@@ -0,0 +1,79 @@
+import os
+import sys
+import shutil
+import statistics
+from typing import Dict, Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from configs.defaults import DEFAULT_SPECULATIVE_FACTOR, DEFAULT_SPECULATIVE_MIN_SECS
+from scripts._common import make_dir
+
+def build_speculative_task(task: Dict[str, Any]) -> Dict[str, Any]:
+    spec_dir = f"{os.path.normpath(task['temp_directory'])}_spec"
+    shutil.rmtree(spec_dir, ignore_errors=True)
+    make_dir(spec_dir)
+
+    aerender_cmd = list(task['aerender_command'])
+    if '-output' in aerender_cmd:
+        output_idx = aerender_cmd.index('-output') + 1
+        aerender_cmd[output_idx] = os.path.join(spec_dir, os.path.basename(aerender_cmd[output_idx]))
+
+    return dict(task,
+                chunk_id=f"{task.get('chunk_id', '')}_spec",
+                task_detail=f"{task.get('task_detail', task.get('chunk_id', ''))}/Speculative",
+                temp_directory=spec_dir,
+                aerender_command=aerender_cmd)
+
+def adopt_speculative_output(task: Dict[str, Any], spec_task: Dict[str, Any]) -> int:
+    source_dir = spec_task['temp_directory']
+    target_dir = task['temp_directory']
+    make_dir(target_dir)
+
+    adopted = 0
+    for name in os.listdir(source_dir):
+        os.replace(os.path.join(source_dir, name), os.path.join(target_dir, name))
+        adopted += 1
+
+    shutil.rmtree(source_dir, ignore_errors=True)
+    return adopted
+
+def discard_speculative_output(spec_task: Dict[str, Any]) -> None:
+    shutil.rmtree(spec_task['temp_directory'], ignore_errors=True)
+
+class StragglerMonitor:
+
+    def __init__(self, factor: float = DEFAULT_SPECULATIVE_FACTOR,
+                 min_secs: float = DEFAULT_SPECULATIVE_MIN_SECS):
+        self.factor = factor
+        self.min_secs = min_secs
+        self.frame_times = []
+
+    def record(self, result: Dict[str, Any], frame_count: int) -> None:
+        if result.get('success') and frame_count > 0 and result.get('elapsed', 0) > 0:
+            self.frame_times.append(result['elapsed'] / frame_count)
+
+    def expected(self, frame_count: int) -> Optional[float]:
+        if not self.frame_times:
+            return None
+        return statistics.median(self.frame_times) * max(1, frame_count)
+
+    def pick(self, candidates: Dict[int, int], started: Dict[int, float],
+             now: float) -> Optional[tuple]:
+        straggler = None
+        worst_ratio = self.factor
+
+        for index, frame_count in candidates.items():
+            expected = self.expected(frame_count)
+            if expected is None or index not in started:
+                continue
+
+            elapsed = now - started[index]
+            if elapsed < self.min_secs:
+                continue
+
+            ratio = elapsed / expected
+            if ratio > worst_ratio:
+                straggler, worst_ratio = (index, elapsed, expected), ratio
+
+        return straggler
@@ -0,0 +1,70 @@
+import os
+import sys
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from configs.defaults import DEFAULT_SPLIT_MIN_FRAMES, DEFAULT_SPLIT_MIN_SECS
+
+from .render_init import build_range_tasks
+
+def plan_split_ranges(first_frame: int, last_frame: int, pieces: int,
+                      min_frames: int = DEFAULT_SPLIT_MIN_FRAMES) -> List[Tuple[int, int]]:
+    remaining = last_frame - first_frame + 1
+    pieces = max(1, min(pieces, remaining // max(1, min_frames)))
+    size = -(-remaining // pieces)
+    return [(start, min(last_frame, start + size - 1))
+            for start in range(first_frame, last_frame + 1, size)]
+
+class ChunkSplitter:
+
+    def __init__(self, recipe: Dict[str, Any],
+                 min_frames: int = DEFAULT_SPLIT_MIN_FRAMES,
+                 min_secs: float = DEFAULT_SPLIT_MIN_SECS):
+        self.recipe = recipe
+        self.min_frames = min_frames
+        self.min_secs = min_secs
+        self.last_frames: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+
+    def on_event(self, progress_key, frame_num: int, elapsed: float) -> None:
+        if progress_key is None:
+            return
+        with self._lock:
+            self.last_frames[progress_key] = max(frame_num, self.last_frames.get(progress_key, frame_num))
+
+    def pick(self, candidates: Dict[int, Dict[str, Any]], started: Dict[int, float],
+             now: float) -> Optional[Tuple[int, int, float]]:
+        chosen = None
+        longest = self.min_secs
+
+        with self._lock:
+            last_frames = dict(self.last_frames)
+
+        for index, task in candidates.items():
+            last_frame = last_frames.get(index)
+            if last_frame is None or index not in started:
+                continue
+
+            done = last_frame - task['start_frame'] + 1
+            remaining = task['end_frame'] - last_frame
+            if done <= 0 or remaining < 2 * self.min_frames:
+                continue
+
+            projected = remaining * (now - started[index]) / done
+            if projected > longest:
+                chosen, longest = (index, last_frame, projected), projected
+
+        return chosen
+
+    def split(self, task: Dict[str, Any], last_frame: int, pieces: int) -> List[Dict[str, Any]]:
+        comp_name = task['comp_name']
+        ranges = plan_split_ranges(last_frame + 1, task['end_frame'], pieces, self.min_frames)
+        tasks = build_range_tasks(self.recipe, comp_name, ranges, 'Split')
+
+        task['split_at'] = last_frame
+        for split_task in tasks:
+            split_task['split_from'] = task.get('chunk_id', '')
+        self.recipe['result_outputs'][comp_name]['workflow']['chunk_tasks'].extend(tasks)
+        return tasks
@@ -0,0 +1,98 @@
+import os
+import sys
+import json
+import time
+import cProfile
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from configs.defaults import DEFAULT_LOG_DIR
+from scripts._common import make_dir
+from scripts._platform import get_peak_rss_mb
+from scripts._profiling import enable_profiling, get_profile_dir, dump_stage_profile, merge_profiles
+from scripts._trace import trace_span, write_trace
+from process.render_utilization import build_utilization_report
+
+PIPELINE_STAGES = ('render_preflight', 'render_init', 'execute_render',
+                   'verify_render_output', 'render_result', 'cleanup_handler')
+
+class StageTimer:
+
+    def __init__(self):
+        self.started = time.time()
+        self.stages: Dict[str, float] = {}
+
+    def start_profiling(self, log_path: Optional[str]) -> str:
+        base_path = os.path.splitext(log_path or os.path.join(DEFAULT_LOG_DIR, 'AeRender.log'))[0]
+        return enable_profiling(f'{base_path}_profile')
+
+    @contextmanager
+    def __call__(self, name: str):
+        profiler = None
+        if get_profile_dir():
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                profiler = None
+
+        stage_start = time.perf_counter()
+        try:
+            with trace_span(name, 'stage'):
+                yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - stage_start
+            if profiler:
+                profiler.disable()
+                dump_stage_profile(profiler, name)
+
+    def report(self, total_frames: int, success: bool) -> Dict[str, Any]:
+        wall = time.time() - self.started
+        return {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'success': success,
+            'wall_secs': round(wall, 3),
+            'stages': {name: round(secs, 3) for name, secs in self.stages.items()},
+            'frames': total_frames,
+            'fps': round(total_frames / wall, 3) if wall > 0 else 0.0,
+            'peak_rss_mb': get_peak_rss_mb()
+        }
+
+    def utilization(self) -> Dict[str, Any]:
+        return build_utilization_report(self.started)
+
+    def finish(self, config, results: Optional[Dict[str, Any]], logger=None) -> Dict[str, Any]:
+        report = self.report(config.get_total_frames(),
+                             bool(results and results.get('overall_success', False)))
+        utilization = (results or {}).get('utilization')
+        if utilization:
+            report['utilization'] = {key: value for key, value in utilization.items() if key != 'slots'}
+
+        if logger:
+            logger.info('Stage timings: ' + ', '.join(
+                f'{name} {secs:.2f}s' for name, secs in report['stages'].items()))
+
+        timings_path = getattr(config, 'timings', None)
+        if timings_path:
+            timings_path = os.path.abspath(timings_path)
+            make_dir(os.path.dirname(timings_path))
+            with open(timings_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            if logger:
+                logger.info(f'Stage timings saved to: {timings_path}')
+
+        trace_path = write_trace()
+        if trace_path and logger:
+            logger.info(f'Trace saved to: {trace_path}')
+
+        profile_dir = get_profile_dir()
+        if profile_dir:
+            merged = merge_profiles(profile_dir)
+            if logger:
+                logger.info(f'Profile saved to: {profile_dir}.txt '
+                            f'({len(merged)} stage(s) in {profile_dir})')
+
+        return report
@@ -0,0 +1,180 @@
+import os
+import sys
+import time
+import asyncio
+from typing import Dict, Any, List, Optional, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts._common import trace_error
+from scripts._aerender_progress import FrameClock, create_watchdog
+from scripts._task_timeout import AdaptiveTimeout
+from scripts._sig_handler import (
+    add_tracked_pid, remove_tracked_pid, is_shutdown_requested
+)
+
+class AerenderSupervisor:
+
+    def __init__(self, workers: int, logger, timeouts: Optional[AdaptiveTimeout] = None,
+                 on_frame: Optional[Callable[[Dict[str, Any], int, float], None]] = None,
+                 on_complete: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None):
+        self.workers = max(1, workers)
+        self.logger = logger
+        self.timeouts = timeouts or AdaptiveTimeout()
+        self.on_frame = on_frame
+        self.on_complete = on_complete
+        self._procs: Dict[int, asyncio.subprocess.Process] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _build_result(self, task_id: int, aerender_cmd: List[str], exit_code: int,
+                      stdout: str, stderr: str, elapsed: float,
+                      expected_files: int, frame_times: Optional[List] = None) -> Dict[str, Any]:
+        finished_at = time.time()
+        return {
+            'task_id': task_id,
+            'exit_code': exit_code,
+            'stdout': stdout,
+            'stderr': stderr,
+            'elapsed': elapsed,
+            'files_rendered': expected_files if exit_code == 0 else 0,
+            'success': exit_code == 0,
+            'command': ' '.join(aerender_cmd),
+            'started_at': finished_at - elapsed,
+            'finished_at': finished_at,
+            'frame_times': frame_times
+        }
+
+    async def _kill(self, proc: asyncio.subprocess.Process) -> None:
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            return
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=5.0)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _read_stdout(self, proc: asyncio.subprocess.Process,
+                           clock: FrameClock) -> str:
+        lines = []
+        while True:
+            raw = await proc.stdout.readline()
+            if not raw:
+                break
+            line = raw.decode('utf-8', errors='replace')
+            lines.append(line)
+            clock.feed(line)
+        return ''.join(lines)
+
+    async def _communicate(self, proc: asyncio.subprocess.Process,
+                           clock: FrameClock) -> tuple:
+        stdout, stderr = await asyncio.gather(
+            self._read_stdout(proc, clock), proc.stderr.read())
+        await proc.wait()
+        return stdout, stderr.decode('utf-8', errors='replace')
+
+    async def _supervise(self, proc: asyncio.subprocess.Process,
+                         clock: FrameClock, watchdog) -> tuple:
+        communicate = asyncio.ensure_future(self._communicate(proc, clock))
+        while True:
+            done, _ = await asyncio.wait({communicate}, timeout=0.5)
+            if done:
+                return communicate.result()
+            if watchdog.check():
+                await self._kill(proc)
+                communicate.cancel()
+                raise asyncio.TimeoutError(watchdog.reason)
+
+    async def _run_task(self, task: Dict[str, Any], task_id: int) -> Dict[str, Any]:
+        result = await self._execute_task(task, task_id)
+        if self.on_complete:
+            self.on_complete(task, result)
+        return result
+
+    async def _execute_task(self, task: Dict[str, Any], task_id: int) -> Dict[str, Any]:
+        aerender_cmd = task['aerender_command']
+        expected_files = task.get('expected_files', 0)
+
+        async with self._semaphore:
+            if is_shutdown_requested():
+                return self._build_result(task_id, aerender_cmd, -1, '',
+                                          'Cancelled by shutdown request', 0.0, 0)
+
+            start_time = time.time()
+            proc = None
+
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *aerender_cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                self._procs[task_id] = proc
+                add_tracked_pid(proc.pid)
+                self.logger.debug(f'Task {task_id} started (pid: {proc.pid})')
+
+                watchdog = create_watchdog(aerender_cmd, self.timeouts)
+
+                def on_frame(frame_num, elapsed):
+                    watchdog.touch(elapsed)
+                    if self.on_frame:
+                        self.on_frame(task, frame_num, elapsed)
+
+                clock = FrameClock(aerender_cmd, on_frame)
+                stdout, stderr = await self._supervise(proc, clock, watchdog)
+
+                return self._build_result(
+                    task_id, aerender_cmd, proc.returncode, stdout, stderr,
+                    time.time() - start_time, expected_files, clock.frame_times)
+
+            except asyncio.TimeoutError as e:
+                self.logger.warning(f'Task {task_id} killed: {e}')
+                return self._build_result(
+                    task_id, aerender_cmd, -1, '', str(e),
+                    time.time() - start_time, 0)
+
+            except Exception as e:
+                if proc is not None and proc.returncode is None:
+                    await self._kill(proc)
+                return self._build_result(task_id, aerender_cmd, -1, '',
+                                          trace_error(e),
+                                          time.time() - start_time, 0)
+
+            finally:
+                if proc is not None:
+                    self._procs.pop(task_id, None)
+                    remove_tracked_pid(proc.pid)
+
+    async def _watch_shutdown(self, runners: List[asyncio.Task]) -> None:
+        while not all(r.done() for r in runners):
+            if is_shutdown_requested():
+                self.logger.warning(f'User shutdown requested, killing '
+                                    f'{len(self._procs)} running aerender processes')
+                for proc in list(self._procs.values()):
+                    await self._kill(proc)
+                return
+            await asyncio.sleep(0.1)
+
+    async def run(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self._semaphore = asyncio.Semaphore(self.workers)
+
+        runners = [asyncio.ensure_future(self._run_task(task, i + 1))
+                   for i, task in enumerate(tasks)]
+        watcher = asyncio.ensure_future(self._watch_shutdown(runners))
+
+        try:
+            return list(await asyncio.gather(*runners))
+        finally:
+            watcher.cancel()
+
+def run_supervised_tasks(tasks: List[Dict[str, Any]], workers: int, logger,
+                         timeouts: Optional[AdaptiveTimeout] = None,
+                         on_frame: Optional[Callable[[Dict[str, Any], int, float], None]] = None,
+                         on_complete: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None
+                         ) -> List[Dict[str, Any]]:
+    if not tasks:
+        return []
+
+    logger.info(f'Starting async supervisor: {len(tasks)} tasks, {workers} concurrent processes')
+    supervisor = AerenderSupervisor(workers, logger, timeouts, on_frame, on_complete)
+    return asyncio.run(supervisor.run(tasks))
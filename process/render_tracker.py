@@ -0,0 +1,91 @@
+import os
+import sys
+import time
+import threading
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Set, Optional, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts._sig_handler import is_shutdown_requested
+
+TASK_STATES = ('queued', 'running', 'success', 'failed')
+
+class TaskTracker:
+
+    def __init__(self, tasks: List[Dict[str, Any]]):
+        self.tasks = list(tasks)
+        self.states = ['queued'] * len(tasks)
+        self.results: List[Optional[Any]] = [None] * len(tasks)
+        self.order: List[int] = []
+        self.started: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, task: Dict[str, Any]) -> int:
+        with self._lock:
+            self.tasks.append(task)
+            self.states.append('queued')
+            self.results.append(None)
+            return len(self.tasks) - 1
+
+    def mark_running(self, index: int) -> None:
+        with self._lock:
+            if self.states[index] == 'queued':
+                self.states[index] = 'running'
+                self.started[index] = time.time()
+
+    def mark_done(self, index: int, result: Any, success: bool) -> int:
+        with self._lock:
+            self.states[index] = 'success' if success else 'failed'
+            self.results[index] = result
+            self.order.append(index)
+            return len(self.order)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {state: self.states.count(state) for state in TASK_STATES}
+
+    def describe(self) -> str:
+        counts = self.counts()
+        return ', '.join(f'{counts[state]} {state}' for state in TASK_STATES)
+
+    def is_settled(self, index: int) -> bool:
+        return self.states[index] in ('success', 'failed')
+
+    def ordered_results(self) -> List[Any]:
+        return [result for result in self.results if result is not None]
+
+def drain_completed(futures: Dict[Future, int], tracker: TaskTracker,
+                    on_result: Callable[[int, Future], None], logger,
+                    poll_secs: float = 0.5, shutdown_grace: float = 120.0,
+                    on_poll: Optional[Callable[[Set[Future]], Dict[Future, int]]] = None) -> None:
+    pending = set(futures)
+
+    while pending:
+        if is_shutdown_requested():
+            cancelled = sum(1 for future in pending if future.cancel())
+            logger.warning(f'User shutdown requested, cancelled {cancelled} queued tasks, '
+                           f'waiting for {len(pending) - cancelled} running tasks')
+            done, pending = wait(pending, timeout=shutdown_grace)
+            for future in done:
+                on_result(futures[future], future)
+            for future in pending:
+                on_result(futures[future], future)
+            return
+
+        done, pending = wait(pending, timeout=poll_secs, return_when=FIRST_COMPLETED)
+
+        for future in pending:
+            if future.running():
+                tracker.mark_running(futures[future])
+
+        for future in done:
+            on_result(futures[future], future)
+
+        if done:
+            logger.debug(f'Task states: {tracker.describe()}')
+
+        if on_poll is not None:
+            submitted = on_poll(pending)
+            futures.update(submitted)
+            pending.update(submitted)
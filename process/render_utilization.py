@@ -0,0 +1,124 @@
+import os
+import sys
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from configs.defaults import (DEFAULT_UTILIZATION_TAIL_RATIO, DEFAULT_UTILIZATION_BUSY_RATIO,
+                              DEFAULT_UTILIZATION_OUTSIDE_RATIO)
+from scripts._trace import assign_slots, get_task_records
+
+def merge_intervals(intervals: List[Tuple[float, float]]) -> float:
+    covered = 0.0
+    current_start = current_end = None
+
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                covered += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+
+    if current_end is not None:
+        covered += current_end - current_start
+    return covered
+
+def get_hints(report: Dict[str, Any]) -> List[str]:
+    hints = []
+    window = report['render_window_secs']
+    if not window:
+        return hints
+
+    if report['slot_count'] > 1 and report['tail_secs'] / window > DEFAULT_UTILIZATION_TAIL_RATIO:
+        hints.append('Long tail: slots sat idle while the last chunks finished, '
+                     'try smaller chunks (-t), -sch guided or -split')
+    if report['busy_ratio'] < DEFAULT_UTILIZATION_BUSY_RATIO:
+        hints.append('Slots were idle for much of the render window, '
+                     'fewer workers (-w) may render as fast')
+    if report['outside_aerender_ratio'] > DEFAULT_UTILIZATION_OUTSIDE_RATIO:
+        hints.append('Most wall time was spent outside aerender, '
+                     'check the validation and move stages (-tm, -prof)')
+    return hints
+
+def build_utilization_report(run_started: float, run_finished: Optional[float] = None,
+                             tasks: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    run_finished = run_finished or time.time()
+    tasks = assign_slots(get_task_records() if tasks is None else tasks)
+    wall = max(0.0, run_finished - run_started)
+
+    if not tasks:
+        return {'wall_secs': round(wall, 3), 'render_window_secs': 0.0, 'slot_count': 0,
+                'tasks': 0, 'frames': 0, 'fps': 0.0, 'render_fps': 0.0, 'busy_ratio': 0.0,
+                'tail_secs': 0.0, 'outside_aerender_secs': round(wall, 3),
+                'outside_aerender_ratio': 1.0 if wall else 0.0, 'slots': [], 'hints': []}
+
+    window_start = min(task['start'] for task in tasks)
+    window_end = max(task['end'] for task in tasks)
+    window = window_end - window_start
+
+    slots: Dict[int, Dict[str, Any]] = {}
+    for task in tasks:
+        slot = slots.setdefault(task['slot'], {'slot': task['slot'], 'busy': 0.0, 'tasks': 0,
+                                              'failed': 0, 'frames': 0, 'last_end': 0.0})
+        slot['busy'] += max(0.0, task['end'] - task['start'])
+        slot['tasks'] += 1
+        slot['failed'] += not task.get('success', False)
+        slot['frames'] += task.get('files_rendered', 0)
+        slot['last_end'] = max(slot['last_end'], task['end'])
+
+    slot_rows = []
+    for slot in sorted(slots.values(), key=lambda s: s['slot']):
+        slot_rows.append({
+            'slot': slot['slot'],
+            'busy_secs': round(slot['busy'], 3),
+            'idle_secs': round(max(0.0, window - slot['busy']), 3),
+            'tasks': slot['tasks'],
+            'failed_tasks': slot['failed'],
+            'frames': slot['frames'],
+            'secs_per_frame': round(slot['busy'] / slot['frames'], 3) if slot['frames'] else None
+        })
+
+    frames = sum(slot['frames'] for slot in slots.values())
+    busy = sum(slot['busy'] for slot in slots.values())
+    inside = merge_intervals([(task['start'], task['end']) for task in tasks])
+    outside = max(0.0, wall - inside)
+
+    report = {
+        'wall_secs': round(wall, 3),
+        'render_window_secs': round(window, 3),
+        'slot_count': len(slots),
+        'tasks': len(tasks),
+        'frames': frames,
+        'fps': round(frames / wall, 3) if wall > 0 else 0.0,
+        'render_fps': round(frames / window, 3) if window > 0 else 0.0,
+        'busy_ratio': round(busy / (len(slots) * window), 3) if window > 0 else 0.0,
+        'tail_secs': round(window_end - min(slot['last_end'] for slot in slots.values()), 3),
+        'outside_aerender_secs': round(outside, 3),
+        'outside_aerender_ratio': round(outside / wall, 3) if wall > 0 else 0.0,
+        'slots': slot_rows
+    }
+    report['hints'] = get_hints(report)
+    return report
+
+def format_utilization_summary(report: Dict[str, Any]) -> str:
+    return (f'{report["slot_count"]} slot(s), {report["busy_ratio"]:.0%} busy, '
+            f'{report["fps"]:.2f} fps, tail {report["tail_secs"]:.2f}s, '
+            f'{report["outside_aerender_ratio"]:.0%} of wall time outside aerender')
+
+def log_utilization_report(report: Dict[str, Any], logger) -> None:
+    if not logger or not report:
+        return
+
+    logger.info(f'Utilization: {format_utilization_summary(report)} '
+                f'(render window {report["render_window_secs"]:.2f}s, '
+                f'{report["frames"]} frames in {report["tasks"]} task(s))')
+    for slot in report['slots']:
+        per_frame = (f'{slot["secs_per_frame"]:.3f}s/frame'
+                     if slot['secs_per_frame'] is not None else '-')
+        logger.info(f'  slot {slot["slot"]}: busy {slot["busy_secs"]:.2f}s, '
+                    f'idle {slot["idle_secs"]:.2f}s, {slot["tasks"]} task(s), '
+                    f'{slot["frames"]} frames, {per_frame}')
+    for hint in report['hints']:
+        logger.info(f'  hint: {hint}')
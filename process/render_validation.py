@@ -1,5 +1,4 @@
 
-import json
 import os
 import sys
 import shutil
@@ -13,12 +12,16 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from configs import Msg, DEFAULT_TEMP_DIR
 from scripts import trace_error, make_dir
 from .render_cleanup import clean_temps
+from .render_retry import retry_missing_frames, get_missing_frames
 from scripts._get_invalid_images import get_invalid_images
-from scripts._ae_specifics import load_json_data
+from scripts._profiling import get_pool_options
+from scripts._state import RecipeSession
+from scripts._frame_map import FrameIndex
 from scripts._common import flush_lines
+from scripts._trace import trace_span
 
-def get_optimal_workers(json_path: str) -> int:
-    return load_json_data(json_path, 'worker_configuration', 'configured_workers', 4)
+def get_optimal_workers(session: RecipeSession) -> int:
+    return session.section('worker_configuration', 'configured_workers', 4)
 
 def validate_chunk(chunk_data):
     files, idx, comp, comp_idx, total = chunk_data
@@ -37,7 +40,8 @@ def validate_chunk(chunk_data):
         )
 
         invalid = [fpath for fpath, reasons in invalid_imgs]
-        valid = [f for f in files if f not in invalid]
+        invalid_set = set(invalid)
+        valid = [f for f in files if f not in invalid_set]
 
         return valid, invalid
 
@@ -97,6 +101,59 @@ def verify_temp_files(comp_name: str, comp_data: Dict,
 
     return existing, dropped
 
+def split_premoved_frames(comp_data: Dict,
+                          rendered: List[str]) -> Tuple[List[str], List[str]]:
+    frames = comp_data.get('frames', {})
+    premoved = []
+    pending = []
+
+    for frame_id in rendered:
+        frame = frames.get(frame_id, {})
+        if frame.get('moved', False) and frame.get('result', ''):
+            premoved.append(frame['result'])
+        else:
+            pending.append(frame_id)
+
+    return premoved, pending
+
+def merge_retry_results(composition_results: Dict[str, Any],
+                        retried: Dict[str, Dict[str, Any]],
+                        logger=None) -> Tuple[int, int]:
+    total_recovered = 0
+    total_added = 0
+
+    for comp_name, retry in retried.items():
+        comp_result = composition_results.get(comp_name)
+        if comp_result is None or 'error' in comp_result:
+            continue
+
+        recovered = retry['recovered']
+        expected = comp_result.setdefault('expected_files', [])
+        added = [path for path in recovered if path not in expected]
+        expected.extend(added)
+
+        comp_result['moved_files'] += len(recovered)
+        comp_result['moved_file_paths'].extend(recovered)
+        remaining = set(retry['remaining'])
+        unrendered = comp_result.get('unrendered_frames', [])
+        comp_result['unrendered_frames'] = [frame for frame in unrendered if frame in remaining]
+        comp_result['rendered_frames'] += len(added) + len(unrendered) - len(comp_result['unrendered_frames'])
+        comp_result['recovered_files'] = len(recovered)
+        comp_result['remaining_frames'] = retry['remaining']
+        comp_result['success'] = not retry['remaining']
+
+        total_recovered += len(recovered)
+        total_added += len(added)
+
+        if recovered:
+            result_msg = f'{comp_name} - Recovered {len(recovered)} frames by re-rendering'
+            if retry['remaining']:
+                Msg.Red(f'{result_msg}, {len(retry["remaining"])} still missing.')
+            else:
+                Msg.Dim(result_msg, flush=True)
+
+    return total_recovered, total_added
+
 def write_logs(comp_name: str, invalid: List[str],
                dropped: List[str]) -> Tuple[str, str]:
     invalid_log = ''
@@ -136,7 +193,7 @@ def validate_chunks(temp_files: List[str], comp_name: str,
     file_chunks = [temp_files[i:i+chunk_size]
                    for i in range(0, len(temp_files), chunk_size)]
 
-    with ProcessPoolExecutor(max_workers=workers) as executor:
+    with ProcessPoolExecutor(max_workers=workers, **get_pool_options('validate')) as executor:
         chunk_data = [(chunk, i, comp_name, comp_index, total_comps) for i, chunk in enumerate(file_chunks)]
         chunk_results = list(executor.map(validate_chunk, chunk_data))
 
@@ -149,7 +206,7 @@ def validate_chunks(temp_files: List[str], comp_name: str,
     return all_valid, all_invalid
 
 def verify_image_status(comp_name: str, temp_files: List[str],
-                        logger=None, json_path: str = None,
+                        logger=None, session: RecipeSession = None,
                         use_parallel: bool = None, comp_index: int = None,
                         total_comps: int = None) -> Tuple[List[str], List[str]]:
 
@@ -161,8 +218,8 @@ def verify_image_status(comp_name: str, temp_files: List[str],
     if use_parallel is None:
         use_parallel = len(temp_files) >= 100
 
-    if use_parallel and json_path:
-        workers = get_optimal_workers(json_path)
+    if use_parallel and session:
+        workers = get_optimal_workers(session)
         if logger:
             logger.info(f'{comp_name}: Parallel processing '
                        f'({len(temp_files)} files, {workers} workers)')
@@ -183,7 +240,8 @@ def verify_image_status(comp_name: str, temp_files: List[str],
         )
 
         invalid_paths = [fpath for fpath, reasons in invalid_imgs]
-        valid_files = [f for f in temp_files if f not in invalid_paths]
+        invalid_set = set(invalid_paths)
+        valid_files = [f for f in temp_files if f not in invalid_set]
 
         if logger and invalid_paths:
             logger.warning(f'{comp_name}: {len(invalid_paths)} invalid files found')
@@ -197,32 +255,16 @@ def verify_image_status(comp_name: str, temp_files: List[str],
         Msg.Error(err_msg)
         return [], temp_files
 
-def update_verified_status(json_path: str, comp_name: str,
+def update_verified_status(session: RecipeSession, comp_name: str,
                            valid: List[str], comp_data: Dict,
-                           logger=None) -> List[str]:
+                           logger=None, index: FrameIndex = None) -> List[str]:
 
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        frames = comp_data.get('frames', {})
-        verified = []
-        count = 0
-
-        for valid_file in valid:
-            for frame_id, frame in frames.items():
-                if frame.get('tmp', '') == valid_file:
-                    if comp_name in data.get('result_outputs', {}):
-                        json_frames = data['result_outputs'][comp_name].get('frames', {})
-                        if frame_id in json_frames:
-                            json_frames[frame_id]['verified'] = True
-                            verified.append(frame_id)
-                            count += 1
-                    break
-
-        if count > 0:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+        index = index or FrameIndex(comp_data.get('frames', {}))
+        verified = [frame_id for frame_id in map(index.frame_for_tmp, valid)
+                    if frame_id is not None]
+
+        session.update_frames(comp_name, {frame_id: {'verified': True} for frame_id in verified})
 
         return verified
 
@@ -235,24 +277,23 @@ def update_verified_status(json_path: str, comp_name: str,
 
 def move_parallel(file_pairs: List[Tuple[str, str]],
                  workers: int) -> List[Dict]:
-    with ProcessPoolExecutor(max_workers=workers) as executor:
+    with ProcessPoolExecutor(max_workers=workers, **get_pool_options('move')) as executor:
         results = list(executor.map(move_file, file_pairs))
 
     return results
 
 def move_files(comp_name: str, comp_data: Dict, verified: List[str],
-               logger=None, json_path: str = None,
-               use_parallel: bool = None) -> Tuple[List[str], List[str]]:
+               logger=None, session: RecipeSession = None,
+               use_parallel: bool = None, index: FrameIndex = None) -> Tuple[List[str], List[str]]:
 
-    frames = comp_data.get('frames', {})
+    index = index or FrameIndex(comp_data.get('frames', {}))
 
     pairs = []
     invalid = []
 
     for frame_id in verified:
-        frame = frames.get(frame_id, {})
-        tmp = frame.get('tmp', '')
-        result = frame.get('result', '')
+        tmp = index.tmp_path(frame_id)
+        result = index.result_path(frame_id)
 
         if not tmp or not result:
             invalid.append(f'f{int(frame_id):04d}')
@@ -266,8 +307,8 @@ def move_files(comp_name: str, comp_data: Dict, verified: List[str],
     if use_parallel is None:
         use_parallel = len(pairs) >= 50
 
-    if use_parallel and json_path:
-        workers = get_optimal_workers(json_path)
+    if use_parallel and session:
+        workers = get_optimal_workers(session)
         if logger:
             logger.info(f'{comp_name}: Parallel file movement '
                        f'({len(pairs)} files, {workers} workers)')
@@ -275,8 +316,8 @@ def move_files(comp_name: str, comp_data: Dict, verified: List[str],
         results = move_parallel(pairs, workers)
 
         moved = [r['dst'] for r in results if r['success']]
-        failed = [f'f{int(verified[i]):04d}'
-                 for i, r in enumerate(results) if not r['success']]
+        failed = [f'f{int(index.frame_for_tmp(r["src"]) or 0):04d}'
+                 for r in results if not r['success']]
 
         if logger and failed:
             logger.error(f'{comp_name}: {len(failed)} parallel moves failed')
@@ -293,9 +334,7 @@ def move_files(comp_name: str, comp_data: Dict, verified: List[str],
             shutil.move(tmp, result)
             moved.append(result)
         except Exception as e:
-            frame_id = next((fid for fid in verified
-                           if frames.get(fid, {}).get('result', '') == result),
-                          '0')
+            frame_id = index.frame_for_result(result) or '0'
             failed.append(f'f{int(frame_id):04d}')
             if logger:
                 logger.error(f'Frame move failed: {trace_error(e)}')
@@ -305,32 +344,16 @@ def move_files(comp_name: str, comp_data: Dict, verified: List[str],
 
     return moved, failed
 
-def update_moved_status(json_path: str, comp_name: str,
+def update_moved_status(session: RecipeSession, comp_name: str,
                         moved: List[str], comp_data: Dict,
-                        logger=None) -> int:
+                        logger=None, index: FrameIndex = None) -> int:
 
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        frames = comp_data.get('frames', {})
-        count = 0
+        index = index or FrameIndex(comp_data.get('frames', {}))
+        updates = {frame_id: {'moved': True} for frame_id in map(index.frame_for_result, moved)
+                   if frame_id is not None}
 
-        for moved_file in moved:
-            for frame_id, frame in frames.items():
-                if frame.get('result', '') == moved_file:
-                    if comp_name in data.get('result_outputs', {}):
-                        json_frames = data['result_outputs'][comp_name].get('frames', {})
-                        if frame_id in json_frames:
-                            json_frames[frame_id]['moved'] = True
-                            count += 1
-                    break
-
-        if count > 0:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-
-        return count
+        return session.update_frames(comp_name, updates)
 
     except Exception as e:
         err_msg = f'Failed to update moved status: {trace_error(e)}'
@@ -359,15 +382,16 @@ def validation_results(results: Dict[str, Any], logger=None, comp_info: str = ''
 
     return results
 
-def verify_render_output(json_path: str, logger=None,
+def verify_render_output(session: RecipeSession, logger=None,
                          force_parallel: bool = False, temp_dir: str = None) -> Dict[str, Any]:
     start_time = datetime.now()
+    json_path = session.json_path
 
     if logger:
         logger.info(f'Starting validation: {os.path.basename(json_path)}')
 
     try:
-        recipe_data = load_json_data(json_path, logger=logger)
+        recipe_data = session.recipe
 
         if temp_dir:
             tmps_dir = os.path.abspath(temp_dir)
@@ -397,44 +421,57 @@ def verify_render_output(json_path: str, logger=None,
                 Msg.Dim(f'{comp_progress} - Checking rendered status...', flush=True)
                 rendered, total_frames = check_rendered_status(
                     comp_name, comp_data, logger)
+                rendered_set = set(rendered)
+                unrendered = [frame_id for frame_id in comp_data.get('frames', {})
+                              if frame_id not in rendered_set]
+                if unrendered and logger:
+                    logger.warning(f'{comp_name}: {len(unrendered)} frames were not rendered')
+                premoved, pending = split_premoved_frames(comp_data, rendered)
+                if premoved and logger:
+                    logger.info(f'{comp_name}: {len(premoved)} frames already '
+                                f'validated and moved during render')
 
                 Msg.Dim(f'{comp_progress} - Verifying temp files...', flush=True)
                 existing, dropped = verify_temp_files(
-                    comp_name, comp_data, rendered, logger)
+                    comp_name, comp_data, pending, logger)
 
                 Msg.Dim(f'{comp_progress} - Validating images...', flush=True)
-                valid, invalid = verify_image_status(
-                    comp_name, existing, logger, json_path,
-                    use_parallel=force_parallel, comp_index=comp_idx-1,
-                    total_comps=total_comps)
+                valid, invalid = [], []
+                if existing or not premoved:
+                    with trace_span(f'validate {comp_name}', 'validation', files=len(existing)):
+                        valid, invalid = verify_image_status(
+                            comp_name, existing, logger, session,
+                            use_parallel=force_parallel, comp_index=comp_idx-1,
+                            total_comps=total_comps)
 
                 Msg.Dim(f'{comp_progress} - Updating verified status...', flush=True)
+                index = FrameIndex(comp_data.get('frames', {}))
                 verified = update_verified_status(
-                    json_path, comp_name, valid, comp_data, logger)
+                    session, comp_name, valid, comp_data, logger, index)
 
                 Msg.Dim(f'{comp_progress} - Moving files...', flush=True)
-                moved, failed = move_files(
-                    comp_name, comp_data, verified, logger, json_path,
-                    use_parallel=force_parallel)
+                with trace_span(f'move {comp_name}', 'move', files=len(verified)):
+                    moved, failed = move_files(
+                        comp_name, comp_data, verified, logger, session,
+                        use_parallel=force_parallel, index=index)
 
                 Msg.Dim(f'{comp_progress} - Updating moved status...', flush=True)
                 count = update_moved_status(
-                    json_path, comp_name, moved, comp_data, logger)
+                    session, comp_name, moved, comp_data, logger, index)
+
+                valid = premoved + valid
+                moved = premoved + moved
 
-                frames = comp_data.get('frames', {})
-                expected = []
-                for frame_id in rendered:
-                    frame = frames.get(frame_id, {})
-                    result = frame.get('result', '')
-                    if result:
-                        expected.append(result)
+                expected = [result for result in map(index.result_path, rendered + unrendered)
+                            if result]
 
                 invalid_log, dropped_log = write_logs(
                     comp_name, invalid, dropped)
 
                 comp_success = (len(failed) == 0 and
                                len(invalid) == 0 and
-                               len(dropped) == 0)
+                               len(dropped) == 0 and
+                               len(unrendered) == 0)
                 composition_results[comp_name] = {
                     'success': comp_success,
                     'total_frames': total_frames,
@@ -446,17 +483,19 @@ def verify_render_output(json_path: str, logger=None,
                     'failed_moves': failed,
                     'invalid_files': invalid,
                     'dropped_files': dropped,
+                    'unrendered_frames': [int(frame_id) for frame_id in unrendered],
                     'invalid_log': invalid_log,
                     'dropped_log': dropped_log
                 }
 
                 total_moved += len(moved)
-                total_expected += len(rendered)
+                total_expected += len(rendered) + len(unrendered)
 
                 comp_display_name = f'{comp_name} [{comp_idx:02d}/{total_comps:02d}]'
-                if len(rendered) > 0:
-                    success_rate = (len(moved) / len(rendered) * 100)
-                    result_msg = f'{comp_display_name} - Validation completed: {len(moved)}/{len(rendered)} files ({success_rate:.1f}%)'
+                comp_expected = len(rendered) + len(unrendered)
+                if comp_expected > 0:
+                    success_rate = (len(moved) / comp_expected * 100)
+                    result_msg = f'{comp_display_name} - Validation completed: {len(moved)}/{comp_expected} files ({success_rate:.1f}%)'
 
                     if comp_success:
                         Msg.Dim(result_msg, flush=True)
@@ -467,17 +506,18 @@ def verify_render_output(json_path: str, logger=None,
                     if comp_success:
                         logger.info(f'{comp_name}: Validated {len(moved)}/{total_frames} files')
                     else:
-                        error_count = len(failed + invalid + dropped)
+                        error_count = len(failed + invalid + dropped + unrendered)
                         logger.warning(f'{comp_name}: Validated {len(moved)}/{total_frames} files, {error_count} errors')
 
                 if not comp_success:
                     all_success = False
 
-                errors = failed + invalid + dropped
+                errors = failed + invalid + dropped + unrendered
                 if errors:
                     err_msg = (f'{comp_name}: {len(failed)} move errors, '
                                f'{len(invalid)} invalid, '
-                               f'{len(dropped)} dropped')
+                               f'{len(dropped)} dropped, '
+                               f'{len(unrendered)} not rendered')
                     if logger:
                         logger.error(err_msg)
                     Msg.Error(err_msg, divide=False)
@@ -497,6 +537,18 @@ def verify_render_output(json_path: str, logger=None,
                 }
                 all_success = False
 
+        session.flush()
+
+        missing = any(get_missing_frames(comp_data)
+                      for comp_data in recipe_data['result_outputs'].values())
+        if not all_success or missing:
+            retried = retry_missing_frames(session, logger)
+            recovered, added = merge_retry_results(composition_results, retried, logger)
+            total_moved += recovered
+            total_expected += added
+            all_success = all(result.get('success', False)
+                              for result in composition_results.values())
+
         cleanup_success = clean_temps(tmps_dir, timeout=5.0, logger=logger)
         if logger:
             status = 'completed' if cleanup_success else 'failed'
@@ -575,7 +627,9 @@ def main():
         logger = create_debug_logger('RenderValidation')
 
     try:
-        results = verify_render_output(args.json_path, logger)
+        session = RecipeSession(args.json_path)
+        results = verify_render_output(session, logger)
+        session.close()
         exit(0 if results.get('overall_success') else 1)
     except Exception as e:
         Msg.Error(f'Failed: {trace_error(e)}')
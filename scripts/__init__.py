@@ -6,6 +6,6 @@ from ._logger import set_logger, job_info_msg, render_info_msg, DebugLogger, cre
 from ._show_result import show_result
 from ._get_invalid_images import get_invalid_images
 from ._get_usable_workers import get_usable_workers, get_usable_cpu, get_usable_mem
-from ._sig_handler import add_tracked_pid, worker_handler, setup_handler, is_shutdown_requested
+from ._sig_handler import add_tracked_pid, remove_tracked_pid, worker_handler, setup_handler, is_shutdown_requested
 from ._process_kill import process_kill, process_kill_fast
 from ._monitoring import activate_system_monitor, progress_file_monitor
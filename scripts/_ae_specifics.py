@@ -4,10 +4,11 @@ import re
 import json
 from os import PathLike
 from typing import Union, List, Dict, Any
-import winreg
 
 from configs import Msg, Logger
 from scripts._common import abs_path, remove_exist, flush_lines, trace_error
+from scripts._platform import IS_WINDOWS, system_env_paths, find_aerender
+from scripts._state import open_state
 
 def is_multi_comp(config=None, comp_name=None, total_comps=None) -> bool:
     if total_comps is not None:
@@ -165,13 +166,6 @@ def remove_confirm(config=None, comp_names=None, is_multi=False) -> bool:
     except KeyboardInterrupt:
         return False
 
-def system_env_paths() -> List[str]:
-    reg_path = (r'SYSTEM\CurrentControlSet\Control\Session Manager'
-                r'\Environment')
-    reg_key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, reg_path)
-    sys_env_paths = winreg.QueryValueEx(reg_key, 'Path')[0]
-    return [p for p in sys_env_paths.split(';') if p]
-
 def init_fpath(fpath: PathLike) -> bool:
     if not os.path.isfile(fpath):
         raise FileNotFoundError(f'NO SUCH FILE OR DIRECTORY: {fpath}')
@@ -179,9 +173,12 @@ def init_fpath(fpath: PathLike) -> bool:
 
 def pre_execute(fpath: PathLike) -> bool:
     init_fpath(fpath)
-    env_paths = system_env_paths()
-    query_string = 'Adobe After Effects'
-    query_result = list(filter(lambda c: query_string in c, env_paths))
+    if IS_WINDOWS:
+        env_paths = system_env_paths()
+        query_string = 'Adobe After Effects'
+        query_result = list(filter(lambda c: query_string in c, env_paths))
+    else:
+        query_result = find_aerender()
 
     if not query_result:
         raise Exception(
@@ -317,8 +314,9 @@ def load_json_data(json_path: str, section: str = None,
     if logger and section is None:
         logger.info('Loading and validating JSON recipe')
     
+    state = open_state(json_path)
     try:
-        if not os.path.exists(json_path):
+        if not state.exists():
             if section is None:
                 err_msg = f'Recipe file not found: {json_path}'
                 if logger:
@@ -327,34 +325,30 @@ def load_json_data(json_path: str, section: str = None,
                 raise FileNotFoundError(err_msg)
             return default_value
         
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        if section is None:
-            required = ['project_settings', 'result_outputs']
-            for req_section in required:
-                if req_section not in data:
-                    err_msg = f'Required section missing: {req_section}'
-                    if logger:
-                        logger.error(err_msg)
-                    Msg.Error(err_msg)
-                    raise ValueError(err_msg)
-            
-            comp_count = len(data['result_outputs'])
-            if logger:
-                logger.info(f'Recipe loaded: {comp_count} compositions found')
-            
-            return data
+        if section is not None:
+            section_data = state.load_section(section)
+            if section_data is None:
+                return default_value
+            if key is None:
+                return section_data
+            return section_data.get(key, default_value)
+
+        data = state.load()
         
-        if section not in data:
-            return default_value
-        
-        section_data = data[section]
+        required = ['project_settings', 'result_outputs']
+        for req_section in required:
+            if req_section not in data:
+                err_msg = f'Required section missing: {req_section}'
+                if logger:
+                    logger.error(err_msg)
+                Msg.Error(err_msg)
+                raise ValueError(err_msg)
         
-        if key is None:
-            return section_data
+        comp_count = len(data['result_outputs'])
+        if logger:
+            logger.info(f'Recipe loaded: {comp_count} compositions found')
         
-        return section_data.get(key, default_value)
+        return data
         
     except json.JSONDecodeError as e:
         if section is None:
@@ -366,3 +360,5 @@ def load_json_data(json_path: str, section: str = None,
         return default_value
     except Exception:
         return default_value
+    finally:
+        state.close()
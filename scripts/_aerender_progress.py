@@ -0,0 +1,149 @@
+import re
+import time
+import threading
+import subprocess
+from typing import List, Optional, Tuple, Callable
+
+from ._task_timeout import AdaptiveTimeout, TaskWatchdog
+from ._trace import is_tracing
+
+PROGRESS_PATTERN = re.compile(r'PROGRESS:\s+\S+\s+\((\d+)\):\s+(\d+)\s+Seconds')
+
+def parse_progress_line(line: str) -> Optional[Tuple[int, int]]:
+    m = PROGRESS_PATTERN.search(line)
+    if not m:
+        return None
+    return int(m.group(1)), int(m.group(2))
+
+def get_command_frame_range(aerender_cmd: List[str]) -> Tuple[Optional[int], Optional[int]]:
+    start_frame, end_frame = None, None
+    try:
+        if '-s' in aerender_cmd:
+            start_frame = int(aerender_cmd[aerender_cmd.index('-s') + 1])
+        if '-e' in aerender_cmd:
+            end_frame = int(aerender_cmd[aerender_cmd.index('-e') + 1])
+    except (ValueError, IndexError):
+        pass
+    return start_frame, end_frame
+
+def is_progress_verbose(verbose_level: str) -> bool:
+    return 'PROGRESS' in str(verbose_level).upper()
+
+def get_command_verbose(aerender_cmd: List[str]) -> str:
+    try:
+        return aerender_cmd[aerender_cmd.index('-v') + 1]
+    except (ValueError, IndexError):
+        return ''
+
+def create_watchdog(aerender_cmd: List[str], timeouts: AdaptiveTimeout) -> TaskWatchdog:
+    start_frame, end_frame = get_command_frame_range(aerender_cmd)
+    frame_count = (end_frame - start_frame + 1) if start_frame is not None and end_frame is not None else 1
+    return TaskWatchdog(timeouts, frame_count,
+                        stall_detection=is_progress_verbose(get_command_verbose(aerender_cmd)))
+
+class FrameClock:
+
+    def __init__(self, aerender_cmd: List[str],
+                 on_frame: Optional[Callable[[int, float], None]] = None):
+        self.start_frame, _ = get_command_frame_range(aerender_cmd)
+        self.on_frame = on_frame
+        self.last_time = time.time()
+        self.frame_times = [] if is_tracing() else None
+
+    def feed(self, line: str) -> Optional[Tuple[int, float]]:
+        progress = parse_progress_line(line)
+        if progress is None or self.start_frame is None:
+            return None
+
+        index, _ = progress
+        now = time.time()
+        elapsed = now - self.last_time
+        self.last_time = now
+
+        frame_num = self.start_frame + index - 1
+        if self.frame_times is not None:
+            self.frame_times.append((frame_num, now, elapsed))
+        if self.on_frame:
+            self.on_frame(frame_num, elapsed)
+        return frame_num, elapsed
+
+def stream_aerender(aerender_cmd: List[str],
+                    on_frame: Optional[Callable[[int, float], None]] = None,
+                    timeouts: Optional[AdaptiveTimeout] = None,
+                    cancel_event=None, split_event=None) -> dict:
+    watchdog = create_watchdog(aerender_cmd, timeouts or AdaptiveTimeout())
+    split = threading.Event()
+    last_frame = [None]
+
+    def frame_hook(frame_num, elapsed):
+        watchdog.touch(elapsed)
+        last_frame[0] = frame_num
+        if on_frame:
+            on_frame(frame_num, elapsed)
+        if split_event is not None and not split.is_set() and split_event.is_set():
+            split.set()
+            try:
+                proc.kill()
+            except OSError:
+                pass
+
+    proc = subprocess.Popen(
+        aerender_cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding='utf-8',
+        errors='replace'
+    )
+
+    timed_out = threading.Event()
+    cancelled = threading.Event()
+    finished = threading.Event()
+
+    def expire():
+        while not finished.wait(0.5):
+            if proc.poll() is not None:
+                return
+            if cancel_event is not None and cancel_event.is_set():
+                cancelled.set()
+            elif watchdog.check():
+                timed_out.set()
+            else:
+                continue
+            try:
+                proc.kill()
+            except OSError:
+                pass
+            return
+
+    stderr_lines = []
+    stderr_reader = threading.Thread(
+        target=lambda: stderr_lines.extend(proc.stderr), daemon=True)
+    stderr_reader.start()
+
+    watcher = threading.Thread(target=expire, daemon=True)
+    watcher.start()
+
+    clock = FrameClock(aerender_cmd, frame_hook)
+    stdout_lines = []
+    try:
+        for line in proc.stdout:
+            stdout_lines.append(line)
+            clock.feed(line)
+        proc.wait()
+    finally:
+        finished.set()
+        watcher.join(timeout=1.0)
+        stderr_reader.join(timeout=1.0)
+
+    return {
+        'returncode': proc.returncode,
+        'stdout': ''.join(stdout_lines),
+        'stderr': ''.join(stderr_lines),
+        'timed_out': timed_out.is_set(),
+        'cancelled': cancelled.is_set(),
+        'split': split.is_set(),
+        'last_frame': last_frame[0],
+        'timeout_reason': watchdog.reason,
+        'frame_times': clock.frame_times
+    }
@@ -0,0 +1,222 @@
+import os
+import sys
+import time
+import zlib
+import struct
+import random
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+SIM_ENV_PREFIX = 'AERENDER_SIM_'
+
+SIM_DEFAULTS = {
+    'COST': 'lognormal:0.2:0.25',
+    'HOTSPOTS': '',
+    'STARTUP': '0.5',
+    'JITTER': '0.05',
+    'SEED': '0',
+    'FPS': '30',
+    'SIZE': '160x90',
+    'FAIL': '',
+    'CORRUPT': '',
+    'HANG': '',
+    'CRASH_RATE': '0',
+    'HANG_SECS': '3600',
+    'FAULT_ONCE': '0',
+    'STATE_DIR': os.path.join(tempfile.gettempdir(), 'aerender_sim'),
+}
+
+COST_MODELS = ('const', 'uniform', 'normal', 'lognormal')
+
+def get_setting(name: str) -> str:
+    return os.environ.get(f'{SIM_ENV_PREFIX}{name}', SIM_DEFAULTS[name])
+
+def parse_frame_set(spec: str) -> set:
+    frames = set()
+    for part in filter(None, (p.strip() for p in spec.split(','))):
+        first, _, last = part.partition('-')
+        frames.update(range(int(first), int(last or first) + 1))
+    return frames
+
+def parse_hotspots(spec: str) -> List[Tuple[int, int, float]]:
+    hotspots = []
+    for part in filter(None, (p.strip() for p in spec.split(','))):
+        frame_range, _, factor = part.partition(':')
+        first, _, last = frame_range.partition('-')
+        hotspots.append((int(first), int(last or first), float(factor or 1.0)))
+    return hotspots
+
+def parse_cost_model(spec: str) -> Tuple[str, List[float]]:
+    model, *params = spec.split(':')
+    if model not in COST_MODELS:
+        raise ValueError(f'Unknown cost model "{model}" (expected one of {", ".join(COST_MODELS)})')
+    return model, [float(p) for p in params]
+
+def frame_cost(comp: str, frame_num: int, model: str, params: List[float],
+               hotspots: List[Tuple[int, int, float]], seed: str) -> float:
+    rng = random.Random(f'{seed}:{comp}:{frame_num}')
+
+    if model == 'const':
+        cost = params[0]
+    elif model == 'uniform':
+        cost = rng.uniform(params[0], params[1])
+    elif model == 'normal':
+        cost = rng.gauss(params[0], params[1])
+    else:
+        cost = params[0] * rng.lognormvariate(0.0, params[1])
+
+    for first, last, factor in hotspots:
+        if first <= frame_num <= last:
+            cost *= factor
+
+    return max(0.0, cost)
+
+def encode_png(width: int, height: int, rng: random.Random) -> bytes:
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return (struct.pack('>I', len(data)) + tag + data +
+                struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+
+    rows = b''.join(b'\x00' + rng.randbytes(width * 3) for _ in range(height))
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) +
+            chunk(b'IDAT', zlib.compress(rows, 1)) + chunk(b'IEND', b''))
+
+def format_timecode(frame_num: int, fps: int) -> str:
+    seconds, frames = divmod(frame_num, fps)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours}:{minutes:02d}:{seconds:02d}:{frames:02d}'
+
+def get_output_path(pattern: str, index: int) -> str:
+    if '[' in pattern and ']' in pattern:
+        prefix, rest = pattern.split('[', 1)
+        padding, suffix = rest.split(']', 1)
+        return f'{prefix}{index:0{len(padding)}d}{suffix}'
+    return pattern
+
+def fault_fires(kind: str, comp: str, frame_num: int) -> bool:
+    if get_setting('FAULT_ONCE') != '1':
+        return True
+
+    state_dir = get_setting('STATE_DIR')
+    os.makedirs(state_dir, exist_ok=True)
+    marker = os.path.join(state_dir, f'{kind}_{comp}_{frame_num}')
+    if os.path.exists(marker):
+        return False
+    open(marker, 'w').close()
+    return True
+
+def parse_args(argv: List[str]) -> Dict[str, str]:
+    args = {}
+    i = 0
+    while i < len(argv):
+        if argv[i].startswith('-') and i + 1 < len(argv):
+            args[argv[i].lstrip('-').lower()] = argv[i + 1]
+            i += 2
+        else:
+            i += 1
+    return args
+
+class AerenderSimulator:
+
+    def __init__(self, args: Dict[str, str]):
+        self.project = args.get('project', '')
+        self.comp = args.get('comp', '')
+        self.output = args.get('output', '')
+        self.start = int(args.get('s', 0))
+        self.end = int(args.get('e', self.start))
+        self.verbose = args.get('v', 'ERRORS_AND_PROGRESS').upper()
+        self.rs_template = args.get('rstemplate', '')
+        self.om_template = args.get('omtemplate', '')
+
+        self.model, self.params = parse_cost_model(get_setting('COST'))
+        self.hotspots = parse_hotspots(get_setting('HOTSPOTS'))
+        self.seed = get_setting('SEED')
+        self.jitter = float(get_setting('JITTER'))
+        self.fps = max(1, int(get_setting('FPS')))
+        self.width, self.height = (int(v) for v in get_setting('SIZE').lower().split('x'))
+
+        self.fail_frames = parse_frame_set(get_setting('FAIL'))
+        self.corrupt_frames = parse_frame_set(get_setting('CORRUPT'))
+        self.hang_frames = parse_frame_set(get_setting('HANG'))
+        self.crash_rate = float(get_setting('CRASH_RATE'))
+
+    def progress(self, message: str) -> None:
+        if 'PROGRESS' in self.verbose:
+            print(f'PROGRESS:  {message}', flush=True)
+
+    def error(self, message: str) -> int:
+        print(f'aerender ERROR: {message}', file=sys.stderr, flush=True)
+        return 1
+
+    def render_frame(self, frame_num: int, index: int) -> Optional[int]:
+        frame_start = time.time()
+
+        if frame_num in self.hang_frames and fault_fires('hang', self.comp, frame_num):
+            time.sleep(float(get_setting('HANG_SECS')))
+
+        if frame_num in self.fail_frames and fault_fires('fail', self.comp, frame_num):
+            return self.error(f'After Effects error: rendering failed at frame {frame_num}')
+
+        if self.crash_rate > 0 and random.random() < self.crash_rate:
+            return self.error(f'After Effects error: unexpected crash at frame {frame_num}')
+
+        cost = frame_cost(self.comp, frame_num, self.model, self.params, self.hotspots, self.seed)
+        time.sleep(cost * (1.0 + random.uniform(-self.jitter, self.jitter)))
+
+        rng = random.Random(f'{self.seed}:{self.comp}:{frame_num}:pixels')
+        data = encode_png(self.width, self.height, rng)
+        if frame_num in self.corrupt_frames and fault_fires('corrupt', self.comp, frame_num):
+            data = data[:64]
+
+        path = get_output_path(self.output, index)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+        self.progress(f'{format_timecode(frame_num, self.fps)} ({index + 1}): '
+                      f'{int(time.time() - frame_start)} Seconds')
+        return None
+
+    def run(self) -> int:
+        if not self.project or not os.path.isfile(self.project):
+            return self.error(f'Unable to open project file "{self.project}"')
+        if not self.comp:
+            return self.error('No composition specified (-comp)')
+        if not self.output:
+            return self.error('No output file specified (-output)')
+        if self.end < self.start:
+            return self.error(f'Invalid frame range {self.start} - {self.end}')
+
+        render_start = time.time()
+        time.sleep(float(get_setting('STARTUP')))
+
+        now = datetime.now().strftime('%m/%d/%Y %I:%M:%S %p')
+        self.progress(f'{now}: Starting composition “{self.comp}”.')
+        self.progress('')
+        self.progress(f'Render Settings: {self.rs_template}')
+        self.progress(f'Output Module: {self.om_template}')
+        self.progress(f'    Output To: {self.output}')
+        self.progress('')
+
+        for index, frame_num in enumerate(range(self.start, self.end + 1)):
+            exit_code = self.render_frame(frame_num, index)
+            if exit_code is not None:
+                return exit_code
+
+        now = datetime.now().strftime('%m/%d/%Y %I:%M:%S %p')
+        self.progress(f'{now}: Finished composition “{self.comp}”.')
+        self.progress('')
+        self.progress(f'Total Time Elapsed: {int(time.time() - render_start)} Seconds')
+        return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    try:
+        return AerenderSimulator(parse_args(sys.argv[1:] if argv is None else argv)).run()
+    except ValueError as e:
+        print(f'aerender ERROR: {e}', file=sys.stderr, flush=True)
+        return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
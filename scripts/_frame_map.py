@@ -0,0 +1,318 @@
+import base64
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from configs.defaults import DEFAULT_FRAME_PADDING
+
+FRAME_MAP_FORMAT = 'ranges'
+FRAME_FLAGS = ('rendered', 'moved', 'verified', 'reused')
+FRAME_FIELDS = ('tmp', 'result', 'rendered', 'moved', 'verified')
+
+PathTemplate = Tuple[str, str]
+
+def format_path(template: PathTemplate, number: int) -> str:
+    prefix, suffix = template
+    return f'{prefix}{number:0{DEFAULT_FRAME_PADDING}d}{suffix}'
+
+def encode_bits(values: np.ndarray) -> str:
+    return base64.b64encode(np.packbits(values).tobytes()).decode('ascii')
+
+def decode_bits(data: str, count: int) -> np.ndarray:
+    packed = np.frombuffer(base64.b64decode(data), dtype=np.uint8)
+    return np.unpackbits(packed, count=count).astype(bool)
+
+class FrameView(MutableMapping):
+    __slots__ = ('_map', '_index')
+
+    def __init__(self, frame_map: 'FrameMap', index: int):
+        self._map = frame_map
+        self._index = index
+
+    def _keys(self) -> List[str]:
+        frame_map, index = self._map, self._index
+        keys = list(FRAME_FIELDS)
+        if frame_map.flags['reused'][index]:
+            keys.append('reused')
+        if frame_map.render_time is not None and not np.isnan(frame_map.render_time[index]):
+            keys.append('render_time')
+        keys.extend(key for key in frame_map.overrides.get(index, {}) if key not in keys)
+        return keys
+
+    def __getitem__(self, key: str) -> Any:
+        frame_map, index = self._map, self._index
+        override = frame_map.overrides.get(index, {})
+
+        if key in override:
+            return override[key]
+        if key == 'tmp':
+            chunk = frame_map.chunk_of[index]
+            if chunk < 0:
+                return ''
+            start, _, prefix, suffix = frame_map.chunks[chunk]
+            return format_path((prefix, suffix), frame_map.first + index - start)
+        if key == 'result':
+            return format_path(frame_map.result_template, frame_map.first + index)
+        if key == 'reused' and frame_map.flags['reused'][index]:
+            return True
+        if key in FRAME_FLAGS and key != 'reused':
+            return bool(frame_map.flags[key][index])
+        if key == 'render_time' and frame_map.render_time is not None:
+            value = frame_map.render_time[index]
+            if not np.isnan(value):
+                return float(value)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        frame_map, index = self._map, self._index
+
+        if key in FRAME_FLAGS:
+            frame_map.flags[key][index] = bool(value)
+        elif key == 'render_time' and isinstance(value, (int, float)):
+            if frame_map.render_time is None:
+                frame_map.render_time = np.full(frame_map.count, np.nan, dtype=np.float64)
+            frame_map.render_time[index] = value
+        elif key == 'result' and value == format_path(frame_map.result_template, frame_map.first + index):
+            frame_map.overrides.get(index, {}).pop('result', None)
+        else:
+            frame_map.overrides.setdefault(index, {})[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        frame_map, index = self._map, self._index
+        override = frame_map.overrides.get(index, {})
+
+        if key in override:
+            del override[key]
+            if not override:
+                frame_map.overrides.pop(index, None)
+        elif key == 'render_time' and frame_map.render_time is not None:
+            frame_map.render_time[index] = np.nan
+        elif key == 'reused':
+            frame_map.flags['reused'][index] = False
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+class FrameMap(MutableMapping):
+
+    def __init__(self, first: int, count: int, result_template: PathTemplate):
+        self.first = first
+        self.count = count
+        self.result_template = tuple(result_template)
+        self.chunks: List[List[Any]] = []
+        self.chunk_of = np.full(count, -1, dtype=np.int32)
+        self.flags = {name: np.zeros(count, dtype=bool) for name in FRAME_FLAGS}
+        self.render_time: Optional[np.ndarray] = None
+        self.overrides: Dict[int, Dict[str, Any]] = {}
+
+    def _index(self, key) -> int:
+        try:
+            index = int(key) - self.first
+        except (TypeError, ValueError):
+            raise KeyError(key)
+        if not 0 <= index < self.count:
+            raise KeyError(key)
+        return index
+
+    def __getitem__(self, key) -> FrameView:
+        return FrameView(self, self._index(key))
+
+    def __setitem__(self, key, value: Mapping) -> None:
+        index = self._index(key)
+        for name in FRAME_FLAGS:
+            self.flags[name][index] = False
+        self.overrides.pop(index, None)
+        if self.render_time is not None:
+            self.render_time[index] = np.nan
+
+        view = FrameView(self, index)
+        for field, field_value in value.items():
+            if field == 'tmp' and field_value == view['tmp']:
+                continue
+            view[field] = field_value
+
+    def __delitem__(self, key) -> None:
+        raise TypeError(f'Frames cannot be removed from a frame map ({key})')
+
+    def __iter__(self) -> Iterator[str]:
+        return (str(frame_num) for frame_num in range(self.first, self.first + self.count))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, key) -> bool:
+        try:
+            self._index(key)
+        except KeyError:
+            return False
+        return True
+
+    def assign_chunk(self, start: int, end: int, tmp_template: PathTemplate) -> None:
+        first, last = self._index(start), self._index(end)
+        self.chunks.append([start, end, *tmp_template])
+        self.chunk_of[first:last + 1] = len(self.chunks) - 1
+        for index in range(first, last + 1):
+            override = self.overrides.get(index)
+            if override and 'tmp' in override:
+                del override['tmp']
+                if not override:
+                    del self.overrides[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        used = np.unique(self.chunk_of[self.chunk_of >= 0]).tolist()
+        data = {
+            'format': FRAME_MAP_FORMAT,
+            'first': self.first,
+            'count': self.count,
+            'result': list(self.result_template),
+            'chunks': [self.chunks[chunk] for chunk in used],
+            **{name: encode_bits(values) for name, values in self.flags.items()}
+        }
+        if self.render_time is not None:
+            data['render_time'] = base64.b64encode(self.render_time.tobytes()).decode('ascii')
+        if self.overrides:
+            data['overrides'] = {str(self.first + index): override
+                                 for index, override in sorted(self.overrides.items())}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FrameMap':
+        frame_map = cls(data['first'], data['count'], data['result'])
+        for start, end, prefix, suffix in data.get('chunks', []):
+            frame_map.chunks.append([start, end, prefix, suffix])
+            frame_map.chunk_of[start - frame_map.first:end - frame_map.first + 1] = len(frame_map.chunks) - 1
+
+        for name in FRAME_FLAGS:
+            if name in data:
+                frame_map.flags[name] = decode_bits(data[name], frame_map.count)
+        if data.get('render_time'):
+            frame_map.render_time = np.frombuffer(base64.b64decode(data['render_time']),
+                                                  dtype=np.float64).copy()
+        frame_map.overrides = {int(frame_id) - frame_map.first: dict(override)
+                               for frame_id, override in data.get('overrides', {}).items()}
+        return frame_map
+
+def assign_chunk(frames: MutableMapping, start: int, end: int, tmp_template: PathTemplate) -> None:
+    if isinstance(frames, FrameMap):
+        frames.assign_chunk(start, end, tmp_template)
+        return
+
+    for frame_num in range(start, end + 1):
+        frame = frames.get(str(frame_num))
+        if frame is not None:
+            frame['tmp'] = format_path(tmp_template, frame_num - start)
+
+def encode_recipe(obj: Any) -> Any:
+    if isinstance(obj, FrameMap):
+        return obj.to_dict()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+def decode_recipe(recipe: Dict[str, Any]) -> Dict[str, Any]:
+    for comp_data in recipe.get('result_outputs', {}).values():
+        frames = comp_data.get('frames')
+        if isinstance(frames, dict) and frames.get('format') == FRAME_MAP_FORMAT:
+            comp_data['frames'] = FrameMap.from_dict(frames)
+    return recipe
+
+def parse_path(path: str, template: PathTemplate) -> Optional[int]:
+    prefix, suffix = template
+    if not path.startswith(prefix) or not path.endswith(suffix):
+        return None
+    digits = path[len(prefix):len(path) - len(suffix)]
+    if not digits.isdigit():
+        return None
+    number = int(digits)
+    return number if format_path(template, number) == path else None
+
+def split_path(path: str, suffix: str) -> str:
+    return path[:len(path) - len(suffix)].rstrip('0123456789')
+
+class FrameIndex:
+
+    def __init__(self, frames: Mapping):
+        self.paths: Dict[str, Tuple[str, str]] = {}
+        self.by_tmp: Dict[str, str] = {}
+        self.by_result: Dict[str, str] = {}
+        self.frame_map = frames if isinstance(frames, FrameMap) else None
+        self._chunk_starts: Dict[Tuple[str, str], int] = {}
+        self._suffixes: set = set()
+        self._chunk_count = 0
+
+        if self.frame_map is not None:
+            # Only overridden paths are stored, the rest is parsed against the map templates
+            for index, override in self.frame_map.overrides.items():
+                frame_id = str(self.frame_map.first + index)
+                if override.get('tmp'):
+                    self.by_tmp[override['tmp']] = frame_id
+                if override.get('result'):
+                    self.by_result[override['result']] = frame_id
+            return
+
+        for frame_id, frame in frames.items():
+            tmp, result = frame.get('tmp', ''), frame.get('result', '')
+            self.paths[frame_id] = (tmp, result)
+            if tmp:
+                self.by_tmp[tmp] = frame_id
+            if result:
+                self.by_result[result] = frame_id
+
+    def _frame_view(self, frame_id: str) -> Optional[FrameView]:
+        try:
+            return self.frame_map[frame_id]
+        except KeyError:
+            return None
+
+    def frame_for_tmp(self, path: str) -> Optional[str]:
+        if path in self.by_tmp or self.frame_map is None:
+            return self.by_tmp.get(path)
+
+        frame_map = self.frame_map
+        if self._chunk_count != len(frame_map.chunks):
+            self._chunk_starts = {(prefix, suffix): start
+                                  for start, _, prefix, suffix in frame_map.chunks}
+            self._suffixes = {suffix for _, suffix in self._chunk_starts}
+            self._chunk_count = len(frame_map.chunks)
+
+        for suffix in self._suffixes:
+            if not path.endswith(suffix):
+                continue
+            template = (split_path(path, suffix), suffix)
+            start = self._chunk_starts.get(template)
+            offset = parse_path(path, template) if start is not None else None
+            if offset is None:
+                continue
+            frame_id = str(start + offset)
+            view = self._frame_view(frame_id)
+            return frame_id if view is not None and view.get('tmp') == path else None
+        return None
+
+    def frame_for_result(self, path: str) -> Optional[str]:
+        if path in self.by_result or self.frame_map is None:
+            return self.by_result.get(path)
+
+        number = parse_path(path, self.frame_map.result_template)
+        view = self._frame_view(str(number)) if number is not None else None
+        return str(number) if view is not None and view.get('result') == path else None
+
+    def tmp_path(self, frame_id: str) -> str:
+        if self.frame_map is not None:
+            view = self._frame_view(frame_id)
+            return view.get('tmp', '') if view is not None else ''
+        return self.paths.get(frame_id, ('', ''))[0]
+
+    def result_path(self, frame_id: str) -> str:
+        if self.frame_map is not None:
+            view = self._frame_view(frame_id)
+            return view.get('result', '') if view is not None else ''
+        return self.paths.get(frame_id, ('', ''))[1]
@@ -13,6 +13,7 @@ except ImportError:
 from configs import Msg, DEFAULT_TEMP_DIR, PID_LOG_FILENAME
 from scripts._common import trace_error, flush_lines, abs_path
 from scripts._get_usable_workers import get_usable_workers
+from scripts._profiling import get_pool_options
 
 def is_invalid_image(fpath: PathLike, min_size: int, enhanced: bool = False) -> tuple[bool, list[PathLike]]:
     reasons = []
@@ -310,7 +311,7 @@ def image_verify(files: list[PathLike], min_size: int,
 
         invalid_files = []
 
-        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        with ProcessPoolExecutor(max_workers=num_workers, **get_pool_options('validate')) as executor:
             futures = [executor.submit(_validate_image_chunk, chunk, min_size, enhanced) for chunk in file_chunks]
 
             for i, future in enumerate(futures):
@@ -0,0 +1,67 @@
+import os
+import shutil
+import platform
+import subprocess
+from typing import Dict, List, Optional
+
+import psutil
+
+from configs.defaults import DEFAULT_AERENDER, AERENDER_PATH_ENV
+
+IS_WINDOWS = platform.system() == 'Windows'
+
+def system_env_paths() -> List[str]:
+    if not IS_WINDOWS:
+        return [p for p in os.environ.get('PATH', '').split(os.pathsep) if p]
+
+    import winreg
+
+    reg_path = (r'SYSTEM\CurrentControlSet\Control\Session Manager'
+                r'\Environment')
+    reg_key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, reg_path)
+    sys_env_paths = winreg.QueryValueEx(reg_key, 'Path')[0]
+    return [p for p in sys_env_paths.split(';') if p]
+
+def get_aerender_executable() -> str:
+    return os.environ.get(AERENDER_PATH_ENV) or DEFAULT_AERENDER
+
+def find_aerender() -> Optional[str]:
+    candidates = [get_aerender_executable()]
+    if IS_WINDOWS and not os.environ.get(AERENDER_PATH_ENV):
+        candidates.append(f'{DEFAULT_AERENDER}.exe')
+
+    for path in candidates:
+        if shutil.which(path) or os.path.exists(path):
+            return path
+    return None
+
+def kill_processes_by_name(names: List[str]) -> None:
+    if IS_WINDOWS:
+        for name in names:
+            try:
+                subprocess.run(['taskkill', '/F', '/IM', name],
+                               capture_output=True, check=False, timeout=1)
+            except (FileNotFoundError, subprocess.TimeoutExpired):
+                pass
+        return
+
+    targets = {name.lower() for name in names}
+    for proc in psutil.process_iter(['pid', 'name']):
+        try:
+            if (proc.info['name'] or '').lower() in targets:
+                proc.kill()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+
+def get_peak_rss_mb() -> Dict[str, Optional[float]]:
+    if IS_WINDOWS:
+        return {'parent': round(psutil.Process().memory_info().peak_wset / 1048576, 1),
+                'children': None}
+
+    import resource
+
+    scale = 1 if platform.system() == 'Darwin' else 1024
+    return {
+        'parent': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1048576, 1),
+        'children': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale / 1048576, 1)
+    }
@@ -0,0 +1,104 @@
+import io
+import os
+import glob
+import shutil
+import pstats
+import marshal
+import cProfile
+from multiprocessing import util
+from typing import Dict, Any, List, Optional
+
+from configs.defaults import PROFILE_DIR_ENV, DEFAULT_PROFILE_TOP
+from scripts._common import make_dir
+
+def get_profile_dir() -> Optional[str]:
+    return os.environ.get(PROFILE_DIR_ENV) or None
+
+def enable_profiling(profile_dir: str) -> str:
+    profile_dir = os.path.abspath(profile_dir)
+    shutil.rmtree(profile_dir, ignore_errors=True)
+    make_dir(profile_dir)
+    os.environ[PROFILE_DIR_ENV] = profile_dir
+    return profile_dir
+
+def get_pool_options(label: str) -> Dict[str, Any]:
+    profile_dir = get_profile_dir()
+    if not profile_dir:
+        return {}
+    return {'initializer': start_worker_profile,
+            'initargs': (os.path.join(profile_dir, 'raw', f'workers.{label}'),)}
+
+def start_worker_profile(worker_dir: str) -> None:
+    profiler = cProfile.Profile()
+    profiler.enable()
+    util.Finalize(None, dump_worker_profile, args=(profiler, worker_dir), exitpriority=100)
+
+def dump_worker_profile(profiler: cProfile.Profile, worker_dir: str) -> None:
+    profiler.disable()
+    make_dir(worker_dir)
+    profiler.dump_stats(os.path.join(worker_dir, f'{os.getpid()}.prof'))
+
+def get_thread_pool_options(profilers: List[cProfile.Profile]) -> Dict[str, Any]:
+    if not get_profile_dir():
+        return {}
+    return {'initializer': start_thread_profile, 'initargs': (profilers,)}
+
+def start_thread_profile(profilers: List[cProfile.Profile]) -> None:
+    # cProfile only follows the thread that enabled it, so each pool thread runs its own
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        return
+    profilers.append(profiler)
+
+def get_stage_profile_path(stage: str) -> Optional[str]:
+    profile_dir = get_profile_dir()
+    if not profile_dir:
+        return None
+    stage_dir = os.path.join(profile_dir, 'raw', stage)
+    make_dir(stage_dir)
+    return os.path.join(stage_dir, f'{len(os.listdir(stage_dir)):03d}.prof')
+
+def dump_stage_profile(profiler: cProfile.Profile, stage: str) -> None:
+    stats_path = get_stage_profile_path(stage)
+    if stats_path:
+        profiler.dump_stats(stats_path)
+
+def dump_thread_profiles(profilers: List[cProfile.Profile], stage: str) -> None:
+    # Called after the pool threads exited; disable() would clear the caller's own profiler
+    for profiler in profilers:
+        stats_path = get_stage_profile_path(stage)
+        if not stats_path:
+            return
+        profiler.snapshot_stats()
+        with open(stats_path, 'wb') as f:
+            marshal.dump(profiler.stats, f)
+
+def merge_profiles(profile_dir: str, top: int = DEFAULT_PROFILE_TOP) -> List[str]:
+    raw_dir = os.path.join(profile_dir, 'raw')
+    if not os.path.isdir(raw_dir):
+        return []
+
+    summary = io.StringIO()
+    merged = []
+    for stage in sorted(os.listdir(raw_dir)):
+        files = sorted(glob.glob(os.path.join(raw_dir, stage, '*.prof')))
+        if not files:
+            continue
+
+        stats = pstats.Stats(*files, stream=summary)
+        stats_path = os.path.join(profile_dir, f'{stage}.pstats')
+        stats.dump_stats(stats_path)
+        merged.append(stats_path)
+
+        summary.write(f'=== {stage} ({len(files)} profile(s), {stats.total_tt:.3f}s) ===\n')
+        stats.sort_stats('cumulative').print_stats(top)
+        stats.sort_stats('tottime').print_stats(top)
+
+    shutil.rmtree(raw_dir, ignore_errors=True)
+
+    with open(f'{profile_dir}.txt', 'w', encoding='utf-8') as f:
+        f.write(summary.getvalue())
+
+    return merged
@@ -0,0 +1,126 @@
+import os
+import json
+import mmap
+import struct
+from typing import Dict, Any, List, Optional
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from scripts._frame_map import encode_recipe
+
+PACK_MAGIC = b'AERP'
+PACK_VERSION = 1
+PACK_PREAMBLE = struct.Struct('<4sBI')
+
+def get_pack_codec() -> str:
+    return 'msgpack' if msgpack is not None else 'json'
+
+def encode_block(value: Any, codec: str) -> bytes:
+    if codec == 'msgpack':
+        return msgpack.packb(value, default=encode_recipe, use_bin_type=True)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'),
+                      default=encode_recipe).encode('utf-8')
+
+def decode_block(data: bytes, codec: str) -> Any:
+    if codec == 'msgpack':
+        if msgpack is None:
+            raise ImportError('msgpack is required to read this recipe pack (pip install msgpack)')
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    return json.loads(data)
+
+def split_comp(comp_data: Dict[str, Any]) -> tuple:
+    fields = dict(comp_data, frames=None)
+    workflow = fields.get('workflow')
+    tasks = []
+    if isinstance(workflow, dict):
+        tasks = workflow.get('chunk_tasks', [])
+        fields['workflow'] = dict(workflow, chunk_tasks=None)
+    return fields, comp_data.get('frames', {}), tasks
+
+def write_pack(pack_path: str, recipe: Dict[str, Any], codec: Optional[str] = None) -> None:
+    codec = codec or get_pack_codec()
+    body = bytearray()
+
+    def add(value: Any) -> List[int]:
+        block = encode_block(value, codec)
+        span = [len(body), len(block)]
+        body.extend(block)
+        return span
+
+    header = {'codec': codec, 'sections': {}, 'comps': {}}
+    for name, data in recipe.items():
+        if name != 'result_outputs':
+            header['sections'][name] = add(data)
+            continue
+
+        header['sections'][name] = None
+        for comp_name, comp_data in data.items():
+            fields, frames, tasks = split_comp(comp_data)
+            header['comps'][comp_name] = {'fields': add(fields), 'frames': add(frames),
+                                          'tasks': add(tasks)}
+
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    tmp_path = f'{pack_path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(PACK_PREAMBLE.pack(PACK_MAGIC, PACK_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(body)
+    os.replace(tmp_path, pack_path)
+
+class RecipePack:
+
+    def __init__(self, pack_path: str):
+        self.pack_path = pack_path
+        self._file = open(pack_path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, header_size = PACK_PREAMBLE.unpack_from(self._map, 0)
+            if magic != PACK_MAGIC or version != PACK_VERSION:
+                raise ValueError(f'Unsupported recipe pack: {pack_path}')
+            self.body_offset = PACK_PREAMBLE.size + header_size
+            self.header = json.loads(self._map[PACK_PREAMBLE.size:self.body_offset])
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self) -> 'RecipePack':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _block(self, span: List[int]) -> Any:
+        start = self.body_offset + span[0]
+        return decode_block(self._map[start:start + span[1]], self.header['codec'])
+
+    def comp(self, comp_name: str) -> Optional[Dict[str, Any]]:
+        spans = self.header['comps'].get(comp_name)
+        if spans is None:
+            return None
+
+        comp_data = self._block(spans['fields'])
+        comp_data['frames'] = self._block(spans['frames'])
+        if isinstance(comp_data.get('workflow'), dict):
+            comp_data['workflow']['chunk_tasks'] = self._block(spans['tasks'])
+        return comp_data
+
+    def section(self, name: str) -> Any:
+        if name == 'result_outputs':
+            return {comp_name: self.comp(comp_name) for comp_name in self.header['comps']}
+
+        span = self.header['sections'].get(name)
+        return self._block(span) if span is not None else None
+
+    def load(self) -> Dict[str, Any]:
+        return {name: self.section(name) for name in self.header['sections']}
+
+    def close(self) -> None:
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -4,8 +4,6 @@ import time
 import re
 import psutil
 import signal
-import platform
-import subprocess
 import atexit
 import threading
 
@@ -13,8 +11,10 @@ from configs import Msg, DEFAULT_TEMP_DIR, PID_LOG_FILENAME
 
 from scripts._process_kill import process_kill
 from scripts._common import abs_path, remove_exist
+from scripts._platform import IS_WINDOWS, kill_processes_by_name
 
 TARGET_PROCS = ['aerender.exe', 'aerender', 'afterfx.com']
+AERENDER_PROCS = ['aerender.exe', 'aerender']
 MAX_KILL_CYCLES = 10
 PID_LOG_PATH = abs_path(os.path.join(DEFAULT_TEMP_DIR, PID_LOG_FILENAME))
 
@@ -81,6 +81,11 @@ def add_tracked_pid(pid: int):
     _tracked_pids.append(pid)
     save_pids_to_log(pid)
 
+def remove_tracked_pid(pid: int):
+    if pid in _tracked_pids:
+        _tracked_pids.remove(pid)
+    remove_pids_from_log([pid])
+
 def _kill_tracked():
     for pid in _tracked_pids:
         try:
@@ -105,16 +110,9 @@ def _kill_by_name():
     _force_kill_windows()
 
 def _force_kill_windows():
-    if platform.system() != 'Windows':
+    if not IS_WINDOWS:
         return
-    for name in TARGET_PROCS:
-        try:
-            subprocess.run(
-                ['taskkill', '/F', '/IM', name],
-                check=False, capture_output=True
-            )
-        except FileNotFoundError:
-            pass
+    kill_processes_by_name(TARGET_PROCS)
 
 def kill_process_tree(pid: int):
     try:
@@ -140,8 +138,7 @@ def _cleanup_processes():
 def worker_handler():
     def handler(sig, frame):
         try:
-            subprocess.run(['taskkill', '/F', '/IM', 'aerender.exe'],
-                          capture_output=True, check=False, timeout=1)
+            kill_processes_by_name(AERENDER_PROCS)
         except:
             pass
         sys.exit(0)
@@ -160,8 +157,7 @@ def _emergency_cleanup(temp_dir=None):
         else:
             force_clean_temps()
 
-        subprocess.run(['taskkill', '/F', '/IM', 'aerender.exe'],
-                      capture_output=True, check=False, timeout=1)
+        kill_processes_by_name(AERENDER_PROCS)
     except:
         pass
 
@@ -181,10 +177,7 @@ def _stanby_process_termination(timeout=3.0):
             if not found_processes:
                 return True
 
-            if platform.system() == 'Windows':
-                for proc_name in TARGET_PROCS:
-                    subprocess.run(['taskkill', '/F', '/IM', proc_name],
-                                  capture_output=True, check=False, timeout=1)
+            kill_processes_by_name(TARGET_PROCS)
 
             time.sleep(0.1)
 
@@ -0,0 +1,528 @@
+import os
+import json
+import sqlite3
+import threading
+from typing import Dict, Any, List, Optional, Set
+
+from scripts._trace import trace_span
+from scripts._frame_map import encode_recipe, decode_recipe
+from scripts._recipe_pack import RecipePack, write_pack
+
+FRAME_COLUMNS = ('tmp', 'result', 'rendered', 'moved', 'verified')
+FLAG_COLUMNS = ('rendered', 'moved', 'verified')
+
+SQLITE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS sections (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS comps (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS frames (
+    comp TEXT NOT NULL,
+    frame_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    tmp TEXT,
+    result TEXT,
+    rendered INTEGER NOT NULL DEFAULT 0,
+    moved INTEGER NOT NULL DEFAULT 0,
+    verified INTEGER NOT NULL DEFAULT 0,
+    extra TEXT,
+    PRIMARY KEY (comp, frame_id)
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    comp TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    chunk_id TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (comp, position)
+);
+'''
+
+def get_state_db_path(json_path: str) -> str:
+    return f'{os.path.splitext(os.path.abspath(json_path))[0]}.db'
+
+def get_state_pack_path(json_path: str) -> str:
+    return f'{os.path.splitext(os.path.abspath(json_path))[0]}.pack'
+
+STATE_FRAME_FIELDS = ('tmp', 'rendered', 'verified', 'moved', 'render_time')
+
+def get_frame_updates(frames: Dict[str, Any], frame_ids) -> Dict[str, Dict[str, Any]]:
+    updates = {}
+    for frame_id in frame_ids:
+        frame = frames.get(frame_id)
+        if frame is not None:
+            updates[frame_id] = {key: frame[key] for key in STATE_FRAME_FIELDS if key in frame}
+    return updates
+
+def get_chunk_tasks(comp_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    workflow = comp_data.get('workflow')
+    return workflow.get('chunk_tasks', []) if isinstance(workflow, dict) else []
+
+def write_recipe_json(json_path: str, recipe: Dict[str, Any]) -> None:
+    with trace_span('json.dump', 'json', file=os.path.basename(json_path)), \
+         open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(recipe, f, ensure_ascii=False, indent=2, default=encode_recipe)
+
+class JsonStateStore:
+    backend = 'json'
+
+    def __init__(self, json_path: str):
+        self.json_path = os.path.abspath(json_path)
+
+    @property
+    def state_path(self) -> str:
+        return self.json_path
+
+    def exists(self) -> bool:
+        return os.path.exists(self.json_path)
+
+    def load(self) -> Dict[str, Any]:
+        with open(self.json_path, 'r', encoding='utf-8') as f:
+            return decode_recipe(json.load(f))
+
+    def load_section(self, section: str) -> Any:
+        return self.load().get(section)
+
+    def save(self, recipe: Dict[str, Any]) -> None:
+        write_recipe_json(self.json_path, recipe)
+
+    def update_frames(self, comp_name: str, updates: Dict[str, Dict[str, Any]]) -> int:
+        if not updates:
+            return 0
+
+        recipe = self.load()
+        frames = recipe.get('result_outputs', {}).get(comp_name, {}).get('frames', {})
+        count = 0
+        for frame_id, fields in updates.items():
+            if frame_id in frames:
+                frames[frame_id].update(fields)
+                count += 1
+
+        if count:
+            self.save(recipe)
+        return count
+
+    def update_recipe(self, comps: Optional[Dict[str, Dict[str, Any]]] = None,
+                      sections: Optional[Dict[str, Any]] = None) -> None:
+        if not comps and not sections:
+            return
+
+        recipe = self.load()
+        for comp_name, fields in (comps or {}).items():
+            if comp_name in recipe.get('result_outputs', {}):
+                recipe['result_outputs'][comp_name].update(fields)
+        recipe.update(sections or {})
+        self.save(recipe)
+
+    def sync(self, recipe: Dict[str, Any]) -> None:
+        self.save(recipe)
+
+    def write_changes(self, recipe: Dict[str, Any], frames: Dict[str, Dict[str, Dict[str, Any]]],
+                      comps: Dict[str, Dict[str, Any]], tasks: Dict[str, List[Dict[str, Any]]],
+                      sections: Dict[str, Any]) -> None:
+        self.save(recipe)
+
+    def export_json(self) -> str:
+        return self.json_path
+
+    def remove(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+class SqliteStateStore(JsonStateStore):
+    backend = 'sqlite'
+
+    def __init__(self, json_path: str):
+        super().__init__(json_path)
+        self.db_path = get_state_db_path(json_path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def state_path(self) -> str:
+        return self.db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False,
+                                         isolation_level=None)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.executescript(SQLITE_SCHEMA)
+        return self._conn
+
+    def _transaction(self, apply) -> Any:
+        with self._lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = apply(conn)
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+            return result
+
+    def exists(self) -> bool:
+        return os.path.exists(self.db_path)
+
+    def load(self) -> Dict[str, Any]:
+        with self._lock:
+            conn = self._connect()
+            recipe = {name: json.loads(data) for name, data in
+                      conn.execute('SELECT name, data FROM sections ORDER BY position')}
+
+            outputs = {}
+            for name, data in conn.execute('SELECT name, data FROM comps ORDER BY position'):
+                outputs[name] = json.loads(data)
+                outputs[name]['frames'] = {}
+                if isinstance(outputs[name].get('workflow'), dict):
+                    outputs[name]['workflow']['chunk_tasks'] = []
+
+            for comp, frame_id, tmp, result, rendered, moved, verified, extra in conn.execute(
+                    'SELECT comp, frame_id, tmp, result, rendered, moved, verified, extra '
+                    'FROM frames ORDER BY comp, position'):
+                frame = {'tmp': tmp, 'result': result, 'rendered': bool(rendered),
+                         'moved': bool(moved), 'verified': bool(verified)}
+                if extra:
+                    frame.update(json.loads(extra))
+                outputs[comp]['frames'][frame_id] = frame
+
+            for comp, data in conn.execute('SELECT comp, data FROM tasks ORDER BY comp, position'):
+                outputs[comp].setdefault('workflow', {}).setdefault('chunk_tasks', []).append(
+                    json.loads(data))
+
+        recipe['result_outputs'] = outputs
+        return recipe
+
+    def load_section(self, section: str) -> Any:
+        if section == 'result_outputs':
+            return self.load()['result_outputs']
+
+        with self._lock:
+            row = self._connect().execute('SELECT data FROM sections WHERE name = ?',
+                                          (section,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, recipe: Dict[str, Any]) -> None:
+        section_rows = [(name, position, json.dumps(data, ensure_ascii=False))
+                        for position, (name, data) in enumerate(recipe.items())
+                        if name != 'result_outputs']
+        comp_rows, frame_rows, task_rows = [], [], []
+
+        for comp_position, (comp_name, comp_data) in enumerate(recipe.get('result_outputs', {}).items()):
+            comp_rows.append((comp_name, comp_position,
+                              json.dumps(self._comp_fields(comp_data), ensure_ascii=False)))
+
+            for position, (frame_id, frame) in enumerate(comp_data.get('frames', {}).items()):
+                frame_rows.append(self._frame_row(comp_name, frame_id, position, frame))
+
+            task_rows.extend(self._task_rows(comp_name, get_chunk_tasks(comp_data)))
+
+        def apply(conn):
+            for table in ('sections', 'comps', 'frames', 'tasks'):
+                conn.execute(f'DELETE FROM {table}')
+            conn.executemany('INSERT INTO sections VALUES (?, ?, ?)', section_rows)
+            conn.executemany('INSERT INTO comps VALUES (?, ?, ?)', comp_rows)
+            conn.executemany('INSERT INTO frames VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', frame_rows)
+            conn.executemany('INSERT INTO tasks VALUES (?, ?, ?, ?)', task_rows)
+
+        with trace_span('state.save', 'json', file=os.path.basename(self.db_path)):
+            self._transaction(apply)
+
+    @staticmethod
+    def _comp_fields(comp_data: Dict[str, Any]) -> Dict[str, Any]:
+        fields = {key: value for key, value in comp_data.items() if key != 'frames'}
+        workflow = fields.get('workflow')
+        if isinstance(workflow, dict):
+            fields['workflow'] = {key: value for key, value in workflow.items()
+                                  if key != 'chunk_tasks'}
+        return fields
+
+    @staticmethod
+    def _task_rows(comp_name: str, tasks: List[Dict[str, Any]]) -> List[tuple]:
+        return [(comp_name, position, task.get('chunk_id'), json.dumps(task, ensure_ascii=False))
+                for position, task in enumerate(tasks)]
+
+    @staticmethod
+    def _frame_row(comp_name: str, frame_id: str, position: int, frame: Dict[str, Any]) -> tuple:
+        extra = {key: value for key, value in frame.items() if key not in FRAME_COLUMNS}
+        return (comp_name, frame_id, position, frame.get('tmp', ''), frame.get('result', ''),
+                int(bool(frame.get('rendered', False))), int(bool(frame.get('moved', False))),
+                int(bool(frame.get('verified', False))),
+                json.dumps(extra, ensure_ascii=False) if extra else None)
+
+    @staticmethod
+    def _apply_frame_updates(conn: sqlite3.Connection, comp_name: str,
+                             updates: Dict[str, Dict[str, Any]]) -> int:
+        grouped: Dict[tuple, List[tuple]] = {}
+        for frame_id, fields in updates.items():
+            columns = tuple(key for key in FRAME_COLUMNS if key in fields)
+            values = [int(bool(fields[key])) if key in FLAG_COLUMNS else fields[key]
+                      for key in columns]
+            extra = {key: value for key, value in fields.items() if key not in FRAME_COLUMNS}
+            if extra:
+                columns += ('extra',)
+                values.append(json.dumps(extra, ensure_ascii=False))
+            if columns:
+                grouped.setdefault(columns, []).append((*values, comp_name, frame_id))
+
+        count = 0
+        for columns, rows in grouped.items():
+            assignments = ', '.join('extra = json_patch(COALESCE(extra, \'{}\'), ?)'
+                                    if column == 'extra' else f'{column} = ?'
+                                    for column in columns)
+            cursor = conn.executemany(
+                f'UPDATE frames SET {assignments} WHERE comp = ? AND frame_id = ?', rows)
+            count += max(cursor.rowcount, 0)
+        return count
+
+    @classmethod
+    def _apply_comp_updates(cls, conn: sqlite3.Connection, updates: Dict[str, Dict[str, Any]]) -> None:
+        for comp_name, fields in updates.items():
+            row = conn.execute('SELECT data FROM comps WHERE name = ?', (comp_name,)).fetchone()
+            if row is not None:
+                conn.execute('UPDATE comps SET data = ? WHERE name = ?',
+                             (json.dumps(dict(json.loads(row[0]), **cls._comp_fields(fields)),
+                                         ensure_ascii=False),
+                              comp_name))
+
+    @classmethod
+    def _apply_task_updates(cls, conn: sqlite3.Connection,
+                            updates: Dict[str, List[Dict[str, Any]]]) -> None:
+        for comp_name, tasks in updates.items():
+            conn.execute('DELETE FROM tasks WHERE comp = ?', (comp_name,))
+            conn.executemany('INSERT INTO tasks VALUES (?, ?, ?, ?)', cls._task_rows(comp_name, tasks))
+
+    @staticmethod
+    def _apply_section_updates(conn: sqlite3.Connection, updates: Dict[str, Any]) -> None:
+        next_position = conn.execute('SELECT COALESCE(MAX(position), -1) + 1 '
+                                     'FROM sections').fetchone()[0]
+        for name, data in updates.items():
+            payload = json.dumps(data, ensure_ascii=False)
+            if conn.execute('UPDATE sections SET data = ? WHERE name = ?',
+                            (payload, name)).rowcount == 0:
+                conn.execute('INSERT INTO sections VALUES (?, ?, ?)', (name, next_position, payload))
+                next_position += 1
+
+    def update_frames(self, comp_name: str, updates: Dict[str, Dict[str, Any]]) -> int:
+        if not updates:
+            return 0
+
+        with trace_span('state.update', 'json', comp=comp_name, frames=len(updates)):
+            return self._transaction(lambda conn: self._apply_frame_updates(conn, comp_name, updates))
+
+    def update_recipe(self, comps: Optional[Dict[str, Dict[str, Any]]] = None,
+                      sections: Optional[Dict[str, Any]] = None) -> None:
+        if not comps and not sections:
+            return
+
+        def apply(conn):
+            self._apply_comp_updates(conn, comps or {})
+            self._apply_section_updates(conn, sections or {})
+
+        self._transaction(apply)
+
+    def sync(self, recipe: Dict[str, Any]) -> None:
+        outputs = recipe.get('result_outputs', {})
+        comp_fields = {comp_name: self._comp_fields(comp_data)
+                       for comp_name, comp_data in outputs.items()}
+        tasks = {comp_name: get_chunk_tasks(comp_data)
+                 for comp_name, comp_data in outputs.items()}
+        sections = {name: data for name, data in recipe.items() if name != 'result_outputs'}
+
+        def apply(conn):
+            for comp_name, comp_data in outputs.items():
+                self._apply_frame_updates(conn, comp_name, comp_data.get('frames', {}))
+            self._apply_comp_updates(conn, comp_fields)
+            self._apply_task_updates(conn, tasks)
+            self._apply_section_updates(conn, sections)
+
+        with trace_span('state.sync', 'json', file=os.path.basename(self.db_path)):
+            self._transaction(apply)
+
+    def write_changes(self, recipe: Dict[str, Any], frames: Dict[str, Dict[str, Dict[str, Any]]],
+                      comps: Dict[str, Dict[str, Any]], tasks: Dict[str, List[Dict[str, Any]]],
+                      sections: Dict[str, Any]) -> None:
+        def apply(conn):
+            for comp_name, updates in frames.items():
+                self._apply_frame_updates(conn, comp_name, updates)
+            self._apply_comp_updates(conn, comps)
+            self._apply_task_updates(conn, tasks)
+            self._apply_section_updates(conn, sections)
+
+        with trace_span('state.flush', 'json', file=os.path.basename(self.db_path),
+                        frames=sum(len(updates) for updates in frames.values())):
+            self._transaction(apply)
+
+    def export_json(self) -> str:
+        write_recipe_json(self.json_path, self.load())
+        return self.json_path
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def remove(self) -> None:
+        self.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.db_path + suffix):
+                os.remove(self.db_path + suffix)
+
+class PackStateStore(JsonStateStore):
+    backend = 'pack'
+
+    def __init__(self, json_path: str):
+        super().__init__(json_path)
+        self.pack_path = get_state_pack_path(json_path)
+
+    @property
+    def state_path(self) -> str:
+        return self.pack_path
+
+    def exists(self) -> bool:
+        return os.path.exists(self.pack_path)
+
+    def load(self) -> Dict[str, Any]:
+        with RecipePack(self.pack_path) as pack:
+            return decode_recipe(pack.load())
+
+    def load_section(self, section: str) -> Any:
+        with RecipePack(self.pack_path) as pack:
+            data = pack.section(section)
+        if section == 'result_outputs':
+            return decode_recipe({section: data})[section]
+        return data
+
+    def save(self, recipe: Dict[str, Any]) -> None:
+        with trace_span('state.save', 'json', file=os.path.basename(self.pack_path)):
+            write_pack(self.pack_path, recipe)
+
+    def export_json(self) -> str:
+        write_recipe_json(self.json_path, self.load())
+        return self.json_path
+
+    def remove(self) -> None:
+        if os.path.exists(self.pack_path):
+            os.remove(self.pack_path)
+
+STATE_STORES = {store.backend: store for store in (JsonStateStore, SqliteStateStore, PackStateStore)}
+
+def get_side_states(json_path: str) -> List[JsonStateStore]:
+    return [store(json_path) for store in STATE_STORES.values() if store is not JsonStateStore]
+
+def open_state(json_path: str, backend: Optional[str] = None) -> JsonStateStore:
+    if backend is None:
+        backend = next((state.backend for state in get_side_states(json_path) if state.exists()),
+                       JsonStateStore.backend)
+    return STATE_STORES.get(backend, JsonStateStore)(json_path)
+
+class RecipeSession:
+
+    def __init__(self, json_path: str, recipe: Optional[Dict[str, Any]] = None,
+                 backend: Optional[str] = None):
+        self.json_path = os.path.abspath(json_path)
+        self.state = open_state(json_path, backend)
+        self._recipe = recipe
+        self._frames: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._comps: Dict[str, Dict[str, Any]] = {}
+        self._tasks: Set[str] = set()
+        self._sections: Set[str] = set()
+        self._full = False
+
+    @property
+    def backend(self) -> str:
+        return self.state.backend
+
+    @property
+    def recipe(self) -> Dict[str, Any]:
+        if self._recipe is None:
+            if not self.state.exists():
+                raise FileNotFoundError(f'Recipe file not found: {self.json_path}')
+            self._recipe = self.state.load()
+        return self._recipe
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._full or self._frames or self._comps or self._tasks or self._sections)
+
+    def section(self, name: str, key: Optional[str] = None, default: Any = None) -> Any:
+        data = self.recipe.get(name)
+        if data is None:
+            return default
+        if key is None:
+            return data
+        return data.get(key, default)
+
+    def update_frames(self, comp_name: str, updates: Dict[str, Dict[str, Any]]) -> int:
+        frames = self.recipe.get('result_outputs', {}).get(comp_name, {}).get('frames', {})
+        dirty = self._frames.setdefault(comp_name, {})
+        count = 0
+        for frame_id, fields in updates.items():
+            if frame_id in frames:
+                frames[frame_id].update(fields)
+                dirty.setdefault(frame_id, {}).update(fields)
+                count += 1
+        return count
+
+    def update_recipe(self, comps: Optional[Dict[str, Dict[str, Any]]] = None,
+                      sections: Optional[Dict[str, Any]] = None) -> None:
+        outputs = self.recipe.get('result_outputs', {})
+        for comp_name, fields in (comps or {}).items():
+            if comp_name in outputs:
+                outputs[comp_name].update(fields)
+                self._comps.setdefault(comp_name, {}).update(fields)
+        for name, data in (sections or {}).items():
+            self.recipe[name] = data
+            self._sections.add(name)
+
+    def update_tasks(self, comp_name: str) -> None:
+        if comp_name in self.recipe.get('result_outputs', {}):
+            self._tasks.add(comp_name)
+
+    def mark_dirty(self) -> None:
+        self._full = True
+
+    def _clear(self) -> None:
+        self._frames, self._comps, self._tasks, self._sections = {}, {}, set(), set()
+        self._full = False
+
+    def flush(self) -> bool:
+        if not self.dirty:
+            return False
+
+        if self._full:
+            self.state.sync(self.recipe)
+        else:
+            outputs = self.recipe['result_outputs']
+            self.state.write_changes(self.recipe, self._frames, self._comps,
+                                     {comp_name: get_chunk_tasks(outputs[comp_name])
+                                      for comp_name in self._tasks},
+                                     {name: self.recipe[name] for name in self._sections})
+        self._clear()
+        return True
+
+    def save(self, backend: Optional[str] = None) -> None:
+        if backend and backend != self.state.backend:
+            self.state.close()
+            self.state = open_state(self.json_path, backend)
+        self.state.save(self.recipe)
+        self._clear()
+
+    def export_json(self) -> str:
+        self.flush()
+        write_recipe_json(self.json_path, self.recipe)
+        return self.json_path
+
+    def close(self) -> None:
+        self.flush()
+        self.state.close()
@@ -0,0 +1,100 @@
+import time
+from collections import deque
+from multiprocessing.managers import SyncManager
+from typing import Iterable, Optional
+
+from configs.defaults import (
+    DEFAULT_TASK_TIMEOUT, DEFAULT_FRAMES_PER_TASK, DEFAULT_STARTUP_GRACE,
+    DEFAULT_TIMEOUT_FACTOR, DEFAULT_STALL_FACTOR, DEFAULT_MIN_STALL_WINDOW,
+    DEFAULT_TIMEOUT_SAMPLES
+)
+
+class AdaptiveTimeout:
+
+    def __init__(self, samples: Iterable[float] = (),
+                 factor: float = DEFAULT_TIMEOUT_FACTOR,
+                 stall_factor: float = DEFAULT_STALL_FACTOR,
+                 startup_grace: float = DEFAULT_STARTUP_GRACE,
+                 min_stall_window: float = DEFAULT_MIN_STALL_WINDOW,
+                 cold_frame_time: float = DEFAULT_TASK_TIMEOUT / DEFAULT_FRAMES_PER_TASK,
+                 max_samples: int = DEFAULT_TIMEOUT_SAMPLES):
+        self.factor = factor
+        self.stall_factor = stall_factor
+        self.startup_grace = startup_grace
+        self.min_stall_window = min_stall_window
+        self.cold_frame_time = cold_frame_time
+        self.samples = deque(samples, maxlen=max_samples)
+
+    def record(self, frame_time: float) -> None:
+        if frame_time > 0:
+            self.samples.append(frame_time)
+
+    def record_task(self, elapsed: float, frame_count: int) -> None:
+        self.record(elapsed / max(1, frame_count))
+
+    def p95(self) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def frame_budget(self) -> float:
+        p95 = self.p95()
+        if p95 is None:
+            return self.cold_frame_time
+        return p95 * self.factor
+
+    def budget(self, frame_count: int) -> float:
+        return self.startup_grace + max(1, frame_count) * self.frame_budget()
+
+    def stall_window(self, started: bool = True) -> Optional[float]:
+        p95 = self.p95()
+        if p95 is None:
+            return None
+        window = max(self.min_stall_window, p95 * self.stall_factor)
+        return window if started else window + self.startup_grace
+
+class TimeoutManager(SyncManager):
+    pass
+
+# Pool workers share one AdaptiveTimeout through the manager so every chunk learns from all live frames
+TimeoutManager.register('AdaptiveTimeout', AdaptiveTimeout)
+
+class TaskWatchdog:
+
+    def __init__(self, timeouts: AdaptiveTimeout, frame_count: int,
+                 stall_detection: bool = True):
+        self.timeouts = timeouts
+        self.frame_count = frame_count
+        self.stall_detection = stall_detection
+        self.started = time.time()
+        self.last_frame = self.started
+        self.frames_seen = 0
+        self.reason: Optional[str] = None
+
+    def touch(self, frame_time: float) -> None:
+        if self.frames_seen > 0:
+            self.timeouts.record(frame_time)
+        self.last_frame = time.time()
+        self.frames_seen += 1
+
+    def check(self) -> Optional[str]:
+        now = time.time()
+
+        budget = self.timeouts.budget(self.frame_count)
+        if now - self.started > budget:
+            self.reason = (f'Timeout after {now - self.started:.1f} seconds '
+                           f'(budget {budget:.1f}s for {self.frame_count} frames)')
+            return self.reason
+
+        window = self.timeouts.stall_window(self.frames_seen > 0) if self.stall_detection else None
+        if window is not None:
+            idle = now - self.last_frame
+            # A slow frame is not a stall while the remaining frames still fit in the budget
+            remaining = max(0, self.frame_count - self.frames_seen) * self.timeouts.frame_budget()
+            if idle > window and now - self.started + remaining > budget:
+                self.reason = (f'Stalled: no new frame for {idle:.1f} seconds '
+                               f'(window {window:.1f}s, {self.frames_seen}/{self.frame_count} frames)')
+                return self.reason
+
+        return None
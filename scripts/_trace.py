@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+from configs.defaults import TRACE_PATH_ENV
+from scripts._common import make_dir
+
+PARENT_PID = 1
+SLOTS_PID = 2
+
+class TraceRecorder:
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self.origin = time.time()
+        self.events: List[Dict[str, Any]] = []
+        self.threads: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _ts(self, timestamp: float) -> float:
+        return round((timestamp - self.origin) * 1e6, 1)
+
+    def _tid(self) -> int:
+        name = threading.current_thread().name
+        with self._lock:
+            return self.threads.setdefault(name, len(self.threads) + 1)
+
+    def add_span(self, name: str, cat: str, start: float, end: float,
+                 pid: int = PARENT_PID, tid: Optional[int] = None, **args) -> None:
+        event = {'name': name, 'cat': cat, 'ph': 'X',
+                 'ts': self._ts(start), 'dur': round(max(0.0, end - start) * 1e6, 1),
+                 'pid': pid, 'tid': self._tid() if tid is None else tid}
+        if args:
+            event['args'] = args
+        with self._lock:
+            self.events.append(event)
+
+    def _slot_events(self) -> List[Dict[str, Any]]:
+        events = []
+        slots = set()
+
+        for task in assign_slots(get_task_records()):
+            slots.add(task['slot'])
+            events.append({'name': task['name'], 'cat': 'task', 'ph': 'X',
+                           'ts': self._ts(task['start']),
+                           'dur': round(max(0.0, task['end'] - task['start']) * 1e6, 1),
+                           'pid': SLOTS_PID, 'tid': task['slot'], 'args': task['args']})
+
+            for frame_num, frame_end, elapsed in task['frame_times']:
+                events.append({'name': f'frame {frame_num}', 'cat': 'frame', 'ph': 'X',
+                               'ts': self._ts(frame_end - elapsed),
+                               'dur': round(elapsed * 1e6, 1),
+                               'pid': SLOTS_PID, 'tid': task['slot']})
+
+        for slot in sorted(slots):
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': SLOTS_PID, 'tid': slot,
+                           'args': {'name': f'slot {slot}'}})
+        return events
+
+    def write(self) -> str:
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self.threads)
+
+        events.extend(self._slot_events())
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': PARENT_PID,
+                       'args': {'name': 'AeRender'}})
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': SLOTS_PID,
+                       'args': {'name': 'aerender slots'}})
+        events.extend({'name': 'thread_name', 'ph': 'M', 'pid': PARENT_PID, 'tid': tid,
+                       'args': {'name': name}} for name, tid in threads.items())
+
+        make_dir(os.path.dirname(self.path))
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return self.path
+
+_recorder: Optional[TraceRecorder] = None
+_tasks: List[Dict[str, Any]] = []
+_tasks_lock = threading.Lock()
+
+def assign_slots(tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    lanes: List[float] = []
+    placed = []
+
+    for task in sorted(tasks, key=lambda t: t['start']):
+        lane = next((i for i, free_at in enumerate(lanes) if free_at <= task['start']), None)
+        if lane is None:
+            lanes.append(0.0)
+            lane = len(lanes) - 1
+        lanes[lane] = task['end']
+        placed.append(dict(task, slot=lane + 1))
+
+    return placed
+
+def get_task_records() -> List[Dict[str, Any]]:
+    with _tasks_lock:
+        return list(_tasks)
+
+def enable_tracing(path: str) -> TraceRecorder:
+    global _recorder
+    _recorder = TraceRecorder(path)
+    os.environ[TRACE_PATH_ENV] = _recorder.path
+    return _recorder
+
+def is_tracing() -> bool:
+    return bool(os.environ.get(TRACE_PATH_ENV))
+
+@contextmanager
+def trace_span(name: str, cat: str, **args):
+    if _recorder is None:
+        yield
+        return
+
+    start = time.time()
+    try:
+        yield
+    finally:
+        _recorder.add_span(name, cat, start, time.time(), **args)
+
+def trace_task(task_info: Dict[str, Any], result: Dict[str, Any]) -> None:
+    if not isinstance(result, dict):
+        return
+
+    frame_times = result.pop('frame_times', None)
+    if 'started_at' not in result:
+        return
+
+    with _tasks_lock:
+        _tasks.append({
+            'name': task_info.get('task_detail', task_info.get('chunk_id', '')),
+            'start': result['started_at'],
+            'end': result.get('finished_at', result['started_at']),
+            'files_rendered': result.get('files_rendered', 0),
+            'success': result.get('success', False),
+            'frame_times': (frame_times or []) if _recorder is not None else [],
+            'args': {'chunk_id': task_info.get('chunk_id'),
+                     'frames': f'{task_info.get("start_frame")}-{task_info.get("end_frame")}',
+                     'success': result.get('success', False),
+                     'files_rendered': result.get('files_rendered', 0)}
+        })
+
+def write_trace() -> Optional[str]:
+    return _recorder.write() if _recorder is not None else None
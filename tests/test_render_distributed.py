@@ -0,0 +1,122 @@
+import os
+import sys
+import signal
+import socket
+import logging
+import threading
+import subprocess
+from collections import Counter
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AERENDER_SIM = os.path.join(PROJECT_ROOT, 'scripts', 'bin', 'aerender')
+NODE_AGENT = os.path.join(PROJECT_ROOT, 'process', 'render_distributed.py')
+
+sys.path.insert(0, PROJECT_ROOT)
+
+from process.render_distributed import run_distributed_tasks
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason='uses the POSIX simulator launcher')
+
+def get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def build_tasks(tmp_path, frames: int, per_task: int) -> list:
+    project = tmp_path / 'distributed_test.aep'
+    project.touch()
+
+    tasks = []
+    for start in range(0, frames, per_task):
+        end = min(start + per_task, frames) - 1
+        chunk_dir = tmp_path / 'tmps' / f'Main_{start:04d}_{end:04d}'
+        tasks.append({
+            'chunk_id': f'Main_{start:04d}_{end:04d}',
+            'task_detail': f'Main/Chunk_{start:04d}_{end:04d}',
+            'comp_name': 'Main',
+            'start_frame': start,
+            'end_frame': end,
+            'file_count': end - start + 1,
+            'expected_files': end - start + 1,
+            'temp_directory': str(chunk_dir),
+            'aerender_command': [
+                AERENDER_SIM, '-project', str(project), '-comp', 'Main',
+                '-RStemplate', 'Best Settings', '-OMtemplate', 'PNG',
+                '-output', str(chunk_dir / 'Main.[####].png'),
+                '-s', str(start), '-e', str(end), '-v', 'ERRORS_AND_PROGRESS'
+            ]
+        })
+    return tasks
+
+def start_node(port: int, node: str, frame_cost: str) -> subprocess.Popen:
+    env = dict(os.environ,
+               AERENDER_SIM_STARTUP='0.2',
+               AERENDER_SIM_COST=f'const:{frame_cost}')
+    return subprocess.Popen(
+        [sys.executable, NODE_AGENT, f'127.0.0.1:{port}', '--node', node, '--idle', '2'],
+        cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True)
+
+def stop_node(proc: subprocess.Popen) -> None:
+    if proc.poll() is None:
+        os.killpg(proc.pid, signal.SIGKILL)
+    proc.wait(timeout=10)
+
+def rendered_files(task: dict) -> int:
+    return len(os.listdir(task['temp_directory'])) if os.path.isdir(task['temp_directory']) else 0
+
+def test_two_nodes_render_every_frame_once(tmp_path):
+    tasks = build_tasks(tmp_path, frames=60, per_task=10)
+    port = get_free_port()
+    frames = Counter()
+
+    nodes = [start_node(port, 'node-a', '0.05'), start_node(port, 'node-b', '0.05')]
+    try:
+        results = run_distributed_tasks(
+            tasks, 2, logging.getLogger('distributed_test'),
+            on_frame=lambda task, frame_num, elapsed: frames.update([frame_num]),
+            bind=f'127.0.0.1:{port}', lease_secs=5, heartbeat_secs=0.5)
+    finally:
+        for node in nodes:
+            stop_node(node)
+
+    assert all(result['success'] for result in results), [result['stderr'] for result in results]
+    assert {result['node'] for result in results} == {'node-a', 'node-b'}
+    assert frames == Counter(range(60))
+    assert sum(rendered_files(task) for task in tasks) == 60
+
+def test_expired_lease_is_reassigned_to_another_node(tmp_path, caplog):
+    tasks = build_tasks(tmp_path, frames=40, per_task=20)
+    port = get_free_port()
+    first_frame = threading.Event()
+
+    def on_frame(task, frame_num, elapsed):
+        if task['start_frame'] == 0:
+            first_frame.set()
+
+    results = []
+    coordinator = threading.Thread(target=lambda: results.extend(run_distributed_tasks(
+        tasks, 2, logging.getLogger('distributed_test'), on_frame=on_frame,
+        bind=f'127.0.0.1:{port}', lease_secs=2, heartbeat_secs=0.5)), daemon=True)
+
+    caplog.set_level(logging.INFO, logger='distributed_test')
+    coordinator.start()
+    lost_node = start_node(port, 'node-a', '0.1')
+    survivor = None
+    try:
+        assert first_frame.wait(timeout=30), 'node-a never started its chunk'
+        stop_node(lost_node)
+        survivor = start_node(port, 'node-b', '0.02')
+        coordinator.join(timeout=120)
+    finally:
+        stop_node(lost_node)
+        if survivor is not None:
+            stop_node(survivor)
+
+    assert not coordinator.is_alive()
+    assert all(result['success'] for result in results), [result['stderr'] for result in results]
+    assert [result['node'] for result in results] == ['node-b', 'node-b']
+    assert 'Lease expired on node-a: Main/Chunk_0000_0019 requeued' in caplog.text
+    assert [rendered_files(task) for task in tasks] == [20, 20]
@@ -0,0 +1,48 @@
+import os
+import sys
+import glob
+import subprocess
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AERENDER_SIM = os.path.join(PROJECT_ROOT, 'scripts', 'bin', 'aerender')
+PROJECT_NAME = 'retry_test'
+
+@pytest.fixture(autouse=True)
+def remove_run_logs():
+    yield
+    for log_file in glob.glob(os.path.join(PROJECT_ROOT, 'process', 'logs', f'{PROJECT_NAME}_*.log')):
+        os.remove(log_file)
+
+def run_render(tmp_path, fault_once: bool) -> subprocess.CompletedProcess:
+    project = tmp_path / f'{PROJECT_NAME}.aep'
+    project.touch()
+    env = dict(os.environ,
+               AERENDER_PATH=AERENDER_SIM,
+               AERENDER_SIM_STARTUP='0.1',
+               AERENDER_SIM_COST='const:0.01',
+               AERENDER_SIM_FAIL='12',
+               AERENDER_SIM_FAULT_ONCE='1' if fault_once else '0',
+               AERENDER_SIM_STATE_DIR=str(tmp_path / 'sim'))
+    return subprocess.run(
+        [sys.executable, 'AeRender.py', '-f', str(project), '-c', 'Main', '-s', '0', '-e', '59',
+         '-w', '3', '-v', 'ERRORS', '-o', str(tmp_path / 'out')],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=300)
+
+def rendered_frames(tmp_path) -> int:
+    return len(os.listdir(tmp_path / 'out' / 'Main'))
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='uses the POSIX simulator launcher')
+def test_task_dying_mid_chunk_is_re_rendered(tmp_path):
+    result = run_render(tmp_path, fault_once=True)
+
+    assert result.returncode == 0, result.stdout[-2000:]
+    assert rendered_frames(tmp_path) == 60
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='uses the POSIX simulator launcher')
+def test_frames_still_missing_after_retries_fail_the_run(tmp_path):
+    result = run_render(tmp_path, fault_once=False)
+
+    assert result.returncode == 1
+    assert rendered_frames(tmp_path) < 60